@@ -26,6 +26,11 @@ class Settings(BaseSettings):
     # RSS Configuration
     rss_poll_interval: int = 300  # seconds
     rss_feeds: str = ""  # Comma-separated URLs
+    parse_workers: int = 2  # feed parsing processes, 0 parses in the scheduler thread
+    fetch_workers: int = 16  # concurrent feed downloads per cycle
+    fetch_timeout: float = 20.0  # seconds per feed request
+    dedup_chunk_size: int = 500  # URL hashes per duplicate-check IN query
+    text_extractor: str = "htmlparser"  # htmlparser or bs4, see utils/text_extract.py
 
     # API Settings
     cors_origins: str = "http://localhost:8000"
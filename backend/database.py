@@ -8,6 +8,7 @@ from typing import Optional
 import hashlib
 
 from config import settings
+from utils.url_canonical import canonicalize_url
 
 # Database setup
 engine = create_engine(
@@ -41,8 +42,8 @@ class NewsArticle(Base):
 
     @staticmethod
     def generate_url_hash(url: str) -> str:
-        """Generate SHA256 hash of URL for deduplication."""
-        return hashlib.sha256(url.encode()).hexdigest()
+        """Generate SHA256 hash of the canonical URL for deduplication."""
+        return hashlib.sha256(canonicalize_url(url).encode()).hexdigest()
 
 
 class NewsCluster(Base):
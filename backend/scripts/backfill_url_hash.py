@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""Rehash stored articles' url_hash from their canonical URL.
+
+NewsArticle.generate_url_hash hashes canonicalize_url(url) rather than the
+raw URL, so rows stored before that change still carry the raw-URL hash and
+would not be recognised when a tracking or AMP variant of the same story
+arrives. Run this once after upgrading; it is safe to run again.
+
+Rows whose canonical hash already belongs to another row are tracking
+variants of a story stored twice before the change. They keep their old
+hash and are reported; the other row already dedupes new arrivals.
+
+Usage (from backend/):
+    python -m scripts.backfill_url_hash [--dry-run] [--batch-size 1000]
+"""
+
+import argparse
+import logging
+from typing import Dict
+
+from database import NewsArticle, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(batch_size: int = 1000, dry_run: bool = False) -> Dict[str, int]:
+    """Rewrite stale url_hash values in batches, committing after each one."""
+    db = SessionLocal()
+    try:
+        owners = {
+            url_hash: article_id
+            for article_id, url_hash in db.query(NewsArticle.id, NewsArticle.url_hash)
+        }
+        stats = {"articles": len(owners), "updated": 0, "duplicates": 0}
+
+        last_id = 0
+        while True:
+            rows = (
+                db.query(NewsArticle.id, NewsArticle.url, NewsArticle.url_hash)
+                .filter(NewsArticle.id > last_id)
+                .order_by(NewsArticle.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            for article_id, url, url_hash in rows:
+                canonical_hash = NewsArticle.generate_url_hash(url)
+                if canonical_hash == url_hash:
+                    continue
+                if owners.get(canonical_hash, article_id) != article_id:
+                    logger.info(f"Article {article_id} duplicates article {owners[canonical_hash]}: {url}")
+                    stats["duplicates"] += 1
+                    continue
+                owners.pop(url_hash, None)
+                owners[canonical_hash] = article_id
+                updates.append({"id": article_id, "url_hash": canonical_hash})
+
+            stats["updated"] += len(updates)
+            if updates and not dry_run:
+                db.bulk_update_mappings(NewsArticle, updates)
+                db.commit()
+
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    stats = backfill(args.batch_size, args.dry_run)
+    verb = "would update" if args.dry_run else "updated"
+    print(
+        f"{stats['articles']} articles: {verb} {stats['updated']}, "
+        f"{stats['duplicates']} duplicates left on their old hash"
+    )
+
+
+if __name__ == "__main__":
+    main()
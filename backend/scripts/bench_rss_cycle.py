@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Benchmark one legacy RSS fetch cycle, serial vs the fetch thread pool.
+
+Serves synthetic feeds from a local HTTP server with a fixed response delay
+and times RSSService.fetch_all_sources against a scratch SQLite database,
+then times storing a single feed's articles (the per-feed ingest cost).
+
+Usage (from backend/):
+    python -m scripts.bench_rss_cycle --sources 50 500 --latency 0.05
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Scratch database, set before config is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from config import settings  # noqa: E402
+from database import Base, RSSSource, SessionLocal, engine  # noqa: E402
+from services.rss_service import RSSService  # noqa: E402
+
+ITEMS_PER_FEED = 20
+
+
+def feed_body(path: str) -> bytes:
+    items = "".join(
+        f"<item><title>Story {i} from {path}</title>"
+        f"<link>https://example.com{path}/{i}</link>"
+        f"<description>&lt;p&gt;Body of story {i}&lt;/p&gt;</description></item>"
+        for i in range(ITEMS_PER_FEED)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{path}</title>{items}</channel></rss>'.encode()
+
+
+def serve(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = feed_body(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_cycle(base_url: str, sources: int, workers: int) -> float:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add_all(
+            RSSSource(name=f"feed-{i}", url=f"{base_url}/feed-{i}", fetch_interval=300)
+            for i in range(sources)
+        )
+        db.commit()
+
+        settings.fetch_workers = workers
+        start = time.monotonic()
+        results = RSSService.fetch_all_sources(db)
+        elapsed = time.monotonic() - start
+        assert sum(r.get("new_articles", 0) for r in results) == sources * ITEMS_PER_FEED
+        return elapsed
+    finally:
+        db.close()
+
+
+def time_store(items: int, repeats: int = 20) -> float:
+    """Mean seconds to store one parsed feed, half of whose articles already exist."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        source = RSSSource(name="store", url="https://example.com/store", fetch_interval=300)
+        db.add(source)
+        db.commit()
+
+        timings = []
+        for repeat in range(repeats):
+            articles = [
+                {
+                    "url": f"https://example.com/store/{repeat * items // 2 + i}",
+                    "title": f"Story {i}",
+                    "content": "Body",
+                    "source": "store",
+                    "published_at": None,
+                }
+                for i in range(items)
+            ]
+            start = time.perf_counter()
+            RSSService.store_articles(db, source, articles)
+            db.commit()
+            timings.append(time.perf_counter() - start)
+        return sum(timings) / len(timings)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per feed response")
+    parser.add_argument("--workers", type=int, default=settings.fetch_workers)
+    args = parser.parse_args()
+
+    server = serve(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        print(f"{'sources':>8} {'serial_s':>10} {'pool_s':>10} {'speedup':>8}")
+        for sources in args.sources:
+            serial = run_cycle(base_url, sources, 1)
+            pooled = run_cycle(base_url, sources, args.workers)
+            print(f"{sources:>8} {serial:>10.2f} {pooled:>10.2f} {serial / pooled:>7.1f}x")
+
+        print(f"\n{'items':>8} {'store_ms':>10}")
+        for items in (20, 100, 500):
+            print(f"{items:>8} {time_store(items) * 1000:>10.2f}")
+    finally:
+        server.shutdown()
+        RSSService.shutdown_parse_pool()
+
+
+if __name__ == "__main__":
+    main()
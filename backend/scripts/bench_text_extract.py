@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Check text extractors against BeautifulSoup on a feed corpus and time them per entry.
+
+Every entry's content/summary/description is run through each extractor in
+utils/text_extract.py; any output differing from the bs4 reference is listed.
+
+Usage (from backend/):
+    python -m scripts.bench_text_extract ../src/backend/tests/fixtures/feeds
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+import feedparser  # noqa: E402
+
+from utils.text_extract import EXTRACTORS  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[2] / "src" / "backend" / "tests" / "fixtures" / "feeds"
+
+
+def load_contents(corpus: Path) -> list:
+    contents = []
+    for path in sorted(corpus.glob("*.xml")):
+        for entry in feedparser.parse(path.read_bytes()).entries:
+            # Same field precedence as RSSService._parse_entry
+            if hasattr(entry, "content"):
+                content = entry.content[0].value
+            elif hasattr(entry, "summary"):
+                content = entry.summary
+            elif hasattr(entry, "description"):
+                content = entry.description
+            else:
+                continue
+            if content:
+                contents.append(content)
+    return contents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    contents = load_contents(args.corpus)
+    print(f"{len(contents)} entries from {args.corpus}")
+
+    reference = [EXTRACTORS["bs4"](content) for content in contents]
+    print(f"{'extractor':>12} {'us/entry':>10} {'mismatches':>11}")
+    for name, extract in EXTRACTORS.items():
+        mismatches = [
+            (content, expected)
+            for content, expected in zip(contents, reference)
+            if extract(content) != expected
+        ]
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for content in contents:
+                extract(content)
+        per_entry = (time.perf_counter() - start) / (args.rounds * len(contents))
+        print(f"{name:>12} {per_entry * 1e6:>10.1f} {len(mismatches):>11}")
+        for content, expected in mismatches[:5]:
+            print(f"    {content[:80]!r}\n      bs4: {expected[:80]!r}\n      got: {extract(content)[:80]!r}")
+
+
+if __name__ == "__main__":
+    main()
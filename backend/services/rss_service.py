@@ -1,27 +1,37 @@
 """RSS feed ingestion service."""
 
 import feedparser
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import httpx
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Set
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 import logging
-from bs4 import BeautifulSoup
 import hashlib
+import threading
 
 from database import NewsArticle, RSSSource
 from config import settings
+from utils.text_extract import html_to_text
 
 logger = logging.getLogger(__name__)
 
+# Worker processes for CPU-bound feed parsing, created on first use; fetch
+# threads reach for it at the same time, so creation is guarded by a lock
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
 
 class RSSService:
     """Service for RSS feed ingestion and parsing."""
 
     @staticmethod
-    def parse_feed(feed_url: str) -> List[Dict[str, Any]]:
-        """Parse RSS feed and extract articles."""
+    def parse_feed(feed_url: str, content: Optional[bytes] = None) -> List[Dict[str, Any]]:
+        """Parse RSS feed and extract articles, from already downloaded content if given."""
         try:
-            feed = feedparser.parse(feed_url)
+            feed = feedparser.parse(content if content is not None else feed_url)
 
             if feed.bozo:  # Feed has errors
                 logger.warning(f"Feed parse warning for {feed_url}: {feed.bozo_exception}")
@@ -39,6 +49,35 @@ class RSSService:
             logger.error(f"Error parsing feed {feed_url}: {e}")
             return []
 
+    @staticmethod
+    def parse_feed_offloaded(feed_url: str, content: Optional[bytes] = None) -> List[Dict[str, Any]]:
+        """Parse a feed in the worker process pool so parsing does not hold the GIL."""
+        global _parse_pool
+        if settings.parse_workers <= 0:
+            return RSSService.parse_feed(feed_url, content)
+
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                _parse_pool = ProcessPoolExecutor(max_workers=settings.parse_workers)
+            pool = _parse_pool
+        return pool.submit(RSSService.parse_feed, feed_url, content).result()
+
+    @staticmethod
+    def download_feed(client: httpx.Client, feed_url: str) -> List[Dict[str, Any]]:
+        """Download a feed and parse it; runs in a fetch thread, so it must not touch the session."""
+        response = client.get(feed_url)
+        response.raise_for_status()
+        return RSSService.parse_feed_offloaded(feed_url, response.content)
+
+    @staticmethod
+    def shutdown_parse_pool() -> None:
+        """Stop the parse worker processes."""
+        global _parse_pool
+        with _parse_pool_lock:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False, cancel_futures=True)
+                _parse_pool = None
+
     @staticmethod
     def _parse_entry(entry: Any, source_url: str) -> Optional[Dict[str, Any]]:
         """Parse individual feed entry."""
@@ -62,8 +101,7 @@ class RSSService:
 
             # Clean HTML from content
             if content:
-                soup = BeautifulSoup(content, "html.parser")
-                content = soup.get_text(strip=True)
+                content = html_to_text(content)
 
             # Extract published date
             published_at = None
@@ -92,52 +130,92 @@ class RSSService:
             logger.error(f"Error parsing entry: {e}")
             return None
 
+    @staticmethod
+    def store_articles(
+        db: Session,
+        source: RSSSource,
+        articles: List[Dict[str, Any]],
+        seen: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """Insert new articles for a source without committing.
+
+        All URL hashes are resolved with chunked IN queries, then the new rows
+        go in as one INSERT that skips conflicts, so an article stored
+        concurrently is not an error. seen holds URL hashes already stored
+        earlier in this transaction, e.g. by another source in the same cycle.
+        """
+        seen = seen if seen is not None else set()
+        start = time.perf_counter()
+
+        rows = []
+        for article_data in articles:
+            url_hash = NewsArticle.generate_url_hash(article_data["url"])
+            if url_hash in seen:
+                continue
+            seen.add(url_hash)
+            rows.append({
+                "url": article_data["url"],
+                "url_hash": url_hash,
+                "title": article_data["title"],
+                "content": article_data["content"],
+                "source": article_data["source"],
+                "published_at": article_data.get("published_at"),
+            })
+
+        existing = RSSService._existing_hashes(db, [row["url_hash"] for row in rows])
+        rows = [row for row in rows if row["url_hash"] not in existing]
+
+        added_count = 0
+        if rows:
+            insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+            stmt = (
+                insert(NewsArticle.__table__)
+                .on_conflict_do_nothing()
+                .returning(NewsArticle.__table__.c.id)
+            )
+            added_count = len(db.execute(stmt, rows).all())
+        duplicate_count = len(articles) - added_count
+
+        # Update source last_fetch
+        source.last_fetch = datetime.utcnow()
+
+        store_seconds = time.perf_counter() - start
+        logger.info(
+            f"RSS fetch complete for {source.name}: "
+            f"{added_count} new, {duplicate_count} duplicates in {store_seconds * 1000:.1f}ms"
+        )
+
+        return {
+            "source": source.name,
+            "total_parsed": len(articles),
+            "new_articles": added_count,
+            "duplicates": duplicate_count,
+            "store_seconds": round(store_seconds, 4),
+            "success": True
+        }
+
+    @staticmethod
+    def _existing_hashes(db: Session, url_hashes: List[str]) -> Set[str]:
+        """Return which URL hashes are already stored, one IN query per chunk."""
+        existing: Set[str] = set()
+        chunk_size = settings.dedup_chunk_size
+        for i in range(0, len(url_hashes), chunk_size):
+            chunk = url_hashes[i:i + chunk_size]
+            existing.update(
+                url_hash for (url_hash,) in
+                db.query(NewsArticle.url_hash).filter(NewsArticle.url_hash.in_(chunk))
+            )
+        return existing
+
     @staticmethod
     def fetch_and_store(db: Session, source: RSSSource) -> Dict[str, Any]:
         """Fetch RSS feed and store new articles in database."""
         try:
-            articles = RSSService.parse_feed(source.url)
-
-            added_count = 0
-            duplicate_count = 0
-
-            for article_data in articles:
-                # Check if article already exists
-                url_hash = NewsArticle.generate_url_hash(article_data["url"])
-                existing = db.query(NewsArticle).filter_by(url_hash=url_hash).first()
-
-                if existing:
-                    duplicate_count += 1
-                    continue
-
-                # Create new article
-                article = NewsArticle(
-                    url=article_data["url"],
-                    url_hash=url_hash,
-                    title=article_data["title"],
-                    content=article_data["content"],
-                    source=article_data["source"],
-                    published_at=article_data.get("published_at")
-                )
-                db.add(article)
-                added_count += 1
-
-            # Update source last_fetch
-            source.last_fetch = datetime.utcnow()
+            with httpx.Client(timeout=settings.fetch_timeout, follow_redirects=True) as client:
+                articles = RSSService.download_feed(client, source.url)
+            result = RSSService.store_articles(db, source, articles)
             db.commit()
-
-            logger.info(
-                f"RSS fetch complete for {source.name}: "
-                f"{added_count} new, {duplicate_count} duplicates"
-            )
-
-            return {
-                "source": source.name,
-                "total_parsed": len(articles),
-                "new_articles": added_count,
-                "duplicates": duplicate_count,
-                "success": True
-            }
+            return result
 
         except Exception as e:
             logger.error(f"Error fetching RSS feed {source.name}: {e}")
@@ -149,15 +227,69 @@ class RSSService:
             }
 
     @staticmethod
-    def fetch_all_sources(db: Session) -> List[Dict[str, Any]]:
-        """Fetch all enabled RSS sources."""
+    def due_sources(db: Session, now: Optional[datetime] = None) -> List[RSSSource]:
+        """Enabled sources whose last_fetch + fetch_interval has passed."""
+        now = now or datetime.utcnow()
         sources = db.query(RSSSource).filter_by(enabled=True).all()
-        results = []
-
-        for source in sources:
-            result = RSSService.fetch_and_store(db, source)
-            results.append(result)
+        return [
+            source for source in sources
+            if source.last_fetch is None
+            or source.last_fetch + timedelta(seconds=source.fetch_interval or settings.rss_poll_interval) <= now
+        ]
 
+    @staticmethod
+    def fetch_all_sources(db: Session) -> List[Dict[str, Any]]:
+        """Fetch all due RSS sources concurrently and store their articles in one commit.
+
+        Downloads run in a pool of fetch_workers threads (parsing still goes
+        through the parse process pool); only this thread uses the session.
+        Each source is stored in its own savepoint, so a source whose insert
+        fails is rolled back and reported without losing the others.
+        """
+        start = time.monotonic()
+        sources = RSSService.due_sources(db)
+        results = []
+        seen: Set[str] = set()
+
+        if sources:
+            workers = max(1, min(settings.fetch_workers, len(sources)))
+            with httpx.Client(timeout=settings.fetch_timeout, follow_redirects=True) as client, \
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-fetch") as pool:
+                futures = {
+                    pool.submit(RSSService.download_feed, client, source.url): source
+                    for source in sources
+                }
+                for future in as_completed(futures):
+                    source = futures[future]
+                    try:
+                        articles = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching RSS feed {source.name}: {e}")
+                        results.append({"source": source.name, "error": str(e), "success": False})
+                        continue
+                    source_seen = set(seen)
+                    try:
+                        with db.begin_nested():
+                            result = RSSService.store_articles(db, source, articles, source_seen)
+                    except Exception as e:
+                        logger.error(f"Error storing articles for {source.name}: {e}")
+                        results.append({"source": source.name, "error": str(e), "success": False})
+                        continue
+                    seen = source_seen
+                    results.append(result)
+
+            try:
+                db.commit()
+            except Exception as e:
+                logger.error(f"Error storing RSS fetch results: {e}")
+                db.rollback()
+                for result in results:
+                    if result["success"]:
+                        result.update(success=False, error=str(e), new_articles=0)
+
+        logger.info(
+            f"RSS cycle: {len(sources)} due sources fetched in {time.monotonic() - start:.2f}s"
+        )
         return results
 
     @staticmethod
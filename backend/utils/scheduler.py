@@ -62,6 +62,7 @@ class RSSScheduler:
         """Stop the scheduler."""
         if self.running:
             self.scheduler.shutdown()
+            RSSService.shutdown_parse_pool()
             self.running = False
             logger.info("RSS scheduler stopped")
 
@@ -0,0 +1,103 @@
+"""HTML-to-text extraction for feed entry content."""
+
+from html.parser import HTMLParser
+from typing import Callable, Dict, List
+
+from config import settings
+
+# Text inside these elements is not page text (BeautifulSoup keeps it as
+# Script/Stylesheet/TemplateString, which get_text() leaves out)
+SKIPPED_ELEMENTS = {"script", "style", "template"}
+
+
+class _TextStripper(HTMLParser):
+    """Streaming tag stripper matching BeautifulSoup(...).get_text(strip=True).
+
+    Every run of text between two pieces of markup is one string: it is
+    stripped, dropped if empty, and concatenated without a separator.
+    CDATA sections are a string of their own; comments, declarations and
+    processing instructions end a run and contribute no text. Character
+    references follow HTML5 (as browsers do), so "&amp" without a semicolon
+    becomes "&" where BeautifulSoup keeps it literally.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._run: List[str] = []
+        self._skip_depth = 0
+
+    def _end_run(self) -> None:
+        if self._run:
+            text = "".join(self._run).strip()
+            if text:
+                self.parts.append(text)
+            self._run.clear()
+
+    def handle_starttag(self, tag, attrs):
+        self._end_run()
+        if tag in SKIPPED_ELEMENTS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_run()
+
+    def handle_endtag(self, tag):
+        self._end_run()
+        if tag in SKIPPED_ELEMENTS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._run.append(data)
+
+    def handle_comment(self, data):
+        self._end_run()
+
+    def handle_decl(self, decl):
+        self._end_run()
+
+    def handle_pi(self, data):
+        self._end_run()
+
+    def unknown_decl(self, data):
+        self._end_run()
+        if data.startswith("CDATA[") and not self._skip_depth:
+            self._run.append(data[len("CDATA["):])
+            self._end_run()
+
+    def text(self) -> str:
+        self.close()
+        self._end_run()
+        return "".join(self.parts)
+
+
+def htmlparser_text(content: str) -> str:
+    """Strip tags with the standard library HTMLParser; the default extractor."""
+    stripper = _TextStripper()
+    stripper.feed(content)
+    return stripper.text()
+
+
+def bs4_text(content: str) -> str:
+    """Strip tags with BeautifulSoup, the reference the other extractors match."""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, "html.parser").get_text(strip=True)
+
+
+EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "htmlparser": htmlparser_text,
+    "bs4": bs4_text,
+}
+
+
+def html_to_text(content: str) -> str:
+    """Extract the text of an HTML fragment with the configured extractor."""
+    try:
+        extractor = EXTRACTORS[settings.text_extractor]
+    except KeyError:
+        raise ValueError(
+            f"Unknown text_extractor {settings.text_extractor!r}, expected one of {sorted(EXTRACTORS)}"
+        )
+    return extractor(content)
@@ -0,0 +1,91 @@
+"""Canonical article URLs, so tracking and AMP variants of a story dedupe together."""
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only identify the referrer or campaign
+TRACKING_PARAMS = {
+    "mod", "ref", "ref_src", "ref_url", "src", "rss", "cmpid", "cmp",
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ncid", "ocid", "smid",
+    "soc_src", "soc_trk", "sr_share", "taid", "yptr", "guccounter", "guce_referrer",
+    "guce_referrer_sig", "at_medium", "at_campaign", "at_custom1", "at_custom2",
+    "cmpgn", "intcmp", "partner", "traffic_source", "__twitter_impression",
+}
+TRACKING_PREFIXES = ("utm_", "itm_", "at_", "pk_", "mkt_")
+
+# Parameters that request the AMP rendering of a page
+AMP_PARAMS = {"amp", "outputtype", "amp_js_v", "usqp"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# https://www.google.com/amp/s/example.com/story and
+# https://example-com.cdn.ampproject.org/c/s/example.com/story
+AMP_CACHE_PATH = re.compile(r"^/(?:amp|[cv])/(?:[cv]/)?(s/)?(.+)$")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalise an article URL into its deduplication key.
+
+    Upgrades to https, lower-cases the host and drops "www.", default ports,
+    fragments, trailing slashes and tracking parameters, sorts what is left of
+    the query, and maps AMP pages and AMP cache links to the article itself.
+    The result is only compared, never fetched. Kept in step with
+    src/backend/app/services/url_canonical.py.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return url
+    try:
+        port = parts.port
+    except ValueError:
+        return url
+
+    host = parts.hostname.lower()
+    path = parts.path or "/"
+
+    # AMP caches wrap the publisher URL in their own path
+    if host.endswith(".cdn.ampproject.org") or (
+        host in ("google.com", "www.google.com") and path.startswith("/amp/")
+    ):
+        match = AMP_CACHE_PATH.match(path)
+        if match:
+            inner = match.group(2)
+            return canonicalize_url(f"https://{inner}" + (f"?{parts.query}" if parts.query else ""))
+
+    for prefix in ("www.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+
+    # AMP renderings of the article page
+    if path.endswith("/amp") or path.endswith("/amp/"):
+        path = path[: path.rindex("/amp")] or "/"
+    elif path.startswith("/amp/"):
+        path = path[len("/amp"):]
+    elif path.endswith(".amp.html"):
+        path = path[: -len(".amp.html")] + ".html"
+    elif path.endswith(".amp"):
+        path = path[: -len(".amp")]
+
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(key)
+    ]
+    query.sort()
+
+    # Only the scheme's default port is implied; other ports serve other sites
+    netloc = host if port is None or port == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+    return urlunsplit(("https", netloc, path, urlencode(query), ""))
+
+
+def _is_tracking(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key in AMP_PARAMS or key.startswith(TRACKING_PREFIXES)
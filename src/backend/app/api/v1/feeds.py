@@ -1,13 +1,16 @@
 """RSS Feed endpoints"""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import RSSFeed
-from app.schemas.feed import RSSFeedCreate, RSSFeedResponse
+from app.schemas.feed import FeedImportResponse, RSSFeedCreate, RSSFeedResponse
+from app.services.feed_import import feed_importer
 from app.services.rss_ingestion import rss_service
+from app.workers.feed_scheduler import feed_scheduler
 
 router = APIRouter(prefix="/feeds", tags=["feeds"])
 
@@ -16,10 +19,14 @@ router = APIRouter(prefix="/feeds", tags=["feeds"])
 async def list_feeds(
     skip: int = 0,
     limit: int = 100,
+    circuit_state: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    """List all RSS feeds"""
-    result = await db.execute(select(RSSFeed).offset(skip).limit(limit))
+    """List all RSS feeds, optionally only those with a given breaker state"""
+    query = select(RSSFeed)
+    if circuit_state:
+        query = query.where(RSSFeed.circuit_state == circuit_state)
+    result = await db.execute(query.offset(skip).limit(limit))
     feeds = result.scalars().all()
     return feeds
 
@@ -41,9 +48,35 @@ async def create_feed(
     db.add(db_feed)
     await db.commit()
     await db.refresh(db_feed)
+    if db_feed.is_active:
+        feed_scheduler.schedule(db_feed.feed_id)
     return db_feed
 
 
+@router.post("/import", response_model=FeedImportResponse)
+async def import_feeds(
+    request: Request,
+    validate: bool = True,
+    db: AsyncSession = Depends(get_db),
+):
+    """Bulk upsert feeds from an OPML or CSV request body, keyed on feed_url"""
+    try:
+        result = await feed_importer.import_feeds(db, await request.body(), validate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result["created"] or result["updated"]:
+        # No-op unless this process runs the heap scheduler
+        await feed_scheduler.rebuild()
+    return result
+
+
+@router.get("/hosts")
+async def host_limits():
+    """Per-host request rate limiter state and wait times"""
+    return rss_service.host_limiter.stats()
+
+
 @router.get("/{feed_id}", response_model=RSSFeedResponse)
 async def get_feed(
     feed_id: int,
@@ -73,6 +106,72 @@ async def refresh_feed(
         return {"status": "success", "new_articles": new_articles}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if feed.is_active:
+            feed_scheduler.schedule(feed.feed_id, feed.next_fetch_scheduled)
+
+
+@router.get("/{feed_id}/websub", response_class=PlainTextResponse)
+async def websub_verify(
+    feed_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """WebSub hub verification of intent: echo the challenge for our own subscriptions"""
+    result = await db.execute(select(RSSFeed).where(RSSFeed.feed_id == feed_id))
+    feed = result.scalar_one_or_none()
+    if not feed:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+    try:
+        challenge = rss_service.websub.verify(feed, request.query_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if challenge is None:
+        raise HTTPException(status_code=404, detail="Unknown subscription")
+    await db.commit()
+    return challenge
+
+
+async def _read_capped(request: Request, limit: int) -> Optional[bytes]:
+    """Request body, or None as soon as it is known to exceed limit bytes"""
+    length = request.headers.get("Content-Length")
+    if length is not None and length.isdigit() and int(length) > limit:
+        return None
+
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@router.post("/{feed_id}/websub", status_code=202)
+async def websub_deliver(
+    feed_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """WebSub content delivery: ingest pushed entries through the normal write path"""
+    result = await db.execute(select(RSSFeed).where(RSSFeed.feed_id == feed_id))
+    feed = result.scalar_one_or_none()
+    if not feed or feed.websub_state != "active":
+        raise HTTPException(status_code=410, detail="No active subscription")
+
+    body = await _read_capped(request, rss_service.max_bytes)
+    # Hubs expect a 2xx even for content we discard
+    if body is None:
+        return {"status": "ignored", "reason": "too large"}
+    if not rss_service.websub.valid_signature(
+        feed, body, request.headers.get("X-Hub-Signature")
+    ):
+        return {"status": "ignored", "reason": "bad signature"}
+
+    new_articles = await rss_service.ingest_push(feed, body, db)
+    return {"status": "accepted", "new_articles": new_articles}
 
 
 @router.delete("/{feed_id}")
@@ -88,4 +187,5 @@ async def delete_feed(
 
     await db.delete(feed)
     await db.commit()
+    feed_scheduler.unschedule(feed_id)
     return {"status": "deleted"}
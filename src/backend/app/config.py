@@ -1,7 +1,8 @@
 """Application configuration"""
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -29,9 +30,64 @@ class Settings(BaseSettings):
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
 
     # RSS Feed Polling
-    FEED_POLL_INTERVAL: int = 300  # seconds (5 minutes)
+    FEED_POLL_INTERVAL: int = 300  # seconds (5 minutes), interval scan when heap scheduler is off
+    FEED_HEAP_SCHEDULER: bool = True  # dispatch each feed when its next_fetch_scheduled is due
+    FEED_SCHEDULE_JITTER: float = 5.0  # seconds of random delay added to each due time
+    FEED_SCHEDULE_RESYNC_INTERVAL: int = 3600  # seconds, reload schedule for out-of-band changes
+    FEED_SCHEDULER_MAX_BATCHES: int = 4  # due-feed batches fetched at the same time
+    ADAPTIVE_POLLING: bool = True  # learn per-feed intervals from publish cadence
+    ADAPTIVE_POLL_MIN_INTERVAL: int = 60  # seconds
+    ADAPTIVE_POLL_MAX_INTERVAL: int = 3600  # seconds
+    ADAPTIVE_POLL_EWMA_ALPHA: float = 0.3
+    ADAPTIVE_POLL_TARGET_FRACTION: float = 0.5  # poll at this fraction of the mean gap
     RSS_TIMEOUT: int = 10  # seconds
     RSS_MAX_RETRIES: int = 3
+    RSS_MAX_BYTES: int = 5_000_000  # decoded body size at which a download is aborted
+    FEED_BACKOFF_BASE: int = 60  # seconds before the first retry of a failing feed
+    FEED_BACKOFF_MAX: int = 21600  # seconds (6 hours)
+    FEED_CIRCUIT_THRESHOLD: int = 5  # consecutive errors before the breaker opens
+    FEED_CIRCUIT_COOLDOWN: int = 3600  # seconds an open breaker waits before probing
+    RSS_HTTP2: bool = False  # requires the h2 package
+    RSS_MAX_CONNECTIONS: int = 100  # pooled connections across all hosts
+    RSS_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    RSS_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    RSS_MAX_CONNECTIONS_PER_HOST: int = 4
+    HOST_RATE_LIMIT: float = 1.0  # requests per second to any one host
+    HOST_RATE_BURST: int = 3
+    HOST_RATE_OVERRIDES: Dict[str, float] = {}  # per-host rates, e.g. {"www.cnbc.com": 0.5}
+    HOST_THROTTLE_PAUSE: float = 60.0  # seconds, for a 429/503 without Retry-After
+    HOST_THROTTLE_MAX_PAUSE: float = 3600.0  # seconds, cap on honoured Retry-After
+    FEED_FETCH_CONCURRENCY: int = 5  # feeds fetched in parallel per cycle
+    PARSE_WORKERS: int = 2  # feed parsing processes, 0 parses on the event loop
+    FAST_FEED_PARSER: bool = True  # streaming RSS/Atom parser, feedparser fallback
+    INGEST_COMMIT_BATCH: int = 20  # feeds written per ingestion transaction
+    DEDUP_CHUNK_SIZE: int = 500  # keys per IN query, below SQLite's variable limit
+    SEEN_FILTER_CAPACITY: int = 500_000  # URL + hash keys before accuracy degrades
+    SEEN_FILTER_ERROR_RATE: float = 0.01
+    SEEN_FILTER_REBUILD_INTERVAL: int = 3600  # seconds, drops keys removed by retention
+    NEAR_DUP_DETECTION: bool = True  # mark reworded syndicated headlines as duplicates
+    NEAR_DUP_THRESHOLD: float = 0.8  # Jaccard similarity of headline word sets
+    NEAR_DUP_WINDOW_HOURS: int = 24
+    NEAR_DUP_NUM_PERM: int = 64  # MinHash permutations
+    NEAR_DUP_BANDS: int = 16  # LSH bands, NUM_PERM / BANDS rows each
+    WEBSUB_ENABLED: bool = True  # subscribe to hubs advertised by feeds
+    WEBSUB_CALLBACK_BASE: str = ""  # public base URL hubs can reach; empty disables WebSub
+    WEBSUB_LEASE_SECONDS: int = 432000  # requested lease (5 days)
+    WEBSUB_RENEW_MARGIN: int = 3600  # seconds before expiry to renew
+    WEBSUB_POLL_INTERVAL: int = 3600  # seconds, verification poll for subscribed feeds
+    WEBSUB_SYNC_INTERVAL: int = 600  # seconds between subscription checks
+    WEBSUB_RETRY_BASE: int = 600  # seconds before retrying a rejected subscription
+    WEBSUB_RETRY_MAX: int = 86400  # seconds, cap on the doubling retry delay
+    RAW_CONTENT_COMPRESSION: bool = True  # store Article.raw_content zlib-compressed
+    RAW_CONTENT_COMPRESS_MIN_BYTES: int = 64  # shorter content is stored as is
+    INGESTION_SHARDED: bool = False  # fetch feeds in worker processes, not the API process
+    INGESTION_WORKERS: int = 4  # processes started by scripts/run_ingestion_workers.py
+    SHARD_VIRTUAL_NODES: int = 64  # hash ring points per worker
+    SHARD_HEARTBEAT_INTERVAL: int = 10  # seconds between worker heartbeats
+    SHARD_WORKER_TTL: int = 30  # seconds without a heartbeat before a worker's shard moves
+    FEED_IMPORT_CONCURRENCY: int = 20  # feeds validated at once during a bulk import
+    FEED_IMPORT_STAGGER_WINDOW: int = 300  # seconds over which imported feeds first come due
+    FEED_IMPORT_VALIDATE_TIMEOUT: float = 30.0  # seconds of validation per import request
 
     # AI Processing
     AI_PROCESS_INTERVAL: int = 600  # seconds (10 minutes)
@@ -51,6 +107,21 @@ class Settings(BaseSettings):
     MAX_WORKERS: int = 3  # concurrent API calls
     CACHE_TTL: int = 3600  # seconds (1 hour)
 
+    @field_validator("HOST_RATE_LIMIT")
+    @classmethod
+    def _positive_host_rate(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("HOST_RATE_LIMIT must be greater than 0")
+        return value
+
+    @field_validator("HOST_RATE_OVERRIDES")
+    @classmethod
+    def _positive_host_overrides(cls, value: Dict[str, float]) -> Dict[str, float]:
+        for host, rate in value.items():
+            if rate <= 0:
+                raise ValueError(f"HOST_RATE_OVERRIDES rate for {host} must be greater than 0")
+        return value
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,53 @@
+"""Event loop lag monitor"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+from app.core.stats import percentile
+
+
+class LoopLagMonitor:
+    """
+    Measure how late the event loop wakes a periodic timer
+
+    Lag is the difference between when a sleep should have ended and when the
+    coroutine actually resumed; blocking work on the loop shows up directly.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.samples.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, float]:
+        if self._task is not None:
+            # Let an overdue wakeup land before stopping so a final stall is counted
+            await asyncio.sleep(self.interval)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.stats()
+
+    def stats(self) -> Dict[str, float]:
+        """Lag summary in milliseconds"""
+        if not self.samples:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(self.samples),
+            "p50_ms": round(percentile(self.samples, 50) * 1000, 2),
+            "p99_ms": round(percentile(self.samples, 99) * 1000, 2),
+            "max_ms": round(max(self.samples) * 1000, 2),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - expected))
@@ -0,0 +1,13 @@
+"""Small statistics helpers shared by ingestion metrics"""
+
+import math
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile, 0.0 for an empty sample"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
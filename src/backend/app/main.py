@@ -5,8 +5,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import structlog
 from app.config import settings
-from app.database import init_db
+from app.database import AsyncSessionLocal, init_db
 from app.api.v1 import feeds, articles, events, ideas
+from app.services.rss_ingestion import rss_service
+from app.workers.feed_scheduler import feed_scheduler
 from app.workers.scheduler import scheduler
 
 # Configure logging
@@ -31,8 +33,21 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("database_initialized")
 
+    # Open pooled HTTP client for feed fetching
+    await rss_service.start()
+
+    # Warm the seen-article filter used ahead of dedup queries. With sharded
+    # ingestion other processes store articles, so the filter stays unbuilt
+    # and every check goes to the database.
+    async with AsyncSessionLocal() as session:
+        if not settings.INGESTION_SHARDED:
+            await rss_service.seen_filter.rebuild(session)
+        await rss_service.near_duplicates.rebuild(session)
+
     # Start background scheduler
     scheduler.start()
+    if settings.FEED_HEAP_SCHEDULER and not settings.INGESTION_SHARDED:
+        await feed_scheduler.start()
     logger.info("scheduler_started")
 
     yield
@@ -40,6 +55,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("application_shutdown")
     scheduler.shutdown()
+    await feed_scheduler.stop()
+    await rss_service.close()
 
 
 # Create FastAPI app
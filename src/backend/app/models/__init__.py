@@ -4,6 +4,7 @@ from app.models.feed import RSSFeed
 from app.models.article import Article
 from app.models.event import NewsEvent, EventArticle
 from app.models.trading_idea import TradingIdea, TradeStrategy
+from app.models.worker import IngestionWorker
 
 __all__ = [
     "RSSFeed",
@@ -12,4 +13,5 @@ __all__ = [
     "EventArticle",
     "TradingIdea",
     "TradeStrategy",
+    "IngestionWorker",
 ]
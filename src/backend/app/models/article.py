@@ -2,8 +2,9 @@
 
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
+from app.models.types import CompressedText
 
 
 class Article(Base):
@@ -16,6 +17,7 @@ class Article(Base):
 
     headline = Column(Text, nullable=False)
     url = Column(String(1000), unique=True, index=True)
+    canonical_url = Column(String(1000), index=True)  # dedup key, see url_canonical
     source = Column(String(100), nullable=False, index=True)
     publish_datetime = Column(DateTime, nullable=False, index=True)
 
@@ -27,13 +29,18 @@ class Article(Base):
     )  # pending, processing, processed, failed, duplicate
 
     content_hash = Column(String(64), index=True)  # for duplicate detection
-    raw_content = Column(Text, nullable=True)
+    duplicate_of = Column(
+        Integer, ForeignKey("articles.article_id", ondelete="SET NULL"), nullable=True, index=True
+    )  # canonical article for near-duplicate headlines
+    # Rarely read after ingestion: compressed, and only loaded on access or undefer()
+    raw_content = deferred(Column(CompressedText, nullable=True))
 
     created_at = Column(DateTime, server_default=func.now())
     processed_at = Column(DateTime, nullable=True)
 
     # Relationships
     feed = relationship("RSSFeed", backref="articles")
+    canonical = relationship("Article", remote_side=[article_id], backref="near_duplicates")
 
     __table_args__ = (
         Index("idx_articles_processing", "processed_status", "publish_datetime"),
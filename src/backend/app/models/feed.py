@@ -1,6 +1,6 @@
 """RSS Feed model"""
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -22,8 +22,49 @@ class RSSFeed(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Error tracking
-    error_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)  # consecutive failed fetches
     last_error = Column(Text, nullable=True)
 
+    # Circuit breaker: closed, open (skipped until cooldown) or half_open (probing)
+    circuit_state = Column(String(20), default="closed")
+    circuit_opened_at = Column(DateTime, nullable=True)
+
+    # Conditional GET validators from the last full response
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    content_digest = Column(String(64), nullable=True)  # sha256 of body, fallback
+
+    # Conditional GET statistics
+    fetch_count = Column(Integer, default=0)
+    not_modified_count = Column(Integer, default=0)  # 304s and unchanged bodies
+    bytes_downloaded = Column(Integer, default=0)  # total bytes received on the wire
+    last_response_bytes = Column(Integer, nullable=True)
+
+    # High-water mark: newest entry seen, so polls can stop at known items
+    last_seen_url = Column(String(1000), nullable=True)
+    last_seen_published = Column(DateTime, nullable=True)
+    is_chronological = Column(Boolean, default=True)  # entries listed newest-first
+
+    # Adaptive polling: learned publish cadence and the interval it produced
+    arrival_interval_ewma = Column(Float, nullable=True)  # seconds between articles
+    last_article_at = Column(DateTime, nullable=True)
+    hourly_activity = Column(JSON, nullable=True)  # decayed article counts per UTC hour
+    current_poll_interval = Column(Integer, nullable=True)  # seconds
+
+    # WebSub push subscription: None (hub discovered), pending, active, denied, failed
+    websub_hub = Column(String(500), nullable=True)
+    websub_topic = Column(String(1000), nullable=True)
+    websub_secret = Column(String(64), nullable=True)
+    websub_state = Column(String(20), nullable=True)
+    websub_lease_expires = Column(DateTime, nullable=True)  # lease end, or retry time
+    websub_failures = Column(Integer, default=0)  # consecutive rejected subscribe requests
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of fetches that were served without re-parsing the feed"""
+        if not self.fetch_count:
+            return 0.0
+        return (self.not_modified_count or 0) / self.fetch_count
+
     def __repr__(self):
         return f"<RSSFeed(feed_id={self.feed_id}, source_name='{self.source_name}')>"
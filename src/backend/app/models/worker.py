@@ -0,0 +1,19 @@
+"""Ingestion worker membership model"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IngestionWorker(Base):
+    """Live ingestion worker process, kept current by its heartbeat"""
+
+    __tablename__ = "ingestion_workers"
+
+    worker_id = Column(String(100), primary_key=True)
+    started_at = Column(DateTime, server_default=func.now())
+    heartbeat_at = Column(DateTime, nullable=False, index=True)
+    feeds = Column(Integer, default=0)  # feeds in its shard at the last heartbeat
+
+    def __repr__(self):
+        return f"<IngestionWorker(worker_id={self.worker_id}, heartbeat_at={self.heartbeat_at})>"
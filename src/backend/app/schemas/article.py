@@ -10,9 +10,11 @@ class ArticleResponse(BaseModel):
     feed_id: int
     headline: str
     url: str
+    canonical_url: Optional[str] = None
     source: str
     publish_datetime: datetime
     processed_status: str
+    duplicate_of: Optional[int] = None
     created_at: datetime
 
     class Config:
@@ -25,6 +25,33 @@ class RSSFeedResponse(RSSFeedBase):
     updated_at: datetime
     error_count: int
     last_error: Optional[str] = None
+    circuit_state: str = "closed"
+    circuit_opened_at: Optional[datetime] = None
+    fetch_count: int = 0
+    not_modified_count: int = 0
+    cache_hit_ratio: float = 0.0
+    bytes_downloaded: int = 0
+    last_response_bytes: Optional[int] = None
+    last_seen_published: Optional[datetime] = None
+    is_chronological: Optional[bool] = None
+    arrival_interval_ewma: Optional[float] = None
+    current_poll_interval: Optional[int] = None
+    websub_hub: Optional[str] = None
+    websub_state: Optional[str] = None
+    websub_lease_expires: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class FeedImportRejection(BaseModel):
+    feed_url: str
+    error: str
+
+
+class FeedImportResponse(BaseModel):
+    received: int
+    created: int
+    updated: int
+    unvalidated: int = 0  # imported without a check when validation ran out of time
+    rejected: list[FeedImportRejection] = []
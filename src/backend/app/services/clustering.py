@@ -6,7 +6,7 @@ from typing import List, Dict, Any
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import structlog
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.models import Article, NewsEvent, EventArticle
@@ -224,16 +224,16 @@ Return only valid JSON. No markdown, no explanations."""
         mappings = result.scalars().all()
         event.article_count = len(mappings)
 
-        # Count unique sources
-        sources = set()
-        for mapping in mappings:
-            result = await session.execute(
-                select(Article).where(Article.article_id == mapping.article_id)
+        # Count unique sources, including near-duplicates held back from clustering
+        article_ids = [mapping.article_id for mapping in mappings]
+        result = await session.execute(
+            select(Article.source)
+            .where(
+                or_(Article.article_id.in_(article_ids), Article.duplicate_of.in_(article_ids))
             )
-            article = result.scalar_one_or_none()
-            if article:
-                sources.add(article.source)
-        event.source_count = len(sources)
+            .distinct()
+        )
+        event.source_count = len(result.scalars().all())
 
         return event
 
@@ -0,0 +1,281 @@
+"""Bulk feed import from OPML or CSV with an idempotent upsert on feed_url"""
+
+import asyncio
+import csv
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import RSSFeed
+from app.schemas.feed import RSSFeedCreate
+from app.services.host_limiter import host_key
+from app.services.rss_ingestion import SNIFF_BYTES, FeedRejected, _check_feed_content, rss_service
+
+logger = structlog.get_logger()
+
+# CSV header aliases, first match wins
+CSV_COLUMNS = {
+    "feed_url": ("feed_url", "url", "xmlurl", "rss"),
+    "source_name": ("source_name", "name", "title", "source"),
+    "category": ("category", "section"),
+    "update_interval": ("update_interval", "interval"),
+    "is_active": ("is_active", "active", "enabled"),
+}
+
+# Columns an import may overwrite on feeds that already exist, when the entry
+# gives them; schedule, stats and breaker state are kept
+UPSERT_COLUMNS = ("source_name", "category", "update_interval", "is_active")
+
+
+def parse_feed_list(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse an OPML or CSV feed list, telling them apart by the first bytes
+
+    Raises:
+        ValueError: If the list cannot be parsed
+    """
+    head = content.lstrip(b"\xef\xbb\xbf \t\r\n")[:1]
+    if head != b"<":
+        return parse_csv(content)
+    try:
+        return parse_opml(content)
+    except ET.ParseError as e:
+        raise ValueError(f"invalid OPML: {e}")
+
+
+def parse_opml(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Feeds from every <outline xmlUrl=...> in an OPML document
+
+    A feed's category is its own category attribute, else the text of the
+    outline folder it sits in.
+    """
+    root = ET.fromstring(content)
+    body = root.find("body")
+    feeds: List[Dict[str, Any]] = []
+
+    def walk(outline: ET.Element, folder: Optional[str]) -> None:
+        url = outline.get("xmlUrl") or outline.get("xmlurl")
+        name = outline.get("title") or outline.get("text")
+        if url:
+            feed = {"feed_url": url.strip(), "source_name": (name or "").strip()}
+            category = outline.get("category") or folder
+            if category:
+                feed["category"] = category.strip("/ ").split("/")[-1].lower()
+            feeds.append(feed)
+        for child in outline.findall("outline"):
+            walk(child, name if not url else folder)
+
+    for outline in (body if body is not None else root).findall("outline"):
+        walk(outline, None)
+    return feeds
+
+
+def parse_csv(content: bytes) -> List[Dict[str, Any]]:
+    """Feeds from a CSV with a header row; see CSV_COLUMNS for accepted names"""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    headers = {name.strip().lower(): name for name in reader.fieldnames or []}
+    columns = {
+        field: next((headers[alias] for alias in aliases if alias in headers), None)
+        for field, aliases in CSV_COLUMNS.items()
+    }
+    if columns["feed_url"] is None:
+        raise ValueError("CSV needs a feed_url (or url) column")
+
+    feeds = []
+    for row in reader:
+        feed = {
+            field: (row.get(column) or "").strip()
+            for field, column in columns.items()
+            if column is not None and (row.get(column) or "").strip()
+        }
+        if feed.get("feed_url"):
+            feeds.append(feed)
+    return feeds
+
+
+class FeedImporter:
+    """
+    Validate and upsert feed lists of any size in one transaction
+
+    Feeds are keyed on feed_url: existing rows get whichever of name,
+    category, interval and active flag the list gives updated, new rows are inserted with their first
+    fetch spread across FEED_IMPORT_STAGGER_WINDOW so a large import does not
+    all come due on the next cycle. Optional network validation fetches the
+    first bytes of each feed through a bounded pool, politely per host, for at
+    most FEED_IMPORT_VALIDATE_TIMEOUT seconds; feeds not checked by then are
+    imported unvalidated and left to their first fetch.
+    """
+
+    def __init__(self, service=rss_service):
+        self.service = service
+        self.concurrency = settings.FEED_IMPORT_CONCURRENCY
+        self.stagger_window = settings.FEED_IMPORT_STAGGER_WINDOW
+        self.validate_timeout = settings.FEED_IMPORT_VALIDATE_TIMEOUT
+
+    def normalise(self, feeds: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Validate entries against RSSFeedCreate, drop malformed URLs and repeats
+
+        Returns:
+            (feeds to import, {feed_url: error} for rejected entries)
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        for feed in feeds:
+            url = feed["feed_url"]
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                errors[url] = "not an http(s) URL"
+                continue
+            if len(url) > RSSFeed.feed_url.type.length:
+                errors[url] = "URL too long"
+                continue
+            # Blank fields count as not given, like columns the list lacks
+            supplied = {key: value for key, value in feed.items() if value != ""}
+            try:
+                row = RSSFeedCreate(**{"source_name": parts.hostname, **supplied})
+            except ValidationError as e:
+                errors[url] = "; ".join(f"{error['loc'][-1]}: {error['msg']}" for error in e.errors())
+                continue
+            # Only what the list gave, so a re-import leaves the rest alone;
+            # upsert fills in defaults and the hostname name for new feeds
+            fields = row.model_dump(include=set(supplied))
+            for column in ("source_name", "category"):
+                if column in fields:
+                    fields[column] = fields[column][: getattr(RSSFeed, column).type.length]
+            rows[url] = fields
+        return list(rows.values()), errors
+
+    async def validate(self, feeds: List[Dict[str, Any]]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Check each URL answers with something that looks like a feed
+
+        Returns:
+            ({feed_url: error} for feeds that failed, URLs left unchecked when
+            FEED_IMPORT_VALIDATE_TIMEOUT ran out)
+        """
+        client = await self.service._get_client()
+        slots = asyncio.Semaphore(self.concurrency)
+        errors: Dict[str, str] = {}
+
+        async def check(url: str) -> None:
+            async with slots:
+                await self.service.host_limiter.acquire(host_key(url))
+                try:
+                    async with client.stream("GET", url, follow_redirects=True) as response:
+                        if response.status_code >= 400:
+                            errors[url] = f"HTTP {response.status_code}"
+                            return
+                        head = b""
+                        async for chunk in response.aiter_bytes():
+                            head += chunk
+                            if len(head) >= SNIFF_BYTES:
+                                break
+                        _check_feed_content(response, head)
+                except (httpx.HTTPError, FeedRejected) as e:
+                    errors[url] = str(e) or type(e).__name__
+
+        tasks = {asyncio.create_task(check(feed["feed_url"])): feed["feed_url"] for feed in feeds}
+        _, pending = await asyncio.wait(tasks, timeout=self.validate_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        unchecked = [tasks[task] for task in pending]
+        if unchecked:
+            logger.warning("feed_import_validation_timeout", unchecked=len(unchecked))
+        return errors, unchecked
+
+    async def upsert(self, session: AsyncSession, feeds: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert new feeds and update existing ones in a single transaction
+
+        Returns:
+            Counts of created and updated feeds
+        """
+        if not feeds:
+            return {"created": 0, "updated": 0}
+
+        urls = [feed["feed_url"] for feed in feeds]
+        existing = set()
+        for i in range(0, len(urls), self.service.dedup_chunk_size):
+            result = await session.execute(
+                select(RSSFeed.feed_url).where(
+                    RSSFeed.feed_url.in_(urls[i : i + self.service.dedup_chunk_size])
+                )
+            )
+            existing.update(result.scalars().all())
+
+        # New feeds come due evenly over the window instead of all at once
+        now = datetime.utcnow()
+        new = [feed for feed in feeds if feed["feed_url"] not in existing]
+        step = self.stagger_window / len(new) if new else 0
+        due = {feed["feed_url"]: now + timedelta(seconds=step * i) for i, feed in enumerate(new)}
+
+        # Existing feeds only take the columns their entry gave, so rows are
+        # grouped into one statement per set of supplied columns
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for feed in feeds:
+            url = feed["feed_url"]
+            defaults = RSSFeedCreate(feed_url=url, source_name=urlsplit(url).hostname[:100]).model_dump()
+            columns = tuple(column for column in UPSERT_COLUMNS if column in feed)
+            groups.setdefault(columns, []).append(
+                {**defaults, **feed, "next_fetch_scheduled": due.get(url)}
+            )
+
+        dialect = session.bind.dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for columns, rows in groups.items():
+            stmt = insert(RSSFeed.__table__)
+            if columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["feed_url"],
+                    set_={column: stmt.excluded[column] for column in columns},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["feed_url"])
+            await session.execute(stmt, rows)
+        await session.commit()
+
+        counts = {"created": len(new), "updated": len(feeds) - len(new)}
+        logger.info("feeds_imported", **counts)
+        return counts
+
+    async def import_feeds(
+        self, session: AsyncSession, content: bytes, validate: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Parse, validate and upsert a feed list
+
+        Returns:
+            Counts of feeds received, created, updated and imported without
+            validation, and the rejected feeds with their errors
+        """
+        parsed = parse_feed_list(content)
+        feeds, errors = self.normalise(parsed)
+        unvalidated: List[str] = []
+        if validate and feeds:
+            failed, unvalidated = await self.validate(feeds)
+            errors.update(failed)
+            feeds = [feed for feed in feeds if feed["feed_url"] not in errors]
+
+        counts = await self.upsert(session, feeds)
+        return {
+            "received": len(parsed),
+            **counts,
+            "unvalidated": len(unvalidated),
+            "rejected": [{"feed_url": url, "error": error} for url, error in errors.items()],
+        }
+
+
+# Global importer instance
+feed_importer = FeedImporter()
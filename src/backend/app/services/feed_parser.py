@@ -0,0 +1,221 @@
+"""CPU-bound feed parsing, safe to run in a worker process"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, XMLPullParser
+import feedparser
+
+# (url, title, published (Y, M, D, h, m, s) in UTC or None, raw_content or None)
+ParsedEntry = Tuple[str, str, Optional[Tuple[int, ...]], Optional[str]]
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DCTERMS_NS = "http://purl.org/dc/terms/"
+
+# Namespaces the fast path understands or can safely ignore; anything else
+# goes to feedparser
+KNOWN_NAMESPACES = {
+    ATOM_NS,
+    CONTENT_NS,
+    DCTERMS_NS,
+    "http://purl.org/dc/elements/1.1/",
+    "http://search.yahoo.com/mrss/",
+    "http://purl.org/rss/1.0/modules/syndication/",
+    "http://purl.org/rss/1.0/modules/slash/",
+    "http://wellformedweb.org/CommentAPI/",
+    "http://rssnamespace.org/feedburner/ext/1.0",
+    "http://www.w3.org/XML/1998/namespace",
+}
+
+FAST_PARSE_CHUNK = 64 * 1024
+
+
+class UnsupportedFeed(Exception):
+    """Raised by the fast path for documents it leaves to feedparser"""
+
+
+def parse_feed_entries(
+    content: bytes, fast: bool = True
+) -> Tuple[List[ParsedEntry], Optional[str]]:
+    """
+    Parse an RSS/Atom document into compact, picklable entry tuples
+
+    Module-level so it can be submitted to a ProcessPoolExecutor; only the
+    fields the ingestion service uses cross the process boundary. Plain RSS 2.0
+    and Atom go through the streaming fast path; anything unusual falls back
+    to feedparser.
+
+    Returns:
+        Entries in document order, and the parser warning if the feed was malformed
+    """
+    if fast:
+        try:
+            return fast_parse_entries(content), None
+        except (ParseError, UnsupportedFeed):
+            pass
+
+    return feedparser_entries(content)
+
+
+def feedparser_entries(content: bytes) -> Tuple[List[ParsedEntry], Optional[str]]:
+    """Parse with feedparser, which copes with malformed and exotic feeds"""
+    parsed = feedparser.parse(content)
+    warning = str(parsed.bozo_exception) if parsed.bozo else None
+
+    entries = []
+    for entry in parsed.entries:
+        compact = _compact_entry(entry)
+        if compact:
+            entries.append(compact)
+
+    return entries, warning
+
+
+def _compact_entry(entry: dict) -> Optional[ParsedEntry]:
+    """Reduce a feedparser entry to the fields used for Article rows"""
+    url = entry.get("link")
+    title = entry.get("title", "")
+    if not url or not title:
+        return None
+
+    published_parsed = entry.get("published_parsed")
+    published = tuple(published_parsed[:6]) if published_parsed else None
+
+    raw_content = None
+    if "content" in entry:
+        raw_content = entry.content[0].value
+    elif "summary" in entry:
+        raw_content = entry.summary
+    elif "description" in entry:
+        raw_content = entry.description
+
+    return url, title, published, raw_content
+
+
+def fast_parse_entries(content: bytes) -> List[ParsedEntry]:
+    """
+    Extract entries from RSS 2.0 or Atom with an incremental XML pull parser
+
+    Unlike feedparser, summaries and content are returned as published, without
+    HTML sanitising; they are only stored, never rendered.
+
+    Raises:
+        ParseError: the document is not well-formed XML
+        UnsupportedFeed: the document needs feedparser's handling
+    """
+    parser = XMLPullParser(events=("start", "end", "start-ns"))
+    entries: List[ParsedEntry] = []
+    fields: Optional[dict] = None
+    atom = None
+
+    for offset in range(0, len(content), FAST_PARSE_CHUNK):
+        parser.feed(content[offset : offset + FAST_PARSE_CHUNK])
+        for event, elem in parser.read_events():
+            if event == "start-ns":
+                if elem[1] not in KNOWN_NAMESPACES:
+                    raise UnsupportedFeed(f"namespace {elem[1]}")
+                continue
+
+            if atom is None:
+                if event != "start":
+                    continue
+                if elem.tag == "rss":
+                    atom = False
+                elif elem.tag == f"{{{ATOM_NS}}}feed":
+                    atom = True
+                else:
+                    raise UnsupportedFeed(f"root element {elem.tag}")
+                continue
+
+            if event == "start":
+                if elem.tag in ("item", f"{{{ATOM_NS}}}entry"):
+                    fields = {}
+                elif fields is not None and elem.get("type") == "xhtml":
+                    raise UnsupportedFeed("inline xhtml content")
+                continue
+
+            # end event
+            if elem.tag in ("item", f"{{{ATOM_NS}}}entry"):
+                entry = _fast_entry(fields)
+                if entry:
+                    entries.append(entry)
+                fields = None
+                elem.clear()
+            elif fields is not None:
+                _collect_field(fields, elem, atom)
+
+    parser.close()
+    if atom is None:
+        raise UnsupportedFeed("empty document")
+    return entries
+
+
+def _collect_field(fields: dict, elem, atom: bool) -> None:
+    """Record the first occurrence of each entry field we care about"""
+    tag = elem.tag
+    text = (elem.text or "").strip()
+
+    if atom:
+        if tag == f"{{{ATOM_NS}}}link":
+            rel = elem.get("rel", "alternate")
+            if rel == "alternate" and "link" not in fields:
+                fields["link"] = (elem.get("href") or "").strip()
+            return
+        key = {
+            f"{{{ATOM_NS}}}title": "title",
+            f"{{{ATOM_NS}}}published": "published",
+            f"{{{ATOM_NS}}}content": "content",
+            f"{{{ATOM_NS}}}summary": "summary",
+            f"{{{DCTERMS_NS}}}issued": "published",
+        }.get(tag)
+    else:
+        if tag == "guid":
+            if elem.get("isPermaLink", "true").lower() == "true":
+                fields.setdefault("guid", text)
+            return
+        key = {
+            "title": "title",
+            "link": "link",
+            "pubDate": "published",
+            "description": "summary",
+            f"{{{CONTENT_NS}}}encoded": "content",
+            f"{{{DCTERMS_NS}}}issued": "published",
+        }.get(tag)
+
+    if key and key not in fields:
+        fields[key] = text
+
+
+def _fast_entry(fields: dict) -> Optional[ParsedEntry]:
+    """Build an entry tuple, mirroring _compact_entry's field precedence"""
+    url = fields.get("link") or fields.get("guid")
+    title = fields.get("title")
+    if not url or not title:
+        return None
+    if not url.startswith(("http://", "https://")):
+        # Relative links need xml:base resolution
+        raise UnsupportedFeed(f"relative link {url}")
+
+    published = None
+    if fields.get("published"):
+        published = _parse_date(fields["published"])
+
+    raw_content = fields["content"] if "content" in fields else fields.get("summary")
+
+    return url, title, published, raw_content
+
+
+def _parse_date(value: str) -> Optional[Tuple[int, ...]]:
+    """Parse RFC 822 or ISO 8601 dates into a UTC (Y, M, D, h, m, s) tuple"""
+    try:
+        if value[:4].isdigit():
+            parsed = datetime.fromisoformat(value)
+        else:
+            parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        raise UnsupportedFeed(f"date {value}")
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.timetuple()[:6]
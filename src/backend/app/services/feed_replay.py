@@ -0,0 +1,289 @@
+"""Replay recorded feed payloads through the ingestion pipeline without the network"""
+
+import asyncio
+import json
+import tarfile
+import time
+import zipfile
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+import httpx
+import structlog
+from sqlalchemy import select
+from app.core.stats import percentile
+from app.models import RSSFeed
+from app.services.rss_ingestion import RSSIngestionService
+
+logger = structlog.get_logger()
+
+MANIFEST = "manifest.jsonl"
+
+
+class RecordedPayload:
+    """One recorded response of a feed"""
+
+    def __init__(
+        self,
+        feed_url: str,
+        fetched_at: datetime,
+        content: bytes,
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.feed_url = feed_url
+        self.fetched_at = fetched_at
+        self.content = content
+        self.status = status
+        self.headers = headers or {}
+
+
+def load_recording(path: Path) -> List[RecordedPayload]:
+    """
+    Load payloads from a directory, .zip or .tar(.gz) archive, oldest first
+
+    A manifest.jsonl with one {"feed_url", "fetched_at", "file", "status",
+    "headers"} object per line describes each payload. Without one, every
+    .xml file is a single payload of the feed replay://<file stem>, timed by
+    its modification time.
+    """
+    files = _read_files(Path(path))
+
+    if MANIFEST in files:
+        payloads = []
+        for line in files[MANIFEST].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            payloads.append(
+                RecordedPayload(
+                    feed_url=record["feed_url"],
+                    fetched_at=datetime.fromisoformat(record["fetched_at"]),
+                    content=files[record["file"]],
+                    status=record.get("status", 200),
+                    headers=record.get("headers"),
+                )
+            )
+    else:
+        payloads = [
+            RecordedPayload(
+                feed_url=f"replay://{Path(name).stem}",
+                fetched_at=datetime.utcfromtimestamp(mtime),
+                content=content,
+            )
+            for name, (content, mtime) in _file_times(Path(path), files).items()
+            if name.endswith(".xml")
+        ]
+
+    payloads.sort(key=lambda payload: payload.fetched_at)
+    return payloads
+
+
+def write_payload(
+    directory: Path,
+    feed_url: str,
+    fetched_at: datetime,
+    content: bytes,
+    status: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> None:
+    """Append one payload to a recording directory"""
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = directory / MANIFEST
+    index = 0
+    if manifest.exists():
+        with manifest.open() as f:
+            index = sum(1 for _ in f)
+
+    name = f"{index:06d}.xml"
+    (directory / name).write_bytes(content)
+    record = {
+        "feed_url": feed_url,
+        "fetched_at": fetched_at.isoformat(),
+        "file": name,
+        "status": status,
+        "headers": headers or {},
+    }
+    with manifest.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _read_files(path: Path) -> Dict[str, bytes]:
+    if path.is_dir():
+        return {
+            str(file.relative_to(path)): file.read_bytes()
+            for file in sorted(path.rglob("*"))
+            if file.is_file()
+        }
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return {
+                info.filename: archive.read(info)
+                for info in archive.infolist()
+                if not info.is_dir()
+            }
+    with tarfile.open(path) as archive:
+        return {
+            member.name: archive.extractfile(member).read()
+            for member in archive.getmembers()
+            if member.isfile()
+        }
+
+
+def _file_times(path: Path, files: Dict[str, bytes]) -> Dict[str, tuple]:
+    """Pair each file's content with its modification time"""
+    if path.is_dir():
+        return {name: (content, (path / name).stat().st_mtime) for name, content in files.items()}
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return {
+                info.filename: (files[info.filename], time.mktime(info.date_time + (0, 0, -1)))
+                for info in archive.infolist()
+                if info.filename in files
+            }
+    with tarfile.open(path) as archive:
+        return {
+            member.name: (files[member.name], member.mtime)
+            for member in archive.getmembers()
+            if member.name in files
+        }
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve the next queued payload for each URL, 404 once a feed runs out"""
+
+    def __init__(self):
+        self.queues: Dict[str, Deque[RecordedPayload]] = defaultdict(deque)
+
+    def queue(self, payload: RecordedPayload) -> None:
+        self.queues[payload.feed_url].append(payload)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        queue = self.queues.get(str(request.url))
+        if not queue:
+            return httpx.Response(404, request=request)
+        payload = queue.popleft()
+        return httpx.Response(
+            payload.status,
+            headers=payload.headers,
+            stream=httpx.ByteStream(payload.content),
+            request=request,
+        )
+
+
+class FeedReplayer:
+    """
+    Drive RSSIngestionService with recorded payloads instead of live fetches
+
+    Payloads go through the real fetch, parse, dedup and write stages; only
+    the HTTP transport is replaced. With speed set, payloads are released at
+    their recorded spacing divided by speed; without it, as fast as the
+    pipeline accepts them. Each batch holds at most one payload per feed.
+    """
+
+    def __init__(self, payloads: List[RecordedPayload], session_factory, speed: Optional[float] = None):
+        self.payloads = payloads
+        self.session_factory = session_factory
+        self.speed = speed
+        self.transport = ReplayTransport()
+
+        self.service = RSSIngestionService(client=httpx.AsyncClient(transport=self.transport))
+        # Recorded responses are not real requests: no politeness or backoff waits
+        limiter = self.service.host_limiter
+        limiter.rate = limiter.burst = 1e9
+        # A recorded 429/503 still counts as throttled, but pauses nothing
+        limiter.default_pause = limiter.max_pause = 0
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Replay every payload and return throughput and latency figures
+
+        Returns:
+            Payload and article counts, articles/s, DB write rows/s, and
+            end-to-end latency from a payload's release to its commit
+        """
+        await self.service.start()
+        try:
+            feeds = await self._ensure_feeds()
+            async with self.session_factory() as session:
+                await self.service.seen_filter.rebuild(session)
+                await self.service.near_duplicates.rebuild(session)
+            return await self._replay(feeds)
+        finally:
+            await self.service.close()
+
+    async def _ensure_feeds(self) -> Dict[str, int]:
+        """Create a feed row for each recorded URL that has none"""
+        urls = sorted({payload.feed_url for payload in self.payloads})
+        async with self.session_factory() as session:
+            result = await session.execute(select(RSSFeed).where(RSSFeed.feed_url.in_(urls)))
+            feeds = {feed.feed_url: feed.feed_id for feed in result.scalars().all()}
+            for url in urls:
+                if url not in feeds:
+                    feed = RSSFeed(feed_url=url, source_name=url.split("://", 1)[-1][:100])
+                    session.add(feed)
+                    await session.flush()
+                    feeds[url] = feed.feed_id
+            await session.commit()
+        return feeds
+
+    async def _replay(self, feeds: Dict[str, int]) -> Dict[str, Any]:
+        latencies: List[float] = []
+        new_articles = 0
+        write_seconds = 0.0
+        batches = 0
+
+        start = time.monotonic()
+        origin = self.payloads[0].fetched_at if self.payloads else None
+        pending: List[RecordedPayload] = []
+        released: List[float] = []
+
+        async def flush() -> None:
+            nonlocal new_articles, write_seconds, batches
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(RSSFeed).where(
+                        RSSFeed.feed_id.in_({feeds[payload.feed_url] for payload in pending})
+                    )
+                )
+                new_articles += await self.service.fetch_feeds(result.scalars().all(), session)
+            done = time.monotonic()
+            latencies.extend(done - at for at in released)
+            write_seconds += self.service.last_cycle_write_seconds
+            batches += 1
+            pending.clear()
+            released.clear()
+
+        for payload in self.payloads:
+            if self.speed:
+                due = (payload.fetched_at - origin).total_seconds() / self.speed
+                if due > time.monotonic() - start:
+                    if pending:
+                        await flush()
+                    await asyncio.sleep(max(0.0, due - (time.monotonic() - start)))
+
+            if any(queued.feed_url == payload.feed_url for queued in pending):
+                await flush()
+            self.transport.queue(payload)
+            pending.append(payload)
+            released.append(time.monotonic())
+
+        if pending:
+            await flush()
+
+        elapsed = time.monotonic() - start
+        stats = {
+            "payloads": len(self.payloads),
+            "feeds": len(feeds),
+            "batches": batches,
+            "new_articles": new_articles,
+            "elapsed_seconds": round(elapsed, 3),
+            "articles_per_second": round(new_articles / elapsed, 1) if elapsed else 0.0,
+            "write_seconds": round(write_seconds, 3),
+            "db_rows_per_second": round(new_articles / write_seconds, 1) if write_seconds else 0.0,
+            "latency_p50": round(percentile(latencies, 50), 3),
+            "latency_p95": round(percentile(latencies, 95), 3),
+        }
+        logger.info("feed_replay_completed", **stats)
+        return stats
@@ -0,0 +1,57 @@
+"""Consistent-hash assignment of feeds to ingestion worker processes"""
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+
+
+def _point(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping feed_id to a worker
+
+    Each worker is placed on the ring SHARD_VIRTUAL_NODES times so shards stay
+    even; a feed belongs to the first worker point at or after its own. When a
+    worker joins or leaves only the feeds on its arcs change owner, about
+    1/N of them, so the other workers keep their schedules and caches.
+    """
+
+    def __init__(self, workers: Iterable[str] = (), virtual_nodes: Optional[int] = None):
+        self.virtual_nodes = virtual_nodes or settings.SHARD_VIRTUAL_NODES
+        self.workers: Set[str] = set()
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.set_workers(workers)
+
+    def set_workers(self, workers: Iterable[str]) -> None:
+        self.workers = set(workers)
+        ring: List[Tuple[int, str]] = sorted(
+            (_point(f"{worker}#{replica}"), worker)
+            for worker in self.workers
+            for replica in range(self.virtual_nodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [worker for _, worker in ring]
+
+    def add(self, worker: str) -> None:
+        self.set_workers(self.workers | {worker})
+
+    def remove(self, worker: str) -> None:
+        self.set_workers(self.workers - {worker})
+
+    def owner(self, feed_id: int) -> str:
+        if not self._points:
+            raise LookupError("no workers on the ring")
+        index = bisect.bisect_left(self._points, _point(f"feed:{feed_id}"))
+        return self._owners[index % len(self._owners)]
+
+    def shards(self, feed_ids: Iterable[int]) -> Dict[str, List[int]]:
+        """Group feed ids by owning worker"""
+        shards: Dict[str, List[int]] = {worker: [] for worker in self.workers}
+        for feed_id in feed_ids:
+            shards[self.owner(feed_id)].append(feed_id)
+        return shards
@@ -0,0 +1,145 @@
+"""Per-host politeness limiter for outbound feed requests"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import structlog
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+def host_key(url: str) -> str:
+    """Key a URL's host is limited under: host and port, lower-cased"""
+    return urlsplit(url).netloc.lower()
+
+
+class TokenBucket:
+    """Token bucket for one host, with an optional pause after throttling"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+        # Metrics
+        self.requests = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.throttled = 0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """
+    Token-bucket rate limit per host, shared by every feed on that host
+
+    Each host gets HOST_RATE_LIMIT requests per second with bursts of up to
+    HOST_RATE_BURST; HOST_RATE_OVERRIDES sets a different rate for named hosts.
+    A 429 or 503 pauses the whole host until its Retry-After has passed.
+    """
+
+    def __init__(self):
+        self.rate = settings.HOST_RATE_LIMIT
+        self.burst = settings.HOST_RATE_BURST
+        self.overrides = {host.lower(): rate for host, rate in settings.HOST_RATE_OVERRIDES.items()}
+        self.default_pause = settings.HOST_THROTTLE_PAUSE
+        self.max_pause = settings.HOST_THROTTLE_MAX_PAUSE
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.overrides.get(host, self.rate), self.burst)
+        return self._buckets[host]
+
+    async def acquire(self, host: str) -> float:
+        """
+        Wait until the host may be sent another request
+
+        Returns:
+            Seconds spent waiting
+        """
+        bucket = self._bucket(host)
+        start = time.monotonic()
+
+        while True:
+            now = time.monotonic()
+            bucket.refill(now)
+            delay = bucket.paused_until - now
+            if delay <= 0:
+                if bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    break
+                delay = (1 - bucket.tokens) / bucket.rate
+            await asyncio.sleep(delay)
+
+        waited = time.monotonic() - start
+        bucket.requests += 1
+        bucket.wait_total += waited
+        bucket.wait_max = max(bucket.wait_max, waited)
+        return waited
+
+    def paused_for(self, host: str) -> float:
+        """Seconds left on a host's throttle pause, 0 when it may be requested"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return 0.0
+        return max(0.0, bucket.paused_until - time.monotonic())
+
+    def throttle(self, host: str, retry_after: Optional[str] = None) -> float:
+        """
+        Pause a host that answered 429/503, honouring its Retry-After header
+
+        Returns:
+            Seconds the host is paused for
+        """
+        pause = _retry_after_seconds(retry_after)
+        if pause is None:
+            pause = self.default_pause
+        pause = min(max(pause, 0.0), self.max_pause)
+
+        bucket = self._bucket(host)
+        bucket.throttled += 1
+        bucket.paused_until = max(bucket.paused_until, time.monotonic() + pause)
+        logger.warning("host_throttled", host=host, pause=round(pause, 1), retry_after=retry_after)
+        return pause
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request counts, wait times and any remaining pause"""
+        now = time.monotonic()
+        return {
+            host: {
+                "rate": bucket.rate,
+                "requests": bucket.requests,
+                "wait_total": round(bucket.wait_total, 3),
+                "wait_avg": round(bucket.wait_total / bucket.requests, 3) if bucket.requests else 0.0,
+                "wait_max": round(bucket.wait_max, 3),
+                "throttled": bucket.throttled,
+                "paused_for": round(max(0.0, bucket.paused_until - now), 1),
+            }
+            for host, bucket in sorted(self._buckets.items())
+        }
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse Retry-After as delta seconds or an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return (retry_at - datetime.now(timezone.utc)).total_seconds()
@@ -0,0 +1,170 @@
+"""Ingest-time near-duplicate headline detection with MinHash and LSH banding"""
+
+import hashlib
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Article
+
+logger = structlog.get_logger()
+
+# Mersenne prime modulus for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+# Trailing " - Reuters" / " | CNBC" style source attributions
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+_TOKEN = re.compile(r"[a-z0-9]+(?:['.][a-z0-9]+)*")
+
+
+def headline_tokens(headline: str) -> FrozenSet[str]:
+    """Normalised word set of a headline, without source attribution or punctuation"""
+    headline = _SOURCE_SUFFIX.sub("", headline.strip())
+    return frozenset(_TOKEN.findall(headline.lower().replace("’", "'")))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    Index of recent canonical headlines answering "is this a rewording of one we have?"
+
+    Each headline's word set gets a MinHash signature split into LSH bands;
+    headlines sharing any band are candidates, confirmed by their exact Jaccard
+    similarity against NEAR_DUP_THRESHOLD. Only canonical articles are indexed,
+    so a duplicate always points at the first version seen. Entries older than
+    NEAR_DUP_WINDOW_HOURS are dropped.
+    """
+
+    def __init__(self):
+        self.enabled = settings.NEAR_DUP_DETECTION
+        self.threshold = settings.NEAR_DUP_THRESHOLD
+        self.window = timedelta(hours=settings.NEAR_DUP_WINDOW_HOURS)
+        self.bands = settings.NEAR_DUP_BANDS
+        self.rows_per_band = max(1, settings.NEAR_DUP_NUM_PERM // self.bands)
+        self.min_tokens = 3  # shorter headlines are too generic to call duplicates
+
+        rng = random.Random(0x5EED)
+        num_perm = self.bands * self.rows_per_band
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+        # key (article_id, or URL until the row has an id) -> (tokens, band keys, published)
+        self._entries: Dict[Hashable, Tuple[FrozenSet[str], List[Tuple[int, int]], datetime]] = {}
+        self._buckets: Dict[Tuple[int, int], List[Hashable]] = {}
+        self._last_prune = time.monotonic()
+        # Highest article_id read from the database, where refresh() resumes
+        self._last_article_id = 0
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Index canonical articles stored within the window"""
+        self._entries.clear()
+        self._buckets.clear()
+        self._last_article_id = 0
+        await self.refresh(session)
+        logger.info("near_duplicate_index_rebuilt", headlines=len(self._entries))
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """
+        Index canonical articles stored since the last rebuild or refresh
+
+        Picks up headlines written by other processes. Rows are found by
+        article_id, so one committed after a higher id was already read is
+        left for the next rebuild.
+
+        Returns:
+            Number of headlines added
+        """
+        result = await session.execute(
+            select(Article.article_id, Article.headline, Article.publish_datetime)
+            .where(Article.article_id > self._last_article_id)
+            .where(Article.publish_datetime >= datetime.utcnow() - self.window)
+            .where(Article.processed_status != "duplicate")
+            .order_by(Article.article_id)
+        )
+        added = 0
+        for article_id, headline, published in result.all():
+            self._last_article_id = article_id
+            if article_id not in self._entries:
+                self.add(article_id, headline_tokens(headline), published)
+                added += 1
+        return added
+
+    def find(self, tokens: FrozenSet[str]) -> Optional[Hashable]:
+        """Key of the most similar indexed headline at or above the threshold"""
+        if not self.enabled or len(tokens) < self.min_tokens:
+            return None
+
+        candidates = set()
+        for band_key in self._band_keys(tokens):
+            candidates.update(self._buckets.get(band_key, ()))
+
+        best, best_score = None, self.threshold
+        for key in candidates:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            score = jaccard(tokens, entry[0])
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def add(self, key: Hashable, tokens: FrozenSet[str], published: datetime) -> None:
+        """Index a canonical headline"""
+        if not self.enabled or len(tokens) < self.min_tokens:
+            return
+        band_keys = self._band_keys(tokens)
+        self._entries[key] = (tokens, band_keys, published)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(key)
+
+        if time.monotonic() - self._last_prune > 300:
+            self.prune()
+
+    def rekey(self, old: Hashable, new: Hashable) -> None:
+        """Move an entry to a new key, e.g. from its URL to its article_id"""
+        entry = self._entries.get(old)
+        if entry is not None:
+            self.remove(old)
+            self.add(new, entry[0], entry[2])
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band_key in entry[1]:
+            bucket = self._buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def prune(self, now: Optional[datetime] = None) -> None:
+        """Drop headlines published before the window"""
+        cutoff = (now or datetime.utcnow()) - self.window
+        for key in [key for key, entry in self._entries.items() if entry[2] < cutoff]:
+            self.remove(key)
+        self._last_prune = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"headlines": len(self._entries), "buckets": len(self._buckets)}
+
+    def _band_keys(self, tokens: FrozenSet[str]) -> List[Tuple[int, int]]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            for token in tokens
+        ]
+        signature = [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+        rows = self.rows_per_band
+        return [
+            (band, hash(tuple(signature[band * rows : (band + 1) * rows])))
+            for band in range(self.bands)
+        ]
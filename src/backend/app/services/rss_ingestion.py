@@ -2,26 +2,139 @@
 
 import asyncio
 import hashlib
+import importlib.util
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional
-import feedparser
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import httpx
 import structlog
-from sqlalchemy import select
+from sqlalchemy import inspect as sa_inspect, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
+from app.core.stats import percentile
 from app.models import RSSFeed, Article
+from app.services.adaptive_polling import AdaptivePoller
+from app.services.feed_parser import ParsedEntry, parse_feed_entries
+from app.services.host_limiter import HostRateLimiter, host_key
+from app.services.near_duplicates import NearDuplicateIndex, headline_tokens
+from app.services.seen_filter import SeenFilter
+from app.services.url_canonical import canonicalize_url
+from app.services.websub import WebSubManager, discover_hub
 
 logger = structlog.get_logger()
 
+# Leading bytes that identify an RSS, Atom or RDF document
+FEED_PREFIXES = (b"<?xml", b"<rss", b"<feed", b"<rdf")
+SNIFF_BYTES = 512
+
+
+class FeedRejected(Exception):
+    """Raised when a response is too large or is not a feed"""
+
 
 class RSSIngestionService:
     """Service for fetching and parsing RSS feeds"""
 
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.timeout = settings.RSS_TIMEOUT
         self.max_retries = settings.RSS_MAX_RETRIES
+        self.max_bytes = settings.RSS_MAX_BYTES
         self.user_agent = "NewsTrading/1.0 (compatible; trading system)"
+        self.max_connections_per_host = settings.RSS_MAX_CONNECTIONS_PER_HOST
+        self.dedup_chunk_size = settings.DEDUP_CHUNK_SIZE
+        self.fetch_concurrency = settings.FEED_FETCH_CONCURRENCY
+        self.commit_batch_size = settings.INGEST_COMMIT_BATCH
+        self.backoff_base = settings.FEED_BACKOFF_BASE
+        self.backoff_max = settings.FEED_BACKOFF_MAX
+        self.circuit_threshold = settings.FEED_CIRCUIT_THRESHOLD
+        self.circuit_cooldown = settings.FEED_CIRCUIT_COOLDOWN
+        self.seen_filter = SeenFilter()
+        self.near_duplicates = NearDuplicateIndex()
+        self.websub = WebSubManager()
+        self.poller = AdaptivePoller()
+        self.last_cycle_stats: Dict[str, Any] = {}
+
+        # Stories dropped only because their canonical URL matched, and the
+        # clustering prompt tokens that would have been spent on them
+        self.canonical_duplicates = 0
+        self.canonical_tokens_saved = 0
+        self.near_duplicate_count = 0
+        self.near_duplicate_tokens_saved = 0
+        self.last_cycle_commits = 0
+        self.last_cycle_write_seconds = 0.0
+
+        # Long-lived pooled client, opened in start() and closed in close()
+        self._client = client
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.host_limiter = HostRateLimiter()
+
+        # Overlapping cycles fetch in parallel but take turns writing
+        self._write_lock = asyncio.Lock()
+
+        # Rows written since the last commit. They reach the seen-filter and the
+        # near-duplicate index only once committed, and are dropped on rollback.
+        self._pending_rows: List[dict] = []
+        self._pending_ids: Dict[str, Optional[int]] = {}  # URL -> article_id
+        self._pending_keys: Set[str] = set()  # canonical URLs and content hashes
+
+        # Worker processes for CPU-bound parsing; None parses inline on the loop
+        self.parse_workers = settings.PARSE_WORKERS
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.fast_parser = settings.FAST_FEED_PARSER
+
+    async def start(self) -> None:
+        """Open the shared HTTP client and the parse worker pool"""
+        if self._client is None:
+            self._client = self._create_client()
+            logger.info("rss_http_client_started")
+        if self._parse_pool is None and self.parse_workers > 0:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+            logger.info("rss_parse_pool_started", workers=self.parse_workers)
+
+    async def close(self) -> None:
+        """Close the shared HTTP client, its pooled connections and the parse pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("rss_http_client_closed")
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+            logger.info("rss_parse_pool_closed")
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create a keep-alive client shared by all feed fetches"""
+        http2 = settings.RSS_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("rss_http2_unavailable", reason="h2 package not installed")
+            http2 = False
+
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=http2,
+            headers={"User-Agent": self.user_agent},
+            limits=httpx.Limits(
+                max_connections=settings.RSS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.RSS_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.RSS_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, opening it on first use outside the app lifespan"""
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        """Semaphore capping concurrent connections to a single host"""
+        host = host_key(url)
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_slots[host]
 
     async def fetch_feed(self, feed: RSSFeed, session: AsyncSession) -> int:
         """
@@ -34,152 +147,606 @@ class RSSIngestionService:
         Returns:
             Number of new articles ingested
         """
-        logger.info("fetching_feed", feed_id=feed.feed_id, source=feed.source_name)
-
-        try:
-            # Fetch feed content
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {"User-Agent": self.user_agent}
-                response = await client.get(feed.feed_url, headers=headers)
-                response.raise_for_status()
-
-            # Parse RSS/Atom
-            parsed = feedparser.parse(response.content)
-
-            if parsed.bozo:
-                logger.warning(
-                    "feed_parse_warning",
-                    feed_id=feed.feed_id,
-                    error=parsed.bozo_exception,
-                )
-
-            # Process entries
-            new_articles = 0
-            for entry in parsed.entries:
-                try:
-                    article = await self._parse_entry(entry, feed)
-                    if article and await self._is_new_article(article, session):
-                        session.add(article)
-                        new_articles += 1
-                except Exception as e:
-                    logger.error(
-                        "entry_parse_error",
-                        feed_id=feed.feed_id,
-                        error=str(e),
-                    )
-                    continue
-
-            # Update feed metadata
-            feed.last_fetched = datetime.utcnow()
-            feed.next_fetch_scheduled = datetime.utcnow() + timedelta(
-                seconds=feed.update_interval
-            )
-            feed.error_count = 0
-            feed.last_error = None
-
-            await session.commit()
+        self._begin_probe(feed)
+        job = FeedFetchResult(feed)
+        if await self._acquire_host(job):
+            await self._fetch(job)
+        async with self._write_lock:
+            try:
+                new_articles = await self._apply(job, session)
+            except Exception:
+                await self._rollback(session)
+                raise
+            await self._commit(session)
+
+        if job.error is not None:
+            raise job.error
+        return new_articles
+
+    async def _fetch(self, job: "FeedFetchResult") -> "FeedFetchResult":
+        """
+        Network and parse stage: download the feed and turn entries into rows
 
-            logger.info(
-                "feed_fetched_success",
-                feed_id=feed.feed_id,
-                new_articles=new_articles,
-            )
+        Works only from the snapshot held by the job, never the database session,
+        so many fetches can run in parallel while a single writer applies results.
+        The caller takes the host's rate-limit token first, see _acquire_host.
+        """
+        logger.info("fetching_feed", feed_id=job.feed_id, source=job.source_name)
 
-            return new_articles
+        try:
+            # Fetch feed content, revalidating against the last response
+            client = await self._get_client()
+            headers = {"User-Agent": self.user_agent}
+            headers.update(self._conditional_headers(job))
+            host = host_key(job.feed_url)
+            async with self._host_slot(job.feed_url):
+                async with client.stream("GET", job.feed_url, headers=headers) as response:
+                    try:
+                        if response.status_code in (429, 503):
+                            self.host_limiter.throttle(
+                                host, response.headers.get("Retry-After")
+                            )
+
+                        if response.status_code == 304:
+                            job.status = "not_modified"
+                            job.reason = "304"
+                            return job
+
+                        response.raise_for_status()
+                        content = await self._read_body(response)
+                    finally:
+                        job.bytes_downloaded = response.num_bytes_downloaded
+
+            # Some servers ignore validators; fall back to comparing body hashes
+            content_digest = hashlib.sha256(content).hexdigest()
+            if content_digest == job.content_digest:
+                job.status = "not_modified"
+                job.reason = "digest"
+                return job
+
+            await self._process_content(job, content)
+
+            job.status = "ok"
+            job.etag = response.headers.get("ETag")
+            job.last_modified = response.headers.get("Last-Modified")
+            job.content_digest = content_digest
+            if self.websub.enabled:
+                job.hub_url, job.topic_url = discover_hub(content, response.links)
 
         except httpx.HTTPError as e:
             logger.error(
                 "feed_fetch_http_error",
-                feed_id=feed.feed_id,
+                feed_id=job.feed_id,
                 error=str(e),
             )
-            feed.error_count += 1
-            feed.last_error = str(e)
-            await session.commit()
-            raise
+            job.status = "error"
+            job.error = e
 
         except Exception as e:
             logger.error(
                 "feed_fetch_error",
-                feed_id=feed.feed_id,
+                feed_id=job.feed_id,
                 error=str(e),
             )
-            feed.error_count += 1
-            feed.last_error = str(e)
+            job.status = "error"
+            job.error = e
+
+        return job
+
+    async def _process_content(self, job: "FeedFetchResult", content: bytes) -> None:
+        """Parse a feed document into the job's new article rows"""
+        # Parse RSS/Atom off the event loop
+        entries, warning = await self._parse(content)
+
+        if warning:
+            logger.warning(
+                "feed_parse_warning",
+                feed_id=job.feed_id,
+                error=warning,
+            )
+
+        # Process entries
+        rows = []
+        for entry in entries:
+            article = self._parse_entry(entry, job)
+            if article:
+                rows.append(article)
+
+        job.rows = self._new_since_high_water(job, entries, rows)
+
+    async def ingest_push(self, feed: RSSFeed, content: bytes, session: AsyncSession) -> int:
+        """
+        Ingest entries a WebSub hub pushed for a feed
+
+        A push is not a poll: only the articles and dedup state are written. Fetch
+        counts, validators, the high-water mark, error and breaker state and the
+        next poll are left as the last poll set them.
+
+        Returns:
+            Number of new articles ingested
+        """
+        job = FeedFetchResult(feed)
+        job.reason = "push"
+        await self._process_content(job, content)
+
+        async with self._write_lock:
+            try:
+                _, new_articles = await self._store_rows(job.rows, session)
+            except Exception:
+                await self._rollback(session)
+                raise
+            await self._commit(session)
+
+        logger.info("feed_push_ingested", feed_id=feed.feed_id, new_articles=new_articles)
+        return new_articles
+
+    async def sync_websub(self, session: AsyncSession) -> int:
+        """Subscribe newly discovered hubs and renew expiring leases"""
+        return await self.websub.sync(session, await self._get_client())
+
+    async def _read_body(self, response: httpx.Response) -> bytes:
+        """
+        Stream the response body, giving up early on oversized or non-feed responses
+
+        Raises:
+            FeedRejected: the body exceeds RSS_MAX_BYTES or is not RSS/Atom
+        """
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > self.max_bytes:
+            raise FeedRejected(f"Content-Length {length} exceeds {self.max_bytes} bytes")
+
+        chunks: List[bytes] = []
+        size = 0
+        sniffed = False
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise FeedRejected(f"body exceeds {self.max_bytes} bytes")
+            if not sniffed and size >= SNIFF_BYTES:
+                _check_feed_content(response, b"".join(chunks))
+                sniffed = True
+
+        content = b"".join(chunks)
+        if not sniffed:
+            _check_feed_content(response, content)
+        return content
+
+    async def _acquire_host(self, job: "FeedFetchResult") -> bool:
+        """
+        Take the host's rate-limit token for a fetch, unless the host is paused
+
+        Returns:
+            False if the job was deferred instead
+        """
+        if self._defer_if_paused(job):
+            return False
+        await self.host_limiter.acquire(host_key(job.feed_url))
+        return True
+
+    def _defer_if_paused(self, job: "FeedFetchResult") -> bool:
+        """Mark a job deferred when its host is paused, rather than waiting out the pause"""
+        pause = self.host_limiter.paused_for(host_key(job.feed_url))
+        if pause <= 0:
+            return False
+        job.status = "deferred"
+        job.retry_in = pause
+        logger.info("feed_deferred", feed_id=job.feed_id, pause=round(pause, 1))
+        return True
+
+    async def _apply(self, job: "FeedFetchResult", session: AsyncSession) -> int:
+        """
+        Write stage: store new articles and update feed metadata, without committing
+
+        Returns:
+            Number of new articles inserted
+        """
+        feed = job.feed
+        if sa_inspect(feed).expired:
+            # A rollback earlier in the cycle expired the feed row
+            await session.refresh(feed)
+
+        if job.status == "deferred":
+            # Never requested: come back once the host's pause has passed
+            feed.next_fetch_scheduled = datetime.utcnow() + timedelta(seconds=job.retry_in)
+            return 0
+
+        feed.fetch_count = (feed.fetch_count or 0) + 1
+        feed.bytes_downloaded = (feed.bytes_downloaded or 0) + job.bytes_downloaded
+        feed.last_response_bytes = job.bytes_downloaded
+
+        if job.status == "error":
+            self._record_failure(feed, job.error)
+            return 0
+
+        if job.status == "not_modified":
+            feed.not_modified_count = (feed.not_modified_count or 0) + 1
+            self._mark_fetched(feed)
+            logger.info(
+                "feed_not_modified",
+                feed_id=feed.feed_id,
+                reason=job.reason,
+                cache_hit_ratio=round(feed.cache_hit_ratio, 3),
+            )
+            return 0
+
+        await self.poller.bootstrap(feed, session)
+
+        new, new_articles = await self._store_rows(job.rows, session)
+        self.poller.observe(feed, [row["publish_datetime"] for row in new])
+
+        # Update feed metadata
+        feed.etag = job.etag
+        feed.last_modified = job.last_modified
+        feed.content_digest = job.content_digest
+        feed.is_chronological = job.is_chronological
+        if job.hub_url and job.hub_url != feed.websub_hub:
+            self.websub.discovered(feed, job.hub_url, job.topic_url)
+        if job.high_water_published is not None:
+            feed.last_seen_url = job.high_water_url
+            feed.last_seen_published = job.high_water_published
+        self._mark_fetched(feed)
+
+        logger.info(
+            "feed_fetched_success",
+            feed_id=feed.feed_id,
+            new_articles=new_articles,
+            skipped_known=job.skipped,
+        )
+
+        return new_articles
+
+    async def _store_rows(
+        self, rows: List[dict], session: AsyncSession
+    ) -> Tuple[List[dict], int]:
+        """
+        Insert the rows not already stored and link near-duplicates, without committing
+
+        Returns:
+            The rows that passed dedup, and how many of them were inserted
+        """
+        new = await self._filter_new_articles(rows, session)
+        links = self._mark_near_duplicates(new)
+        new_articles = await self._insert_articles(new, session)
+        for row in new:
+            self._pending_rows.append(row)
+            self._pending_ids[row["url"]] = row.get("article_id")
+            self._pending_keys.add(row["canonical_url"])
+            if row["content_hash"]:
+                self._pending_keys.add(row["content_hash"])
+        await self._link_near_duplicates(links, session)
+        return new, new_articles
+
+    async def _commit(self, session: AsyncSession) -> None:
+        """Commit the session, then fold the rows it wrote into the in-memory dedup state"""
+        try:
             await session.commit()
+        except Exception:
+            await self._rollback(session)
             raise
 
-    async def _parse_entry(
-        self, entry: dict, feed: RSSFeed
-    ) -> Optional[Article]:
-        """Parse RSS entry into Article model"""
-        try:
-            # Extract required fields
-            url = entry.get("link")
-            if not url:
-                return None
+        for row in self._pending_rows:
+            self.seen_filter.add(row["canonical_url"], row["content_hash"])
+            if row["processed_status"] == "duplicate":
+                continue
+            if row.get("article_id") is not None:
+                self.near_duplicates.rekey(row["url"], row["article_id"])
+            else:
+                # Lost a URL conflict; the stored row is not necessarily this headline
+                self.near_duplicates.remove(row["url"])
+        self._clear_pending()
+
+    async def _rollback(self, session: AsyncSession) -> None:
+        """Roll back the session and forget the rows it wrote"""
+        await session.rollback()
+        for row in self._pending_rows:
+            if row["processed_status"] != "duplicate":
+                self.near_duplicates.remove(row["url"])
+        self._clear_pending()
+
+    def _clear_pending(self) -> None:
+        self._pending_rows = []
+        self._pending_ids.clear()
+        self._pending_keys.clear()
+
+    def _new_since_high_water(
+        self, job: "FeedFetchResult", entries: List[ParsedEntry], rows: List[dict]
+    ) -> List[dict]:
+        """
+        Keep only the entries listed before the feed's high-water mark
 
-            title = entry.get("title", "")
-            if not title:
-                return None
+        Feeds list entries newest-first, so processing can stop at the last entry
+        seen on the previous poll, or at the first one older than it. Feeds whose
+        entries are undated or out of order get a full scan instead.
+        """
+        published = [entry[2] for entry in entries]
+        job.is_chronological = (
+            bool(published)
+            and all(published)
+            and all(newer >= older for newer, older in zip(published, published[1:]))
+        )
+
+        if rows:
+            newest = max(rows, key=lambda row: row["publish_datetime"])
+            job.high_water_url = newest["url"]
+            job.high_water_published = newest["publish_datetime"]
+
+        if not job.is_chronological or job.last_seen_published is None:
+            return rows
+
+        new_rows = []
+        for row in rows:
+            if row["url"] == job.last_seen_url or row["publish_datetime"] < job.last_seen_published:
+                break
+            new_rows.append(row)
+
+        job.skipped = len(rows) - len(new_rows)
+        return new_rows
+
+    async def _parse(self, content: bytes) -> Tuple[List[ParsedEntry], Optional[str]]:
+        """Run the CPU-bound parser in the worker pool, or inline when disabled"""
+        if self._parse_pool is None:
+            return parse_feed_entries(content, self.fast_parser)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._parse_pool, parse_feed_entries, content, self.fast_parser
+        )
+
+    def _conditional_headers(self, job: "FeedFetchResult") -> dict:
+        """Build If-None-Match / If-Modified-Since headers from stored validators"""
+        headers = {}
+        if job.etag:
+            headers["If-None-Match"] = job.etag
+        if job.last_modified:
+            headers["If-Modified-Since"] = job.last_modified
+        return headers
+
+    def _mark_fetched(self, feed: RSSFeed) -> None:
+        """Record a successful fetch and schedule the next one"""
+        now = datetime.utcnow()
+        feed.current_poll_interval = self.poller.next_interval(feed, now)
+        if feed.websub_state == "active":
+            # Pushes deliver new entries; polling only checks nothing was missed
+            feed.current_poll_interval = max(feed.current_poll_interval, self.websub.poll_interval)
+        feed.last_fetched = now
+        feed.next_fetch_scheduled = now + timedelta(seconds=feed.current_poll_interval)
+        feed.error_count = 0
+        feed.last_error = None
+
+        if feed.circuit_state not in (None, "closed"):
+            logger.info("feed_circuit_closed", feed_id=feed.feed_id)
+        feed.circuit_state = "closed"
+        feed.circuit_opened_at = None
+
+    def _record_failure(self, feed: RSSFeed, error: Exception) -> None:
+        """
+        Record a failed fetch and back off before the next attempt
+
+        The retry delay doubles with each consecutive error. After
+        FEED_CIRCUIT_THRESHOLD errors, or a failed half-open probe, the breaker
+        opens and the feed is left alone for at least FEED_CIRCUIT_COOLDOWN.
+        Delays are jittered so feeds that failed together do not retry together.
+        """
+        now = datetime.utcnow()
+        feed.error_count = (feed.error_count or 0) + 1
+        feed.last_error = str(error)
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** min(feed.error_count - 1, 20))
+        delay *= random.uniform(0.5, 1.0)
+        if feed.circuit_state == "half_open" or feed.error_count >= self.circuit_threshold:
+            if feed.circuit_state != "open":
+                logger.warning(
+                    "feed_circuit_opened", feed_id=feed.feed_id, errors=feed.error_count
+                )
+            feed.circuit_state = "open"
+            feed.circuit_opened_at = now
+            # Jitter on top of the cooldown, so it is a floor that is never cut short
+            delay = max(delay, self.circuit_cooldown * random.uniform(1.0, 1.1))
+
+        feed.next_fetch_scheduled = now + timedelta(seconds=delay)
+
+    def _begin_probe(self, feed: RSSFeed) -> None:
+        """Move an open breaker to half-open; the next fetch decides whether it closes"""
+        if feed.circuit_state == "open":
+            feed.circuit_state = "half_open"
+            logger.info("feed_circuit_half_open", feed_id=feed.feed_id)
+
+    def _parse_entry(
+        self, entry: ParsedEntry, feed: "FeedFetchResult"
+    ) -> Optional[dict]:
+        """Turn a parsed entry tuple into Article column values"""
+        try:
+            url, title, published, raw_content = entry
 
             # Parse publish date
-            published_parsed = entry.get("published_parsed")
-            if published_parsed:
-                publish_datetime = datetime(*published_parsed[:6])
+            if published:
+                publish_datetime = datetime(*published)
             else:
                 publish_datetime = datetime.utcnow()
 
-            # Extract content
-            raw_content = None
-            if "content" in entry:
-                raw_content = entry.content[0].value
-            elif "summary" in entry:
-                raw_content = entry.summary
-            elif "description" in entry:
-                raw_content = entry.description
-
             # Generate content hash for deduplication
-            hash_input = f"{title}{url}".encode("utf-8")
+            canonical_url = canonicalize_url(url)
+            hash_input = f"{title}{canonical_url}".encode("utf-8")
             content_hash = hashlib.sha256(hash_input).hexdigest()
 
-            article = Article(
-                feed_id=feed.feed_id,
-                headline=title,
-                url=url,
-                source=feed.source_name,
-                publish_datetime=publish_datetime,
-                processed_status="pending",
-                content_hash=content_hash,
-                raw_content=raw_content,
-            )
-
-            return article
+            return {
+                "feed_id": feed.feed_id,
+                "headline": title,
+                "url": url,
+                "canonical_url": canonical_url,
+                "source": feed.source_name,
+                "publish_datetime": publish_datetime,
+                "processed_status": "pending",
+                "content_hash": content_hash,
+                "raw_content": raw_content,
+            }
 
         except Exception as e:
-            logger.error("entry_parse_error", error=str(e), entry_id=entry.get("id"))
+            logger.error("entry_parse_error", feed_id=feed.feed_id, error=str(e))
             return None
 
-    async def _is_new_article(
-        self, article: Article, session: AsyncSession
-    ) -> bool:
-        """Check if article is new (not duplicate)"""
-        # Check by URL
-        result = await session.execute(
-            select(Article).where(Article.url == article.url)
+    async def _filter_new_articles(
+        self, articles: List[dict], session: AsyncSession
+    ) -> List[dict]:
+        """
+        Drop duplicates within the batch and articles already stored
+
+        Articles match on canonical URL or content hash, so tracking-parameter and
+        AMP variants of a stored story are dropped too.
+        """
+        unique = []
+        seen_urls: Dict[str, str] = {}  # canonical URL -> URL as listed
+        seen_hashes: Set[str] = set()
+        for article in articles:
+            canonical = article["canonical_url"]
+            if canonical in seen_urls:
+                if seen_urls[canonical] != article["url"]:
+                    self._count_canonical_duplicate(article)
+                continue
+            if article["content_hash"] in seen_hashes:
+                continue
+            seen_urls[canonical] = article["url"]
+            if article["content_hash"]:
+                seen_hashes.add(article["content_hash"])
+            unique.append(article)
+
+        if not unique:
+            return []
+
+        # Only keys the seen-filter cannot rule out need a database lookup
+        maybe_urls = [
+            url for url in seen_urls
+            if url in self._pending_keys or self.seen_filter.maybe_seen_url(url)
+        ]
+        maybe_hashes = [
+            h for h in seen_hashes
+            if h in self._pending_keys or self.seen_filter.maybe_seen_hash(h)
+        ]
+
+        existing_urls = await self._existing_urls(session, maybe_urls)
+        existing_hashes = await self._existing_values(
+            session, Article.content_hash, maybe_hashes
         )
-        if result.scalar_one_or_none():
-            return False
+        self.seen_filter.record_db_result(
+            len(maybe_urls) + len(maybe_hashes),
+            len(existing_urls & set(maybe_urls)) + len(existing_hashes),
+        )
+
+        new = []
+        for article in unique:
+            if article["canonical_url"] in existing_urls:
+                if article["url"] not in existing_urls:
+                    self._count_canonical_duplicate(article)
+                continue
+            if article["content_hash"] not in existing_hashes:
+                new.append(article)
+        return new
+
+    def _count_canonical_duplicate(self, article: dict) -> None:
+        self.canonical_duplicates += 1
+        self.canonical_tokens_saved += _prompt_tokens(article)
+
+    async def _insert_articles(self, rows: List[dict], session: AsyncSession) -> int:
+        """
+        Bulk insert article rows, skipping any whose URL already exists
+
+        Uses a single multi-row INSERT ... ON CONFLICT DO NOTHING so concurrent
+        ingestion of the same URL cannot violate the unique constraint. Inserted
+        rows get their new article_id.
+
+        Returns:
+            Number of rows actually inserted
+        """
+        if not rows:
+            return 0
+
+        dialect = session.bind.dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = (
+            insert(Article.__table__)
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(Article.__table__.c.article_id, Article.__table__.c.url)
+        )
+        result = await session.execute(stmt, rows)
+        ids = {url: article_id for article_id, url in result.all()}
+        for row in rows:
+            row["article_id"] = ids.get(row["url"])
+        return len(ids)
 
-        # Check by content hash
-        if article.content_hash:
+    def _mark_near_duplicates(self, rows: List[dict]) -> Dict[str, str]:
+        """
+        Mark rows whose headline rewords a recent canonical article as duplicates
+
+        Duplicates of committed articles get duplicate_of straight away. Rows that
+        duplicate one not yet committed match its URL rather than an article_id,
+        so they are returned as {url: canonical url} to link after insert.
+        """
+        links: Dict[str, str] = {}
+        for row in rows:
+            row["duplicate_of"] = None
+            tokens = headline_tokens(row["headline"])
+            match = self.near_duplicates.find(tokens)
+            if match is None:
+                # Keyed by URL until the insert assigns an article_id
+                self.near_duplicates.add(row["url"], tokens, row["publish_datetime"])
+                continue
+
+            row["processed_status"] = "duplicate"
+            if isinstance(match, int):
+                row["duplicate_of"] = match
+            else:
+                links[row["url"]] = match
+            self.near_duplicate_count += 1
+            self.near_duplicate_tokens_saved += _prompt_tokens(row)
+        return links
+
+    async def _link_near_duplicates(
+        self, links: Dict[str, str], session: AsyncSession
+    ) -> None:
+        """Point duplicates of uncommitted canonical rows at their new article_id"""
+        ids = self._pending_ids
+        for url, canonical_url in links.items():
+            if ids.get(url) is not None and ids.get(canonical_url) is not None:
+                await session.execute(
+                    update(Article)
+                    .where(Article.article_id == ids[url])
+                    .values(duplicate_of=ids[canonical_url])
+                )
+
+    async def _existing_values(
+        self, session: AsyncSession, column, values: Iterable[str]
+    ) -> Set[str]:
+        """Return which of the values already exist in an Article column, chunked IN queries"""
+        values = list(values)
+        existing: Set[str] = set()
+        for i in range(0, len(values), self.dedup_chunk_size):
+            chunk = values[i : i + self.dedup_chunk_size]
+            result = await session.execute(select(column).where(column.in_(chunk)))
+            existing.update(result.scalars().all())
+        return existing
+
+    async def _existing_urls(self, session: AsyncSession, canonical_urls: Iterable[str]) -> Set[str]:
+        """
+        Return the stored URLs and canonical URLs of articles matching any canonical URL
+
+        Rows stored before canonical URLs were recorded only match on their URL.
+        """
+        values = list(canonical_urls)
+        existing: Set[str] = set()
+        # Each value is bound twice per query
+        step = max(1, self.dedup_chunk_size // 2)
+        for i in range(0, len(values), step):
+            chunk = values[i : i + step]
             result = await session.execute(
-                select(Article).where(Article.content_hash == article.content_hash)
+                select(Article.url, Article.canonical_url).where(
+                    or_(Article.canonical_url.in_(chunk), Article.url.in_(chunk))
+                )
             )
-            if result.scalar_one_or_none():
-                return False
-
-        return True
+            for url, canonical_url in result.all():
+                existing.add(url)
+                if canonical_url:
+                    existing.add(canonical_url)
+        return existing
 
     async def fetch_all_feeds(self, session: AsyncSession) -> int:
         """
@@ -200,27 +767,217 @@ class RSSIngestionService:
                 | (RSSFeed.next_fetch_scheduled.is_(None))
             )
         )
-        feeds = result.scalars().all()
+        return await self.fetch_feeds(result.scalars().all(), session)
+
+    async def fetch_feeds(self, feeds: List[RSSFeed], session: AsyncSession) -> int:
+        """
+        Fetch the given feeds through the parallel fetch pool and single writer
+
+        Args:
+            feeds: Feeds loaded in session
+            session: Database session
+
+        Returns:
+            Total number of new articles
+        """
+        for feed in feeds:
+            # Open breakers only come due once their cooldown has passed
+            self._begin_probe(feed)
 
         logger.info("fetching_all_feeds", feed_count=len(feeds))
 
-        # Fetch feeds concurrently (max 5 at a time)
-        total_new = 0
-        for i in range(0, len(feeds), 5):
-            batch = feeds[i : i + 5]
-            results = await asyncio.gather(
-                *[self.fetch_feed(feed, session) for feed in batch],
-                return_exceptions=True,
-            )
+        # Fetch and parse in parallel through a bounded pool; a slot is refilled as soon
+        # as any feed finishes. Results go to a single writer that owns the session.
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+        queue_waits: List[float] = []
+        latencies: List[float] = []
+        downloaded: List[int] = []
+
+        async def fetch(feed: RSSFeed) -> None:
+            job = FeedFetchResult(feed)
+            # Wait on the host's rate limit before taking a slot, so a throttled
+            # or paused host never holds one while other hosts are ready
+            if not await self._acquire_host(job):
+                await queue.put(job)
+                return
+
+            queued_at = time.monotonic()
+            async with semaphore:
+                started_at = time.monotonic()
+                queue_waits.append(started_at - queued_at)
+                try:
+                    await queue.put(await self._fetch(job))
+                finally:
+                    latencies.append(time.monotonic() - started_at)
+                    downloaded.append(job.bytes_downloaded)
+
+        async def fetch_all() -> None:
+            try:
+                await asyncio.gather(*[fetch(feed) for feed in feeds])
+            finally:
+                await queue.put(None)
+
+        cycle_start = time.monotonic()
+        written, _ = await asyncio.gather(self._write_results(queue, session), fetch_all())
+        results, self.last_cycle_commits, self.last_cycle_write_seconds = written
+        makespan = time.monotonic() - cycle_start
 
-            for result in results:
-                if isinstance(result, int):
-                    total_new += result
-                elif isinstance(result, Exception):
-                    logger.error("feed_batch_error", error=str(result))
+        total_new = 0
+        errors = 0
+        for result in results:
+            if isinstance(result, int):
+                total_new += result
+            else:
+                errors += 1
+                logger.error("feed_batch_error", error=str(result))
+
+        self.last_cycle_stats = {
+            "feed_count": len(feeds),
+            "errors": errors,
+            "new_articles": total_new,
+            "bytes_downloaded": sum(downloaded),
+            "canonical_duplicates": self.canonical_duplicates,
+            "canonical_tokens_saved": self.canonical_tokens_saved,
+            "near_duplicates": self.near_duplicate_count,
+            "near_duplicate_tokens_saved": self.near_duplicate_tokens_saved,
+            "concurrency": self.fetch_concurrency,
+            "commits": self.last_cycle_commits,
+            "makespan": round(makespan, 3),
+            "write_seconds": round(self.last_cycle_write_seconds, 3),
+            "fetch_latency_p50": round(percentile(latencies, 50), 3),
+            "fetch_latency_p95": round(percentile(latencies, 95), 3),
+            "queue_wait_p50": round(percentile(queue_waits, 50), 3),
+            "queue_wait_p95": round(percentile(queue_waits, 95), 3),
+        }
+        logger.info("fetch_cycle_completed", **self.last_cycle_stats)
 
         return total_new
 
 
+    async def _write_results(
+        self, queue: asyncio.Queue, session: AsyncSession
+    ) -> Tuple[List[Any], int, float]:
+        """
+        Single writer: apply fetched feeds and commit them in grouped transactions
+
+        A transaction is committed once INGEST_COMMIT_BATCH feeds are pending, or
+        as soon as the queue runs dry so finished feeds are not held back by slow ones.
+        Each group is written under the service's write lock, so cycles running at
+        the same time never interleave their transactions.
+
+        Returns:
+            Per-feed new article counts or the exception that failed the feed,
+            the number of commits, and seconds spent writing
+        """
+        results: List[Any] = []
+        pending: List[int] = []
+        commits = 0
+        write_seconds = 0.0
+
+        async def commit() -> None:
+            nonlocal commits, write_seconds
+            started_at = time.monotonic()
+            try:
+                await self._commit(session)
+                commits += 1
+            except Exception as e:
+                logger.error("ingest_commit_error", feeds=len(pending), error=str(e))
+                for index in pending:
+                    results[index] = e
+            finally:
+                write_seconds += time.monotonic() - started_at
+            pending.clear()
+
+        done = False
+        while not done:
+            job = await queue.get()
+            if job is None:
+                break
+
+            async with self._write_lock:
+                while True:
+                    started_at = time.monotonic()
+                    try:
+                        results.append(await self._apply(job, session))
+                        if job.error is not None:
+                            results[-1] = job.error
+                        pending.append(len(results) - 1)
+                    except Exception as e:
+                        await self._rollback(session)
+                        logger.error("ingest_write_error", feed_id=job.feed_id, error=str(e))
+                        results.append(e)
+                        for index in pending:
+                            results[index] = e
+                        pending.clear()
+                    finally:
+                        write_seconds += time.monotonic() - started_at
+
+                    if len(pending) >= self.commit_batch_size or queue.empty():
+                        break
+                    job = queue.get_nowait()
+                    if job is None:
+                        done = True
+                        break
+
+                if pending:
+                    await commit()
+
+        return results, commits, write_seconds
+
+
+class FeedFetchResult:
+    """Outcome of the fetch stage for one feed, detached from the database session"""
+
+    def __init__(self, feed: RSSFeed):
+        # Snapshot everything the fetch stage needs up front
+        self.feed = feed
+        self.feed_id = feed.feed_id
+        self.feed_url = feed.feed_url
+        self.source_name = feed.source_name
+        self.etag = feed.etag
+        self.last_modified = feed.last_modified
+        self.content_digest = feed.content_digest
+        self.last_seen_url = feed.last_seen_url
+        self.last_seen_published = feed.last_seen_published
+
+        self.status = "pending"  # ok, not_modified, deferred, error
+        self.reason: Optional[str] = None
+        self.retry_in = 0.0  # seconds until a deferred feed's host may be requested
+        self.rows: List[dict] = []
+        self.error: Optional[Exception] = None
+
+        # High-water mark results
+        self.is_chronological: Optional[bool] = None
+        self.high_water_url: Optional[str] = None
+        self.high_water_published: Optional[datetime] = None
+        self.skipped = 0  # entries at or past the previous high-water mark
+        self.bytes_downloaded = 0
+
+        # WebSub hub advertised by the feed, if any
+        self.hub_url: Optional[str] = None
+        self.topic_url: Optional[str] = None
+
+
+def _check_feed_content(response: httpx.Response, head: bytes) -> None:
+    """Reject HTML pages and other non-feed bodies from their first bytes"""
+    head = head[:SNIFF_BYTES].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if head.startswith(FEED_PREFIXES):
+        return
+
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    looks_like_feed = not content_type or any(
+        kind in content_type for kind in ("xml", "rss", "atom", "rdf", "text/plain", "octet-stream")
+    )
+    if head.startswith((b"<!doctype html", b"<html")) or not looks_like_feed:
+        raise FeedRejected(f"not a feed ({content_type or 'no content type'})")
+
+
+def _prompt_tokens(article: dict) -> int:
+    """Rough clustering prompt tokens for one headline entry, at ~4 characters a token"""
+    # Fixed part covers the JSON keys, id and timestamp
+    return (len(article["headline"]) + len(article["url"]) + len(article["source"]) + 80) // 4
+
+
 # Global service instance
 rss_service = RSSIngestionService()
@@ -0,0 +1,161 @@
+"""Process-local probabilistic filter of article URLs and content hashes already stored"""
+
+import hashlib
+import math
+from typing import Any, Dict, Iterable, List, Optional
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Article
+
+logger = structlog.get_logger()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+
+class SeenFilter:
+    """
+    Bloom filter of stored article URLs and content hashes, consulted before dedup queries
+
+    A negative answer means the key was never stored, so the database lookup can
+    be skipped; only "maybe present" keys are sent to the database. Until the
+    filter has been built from the articles table every key is reported as
+    maybe present.
+    """
+
+    def __init__(self):
+        self.capacity = settings.SEEN_FILTER_CAPACITY
+        self.error_rate = settings.SEEN_FILTER_ERROR_RATE
+        self._bloom: Optional[BloomFilter] = None
+        self._added_during_rebuild: Optional[List[str]] = None
+
+        # Metrics since the last rebuild
+        self.lookups = 0
+        self.queries_avoided = 0
+        self.false_positives = 0
+        self.confirmed_present = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """
+        Build a fresh filter from the articles table and swap it in
+
+        Rebuilding periodically drops keys of articles removed by retention.
+        Articles stored while the table is being scanned are replayed into the
+        new filter before it replaces the old one.
+        """
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        self._added_during_rebuild = []
+        try:
+            result = await session.stream(
+                select(Article.url, Article.canonical_url, Article.content_hash)
+            )
+            async for url, canonical_url, content_hash in result:
+                # Older rows have no canonical URL and are matched on their URL
+                if url:
+                    bloom.add(_url_key(url))
+                if canonical_url and canonical_url != url:
+                    bloom.add(_url_key(canonical_url))
+                if content_hash:
+                    bloom.add(_hash_key(content_hash))
+            for key in self._added_during_rebuild:
+                bloom.add(key)
+        finally:
+            self._added_during_rebuild = None
+
+        self._bloom = bloom
+        self.lookups = self.queries_avoided = self.false_positives = self.confirmed_present = 0
+
+        if bloom.count > bloom.capacity:
+            logger.warning("seen_filter_over_capacity", keys=bloom.count, capacity=bloom.capacity)
+        logger.info("seen_filter_rebuilt", keys=bloom.count, size_bytes=bloom.size_bytes)
+
+    def add(self, url: Optional[str], content_hash: Optional[str]) -> None:
+        """Record a newly stored article"""
+        keys = []
+        if url:
+            keys.append(_url_key(url))
+        if content_hash:
+            keys.append(_hash_key(content_hash))
+
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.extend(keys)
+        if self._bloom is not None:
+            for key in keys:
+                self._bloom.add(key)
+
+    def maybe_seen_url(self, url: str) -> bool:
+        return self._check(_url_key(url))
+
+    def maybe_seen_hash(self, content_hash: str) -> bool:
+        return self._check(_hash_key(content_hash))
+
+    def record_db_result(self, queried: int, found: int) -> None:
+        """Account for maybe-present keys the database confirmed or refuted"""
+        if self._bloom is None:
+            return
+        self.confirmed_present += found
+        self.false_positives += queried - found
+
+    def stats(self) -> Dict[str, Any]:
+        maybe = self.false_positives + self.confirmed_present
+        return {
+            "ready": self.ready,
+            "keys": self._bloom.count if self._bloom else 0,
+            "size_bytes": self._bloom.size_bytes if self._bloom else 0,
+            "lookups": self.lookups,
+            "queries_avoided": self.queries_avoided,
+            "false_positive_rate": round(self.false_positives / maybe, 4) if maybe else 0.0,
+        }
+
+    def _check(self, key: str) -> bool:
+        if self._bloom is None:
+            return True
+        self.lookups += 1
+        if key in self._bloom:
+            return True
+        self.queries_avoided += 1
+        return False
+
+
+def _url_key(url: str) -> str:
+    return f"u:{url}"
+
+
+def _hash_key(content_hash: str) -> str:
+    return f"h:{content_hash}"
@@ -0,0 +1,224 @@
+"""WebSub (PubSubHubbub) subscriptions for feeds that advertise a hub"""
+
+import hashlib
+import hmac
+import re
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional, Tuple
+import httpx
+import structlog
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import RSSFeed
+
+logger = structlog.get_logger()
+
+# Hub and self links sit in the channel/feed header, ahead of the entries
+HUB_SCAN_BYTES = 16 * 1024
+
+_LINK_TAG = re.compile(r"<(?:[\w-]+:)?link\b([^>]*)>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+
+def discover_hub(
+    content: bytes, header_links: Optional[Mapping[str, Mapping[str, str]]] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Find the WebSub hub and topic URLs a feed advertises
+
+    HTTP Link headers take precedence over <link rel="hub"> / <link rel="self">
+    elements in the document.
+
+    Returns:
+        (hub URL, topic URL), either None when not advertised
+    """
+    links: Dict[str, str] = {}
+    head = content[:HUB_SCAN_BYTES].decode("utf-8", errors="replace")
+    for tag in _LINK_TAG.finditer(head):
+        attributes = {
+            name.lower(): (double or single).strip()
+            for name, double, single in _ATTRIBUTE.findall(tag.group(1))
+        }
+        href = attributes.get("href")
+        for rel in attributes.get("rel", "").split():
+            if rel in ("hub", "self") and href:
+                links.setdefault(rel, href)
+
+    for rel in ("hub", "self"):
+        link = (header_links or {}).get(rel)
+        if link and link.get("url"):
+            links[rel] = link["url"]
+
+    hub = links.get("hub")
+    if not hub or not hub.startswith(("http://", "https://")):
+        return None, None
+    return hub, links.get("self")
+
+
+class WebSubManager:
+    """
+    Subscribe feeds to their hubs, verify hub callbacks and check pushed content
+
+    Subscription state lives on RSSFeed: websub_state moves from None
+    (hub discovered) to "pending" once the hub accepted the request, and to
+    "active" when the hub verifies intent through the callback. Active leases
+    are renewed WEBSUB_RENEW_MARGIN seconds before they expire. A request the
+    hub rejects leaves the feed "failed", retried after a delay that doubles
+    with each consecutive failure; websub_lease_expires holds the retry time.
+    """
+
+    def __init__(self):
+        self.callback_base = settings.WEBSUB_CALLBACK_BASE.rstrip("/")
+        self.enabled = settings.WEBSUB_ENABLED and bool(self.callback_base)
+        self.lease_seconds = settings.WEBSUB_LEASE_SECONDS
+        self.renew_margin = timedelta(seconds=settings.WEBSUB_RENEW_MARGIN)
+        self.poll_interval = settings.WEBSUB_POLL_INTERVAL
+        self.retry_base = settings.WEBSUB_RETRY_BASE
+        self.retry_max = settings.WEBSUB_RETRY_MAX
+
+    def callback_url(self, feed: RSSFeed) -> str:
+        return f"{self.callback_base}/api/v1/feeds/{feed.feed_id}/websub"
+
+    def discovered(self, feed: RSSFeed, hub_url: str, topic_url: Optional[str]) -> None:
+        """Record a newly advertised hub; the next sync subscribes to it"""
+        logger.info("websub_hub_discovered", feed_id=feed.feed_id, hub=hub_url)
+        feed.websub_hub = hub_url
+        feed.websub_topic = topic_url or feed.feed_url
+        feed.websub_state = None
+        feed.websub_lease_expires = None
+        feed.websub_failures = 0
+
+    async def sync(self, session: AsyncSession, client: httpx.AsyncClient) -> int:
+        """
+        Subscribe feeds with a new hub, renew leases about to expire and retry failures
+
+        Returns:
+            Number of subscription requests the hubs accepted
+        """
+        if not self.enabled:
+            return 0
+
+        now = datetime.utcnow()
+        result = await session.execute(
+            select(RSSFeed)
+            .where(RSSFeed.is_active == True)
+            .where(RSSFeed.websub_hub.isnot(None))
+            .where(
+                RSSFeed.websub_state.is_(None)
+                # Renew active leases, and retry requests the hub never verified
+                | (
+                    RSSFeed.websub_state.in_(["active", "pending"])
+                    & or_(
+                        RSSFeed.websub_lease_expires.is_(None),
+                        RSSFeed.websub_lease_expires <= now + self.renew_margin,
+                    )
+                )
+                # Retry failed requests once their backoff has passed
+                | (
+                    (RSSFeed.websub_state == "failed")
+                    & or_(
+                        RSSFeed.websub_lease_expires.is_(None),
+                        RSSFeed.websub_lease_expires <= now,
+                    )
+                )
+            )
+        )
+        accepted = 0
+        for feed in result.scalars().all():
+            if await self.subscribe(feed, client):
+                accepted += 1
+        await session.commit()
+        return accepted
+
+    async def subscribe(self, feed: RSSFeed, client: httpx.AsyncClient) -> bool:
+        """Ask the feed's hub for a subscription; verification arrives on the callback"""
+        secret = feed.websub_secret or secrets.token_hex(20)
+        try:
+            response = await client.post(
+                feed.websub_hub,
+                data={
+                    "hub.mode": "subscribe",
+                    "hub.topic": feed.websub_topic,
+                    "hub.callback": self.callback_url(feed),
+                    "hub.lease_seconds": str(self.lease_seconds),
+                    "hub.secret": secret,
+                },
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            feed.websub_failures = (feed.websub_failures or 0) + 1
+            delay = min(self.retry_max, self.retry_base * 2 ** min(feed.websub_failures - 1, 20))
+            logger.warning(
+                "websub_subscribe_failed",
+                feed_id=feed.feed_id,
+                error=str(e),
+                failures=feed.websub_failures,
+                retry_in=delay,
+            )
+            feed.websub_state = "failed"
+            feed.websub_lease_expires = datetime.utcnow() + timedelta(seconds=delay)
+            return False
+
+        feed.websub_secret = secret
+        feed.websub_failures = 0
+        if feed.websub_state != "active":
+            feed.websub_state = "pending"
+        # Retry if the hub has not verified within the renewal margin
+        feed.websub_lease_expires = datetime.utcnow() + self.renew_margin * 2
+        logger.info("websub_subscribe_requested", feed_id=feed.feed_id, hub=feed.websub_hub)
+        return True
+
+    def verify(self, feed: RSSFeed, params: Mapping[str, str]) -> Optional[str]:
+        """
+        Handle a hub's verification-of-intent or denial request
+
+        Returns:
+            The challenge to echo back, or None if the request does not match
+            a subscription we asked for
+
+        Raises:
+            ValueError: hub.lease_seconds is not a positive integer
+        """
+        mode = params.get("hub.mode")
+        if params.get("hub.topic") != feed.websub_topic or feed.websub_hub is None:
+            return None
+
+        if mode == "denied":
+            logger.warning("websub_denied", feed_id=feed.feed_id, reason=params.get("hub.reason"))
+            feed.websub_state = "denied"
+            return ""
+
+        if mode == "subscribe" and feed.websub_state in ("pending", "active"):
+            lease = params.get("hub.lease_seconds") or str(self.lease_seconds)
+            if not lease.isdigit() or int(lease) <= 0:
+                raise ValueError(f"invalid hub.lease_seconds: {lease!r}")
+            lease = int(lease)
+            feed.websub_state = "active"
+            feed.websub_lease_expires = datetime.utcnow() + timedelta(seconds=lease)
+            logger.info("websub_subscription_active", feed_id=feed.feed_id, lease=lease)
+            return params.get("hub.challenge")
+
+        if mode == "unsubscribe" and feed.websub_state not in ("pending", "active"):
+            return params.get("hub.challenge")
+
+        return None
+
+    def valid_signature(self, feed: RSSFeed, body: bytes, signature: Optional[str]) -> bool:
+        """Check X-Hub-Signature against the subscription secret"""
+        if not feed.websub_secret:
+            return False
+        algorithm, _, digest = (signature or "").partition("=")
+        hash_function = SIGNATURE_ALGORITHMS.get(algorithm.lower())
+        if hash_function is None:
+            return False
+        expected = hmac.new(feed.websub_secret.encode(), body, hash_function).hexdigest()
+        return hmac.compare_digest(expected, digest.strip().lower())
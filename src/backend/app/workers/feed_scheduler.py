@@ -0,0 +1,220 @@
+"""Timer-heap feed scheduler dispatching each feed when it comes due"""
+
+import asyncio
+import heapq
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import structlog
+from sqlalchemy import select
+from app.config import settings
+from app.core.stats import percentile
+from app.database import AsyncSessionLocal
+from app.models import RSSFeed
+from app.services.rss_ingestion import rss_service
+
+logger = structlog.get_logger()
+
+
+class FeedScheduler:
+    """
+    Dispatch feed fetches from a min-heap keyed on next_fetch_scheduled
+
+    Instead of scanning the feeds table on a fixed interval, the scheduler
+    sleeps until the earliest due time and fetches exactly the feeds due then.
+    Due times get a little jitter so feeds sharing an interval drift apart
+    rather than firing in bursts. Each batch runs as its own task, so a slow
+    fetch never holds up feeds that come due behind it; at most
+    FEED_SCHEDULER_MAX_BATCHES are in flight, and feeds that come due while
+    all of them are busy go out together in the next batch. The batches share
+    the ingestion service, whose write lock keeps their transactions apart.
+
+    Rescheduled and removed feeds leave stale heap entries behind; an entry is
+    only acted on if it still matches the feed's current due time. A feed whose
+    batch failed, or whose write was rolled back, still has its old due time;
+    it is retried after FEED_BACKOFF_BASE, doubling up to FEED_BACKOFF_MAX,
+    rather than being dispatched again straight away.
+
+    A sharded ingestion worker sets `owns` so it only schedules its own feeds.
+    Until start() is called, and after stop(), schedule() and rebuild() do
+    nothing, so a process that does not dispatch fetches never grows a heap.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, service=rss_service):
+        self.session_factory = session_factory
+        self.service = service
+        self.owns: Optional[Callable[[int], bool]] = None
+        self.jitter = settings.FEED_SCHEDULE_JITTER
+        self.retry_delay = settings.FEED_BACKOFF_BASE
+        self.max_retry_delay = settings.FEED_BACKOFF_MAX
+        self.max_batches = settings.FEED_SCHEDULER_MAX_BATCHES
+
+        self._heap: List[Tuple[datetime, int]] = []
+        self._due: Dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+        # Consecutive batches that left a feed's due time unchanged
+        self._retries: Dict[int, int] = {}
+
+        # Dispatch delay past the due time, for the last batches
+        self.lags: List[float] = []
+        self.dispatched = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start dispatching and load the schedule from the database"""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        try:
+            await self.rebuild()
+        except Exception:
+            await self.stop()
+            raise
+        logger.info("feed_scheduler_started", feeds=len(self._due))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            for batch in self._batches:
+                batch.cancel()
+            await asyncio.gather(self._task, *self._batches, return_exceptions=True)
+            self._batches.clear()
+            self._task = None
+            logger.info("feed_scheduler_stopped")
+
+    async def rebuild(self) -> None:
+        """Replace the schedule with every active feed's next_fetch_scheduled"""
+        if not self.running:
+            return
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(RSSFeed.feed_id, RSSFeed.next_fetch_scheduled).where(
+                    RSSFeed.is_active == True
+                )
+            )
+            rows = result.all()
+
+        self._heap.clear()
+        self._due.clear()
+        for feed_id, next_fetch in rows:
+            self.schedule(feed_id, next_fetch)
+        logger.info("feed_schedule_rebuilt", feeds=len(self._due))
+
+    def schedule(self, feed_id: int, when: Optional[datetime] = None) -> None:
+        """Fetch the feed at `when` plus jitter, or as soon as possible if None"""
+        if not self.running:
+            return
+        if self.owns is not None and not self.owns(feed_id):
+            return
+        when = (when or datetime.utcnow()) + timedelta(seconds=random.uniform(0, self.jitter))
+        self._due[feed_id] = when
+        heapq.heappush(self._heap, (when, feed_id))
+        if self._heap[0] == (when, feed_id):
+            # New earliest deadline: wake the dispatcher to shorten its sleep
+            self._wakeup.set()
+
+    def unschedule(self, feed_id: int) -> None:
+        """Drop a feed; its heap entry is discarded when it surfaces"""
+        self._due.pop(feed_id, None)
+        self._retries.pop(feed_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheduled": len(self._due),
+            "dispatched": self.dispatched,
+            "batches_in_flight": len(self._batches),
+            "dispatch_lag_p50": round(percentile(self.lags, 50), 3),
+            "dispatch_lag_p95": round(percentile(self.lags, 95), 3),
+        }
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        """Remove and return feeds due by now, skipping stale entries"""
+        feed_ids = []
+        while self._heap and self._heap[0][0] <= now:
+            when, feed_id = heapq.heappop(self._heap)
+            if self._due.get(feed_id) != when:
+                continue
+            del self._due[feed_id]
+            feed_ids.append(feed_id)
+            self.lags.append((now - when).total_seconds())
+        return feed_ids
+
+    def _next_deadline(self) -> Optional[datetime]:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def _run(self) -> None:
+        while True:
+            deadline = self._next_deadline()
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, (deadline - datetime.utcnow()).total_seconds())
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue  # schedule changed, recompute the deadline
+            except asyncio.TimeoutError:
+                pass
+
+            if len(self._batches) >= self.max_batches:
+                # Every batch slot is busy; due feeds wait in the heap for the next one
+                await asyncio.wait(self._batches, return_when=asyncio.FIRST_COMPLETED)
+
+            feed_ids = self._pop_due(datetime.utcnow())
+            if feed_ids:
+                batch = asyncio.create_task(self._dispatch(feed_ids))
+                self._batches.add(batch)
+                batch.add_done_callback(self._batches.discard)
+
+    async def _dispatch(self, feed_ids: List[int]) -> None:
+        """Fetch a batch of due feeds and schedule each at its new due time"""
+        self.lags = self.lags[-1000:]
+        self.dispatched += len(feed_ids)
+        logger.info("feed_batch_dispatched", feeds=len(feed_ids), **self.stats())
+
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(RSSFeed).where(
+                        RSSFeed.feed_id.in_(feed_ids), RSSFeed.is_active == True
+                    )
+                )
+                await self.service.fetch_feeds(result.scalars().all(), session)
+
+                result = await session.execute(
+                    select(RSSFeed.feed_id, RSSFeed.next_fetch_scheduled).where(
+                        RSSFeed.feed_id.in_(feed_ids), RSSFeed.is_active == True
+                    )
+                )
+                next_fetches = result.all()
+        except Exception as e:
+            logger.error("feed_batch_error", feeds=len(feed_ids), error=str(e))
+            next_fetches = [(feed_id, None) for feed_id in feed_ids]
+
+        now = datetime.utcnow()
+        for feed_id, next_fetch in next_fetches:
+            if next_fetch is None or next_fetch <= now:
+                next_fetch = self._retry_at(feed_id, now)
+            else:
+                self._retries.pop(feed_id, None)
+            # Keep a newer schedule set via the API while the batch was running
+            if feed_id not in self._due:
+                self.schedule(feed_id, next_fetch)
+
+    def _retry_at(self, feed_id: int, now: datetime) -> datetime:
+        """Back off a feed whose batch did not move its due time forward"""
+        retries = self._retries.get(feed_id, 0)
+        self._retries[feed_id] = retries + 1
+        delay = min(self.retry_delay * 2 ** retries, self.max_retry_delay)
+        return now + timedelta(seconds=delay)
+
+
+# Global scheduler instance
+feed_scheduler = FeedScheduler()
@@ -0,0 +1,156 @@
+"""
+Sharded ingestion worker: fetches its consistent-hash share of the feeds
+
+Near-duplicate headlines are detected against an in-memory LSH index, so each
+worker only sees rewordings its own feeds produced until it reads what the
+others stored. Every heartbeat the index picks up canonical articles added
+since the last look, an indexed range query on article_id, and the hourly
+resync rebuilds it in full. Checking every candidate against the database
+instead would catch all cross-shard duplicates, but would put a query on
+every stored article's write path; with the refresh, two workers storing
+rewordings of the same story within one heartbeat can both keep theirs.
+"""
+
+import asyncio
+import signal
+from datetime import datetime, timedelta
+from typing import Optional
+import structlog
+from sqlalchemy import delete, select
+from app.config import settings
+from app.database import AsyncSessionLocal, init_db
+from app.models import IngestionWorker
+from app.services.feed_sharding import HashRing
+from app.services.rss_ingestion import rss_service
+from app.workers.feed_scheduler import FeedScheduler, feed_scheduler
+
+logger = structlog.get_logger()
+
+
+class ShardCoordinator:
+    """
+    Keep one worker's membership current and its scheduler on the feeds it owns
+
+    Workers announce themselves with a heartbeat row in ingestion_workers. The
+    live set (heartbeat within SHARD_WORKER_TTL) is placed on a HashRing; when
+    it changes, because a worker started, stopped or stopped heartbeating, the
+    scheduler is rebuilt with the new shard. Workers may briefly disagree on
+    membership around a change, so a feed can be fetched twice; URL dedup
+    makes that harmless.
+    """
+
+    def __init__(self, worker_id: str, scheduler: FeedScheduler, session_factory=AsyncSessionLocal):
+        self.worker_id = worker_id
+        self.scheduler = scheduler
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=settings.SHARD_WORKER_TTL)
+        self.ring = HashRing()
+        self.rebalances = 0
+
+    def owns(self, feed_id: int) -> bool:
+        return self.ring.owner(feed_id) == self.worker_id
+
+    async def heartbeat(self, rebalance: bool = True) -> bool:
+        """
+        Record this worker as alive and pick up membership changes
+
+        Returns:
+            True if the live worker set changed
+        """
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            worker = await session.get(IngestionWorker, self.worker_id)
+            if worker is None:
+                worker = IngestionWorker(worker_id=self.worker_id)
+                session.add(worker)
+            worker.heartbeat_at = now
+            worker.feeds = len(self.scheduler._due)
+
+            # Any live worker may clear out rows of workers long gone
+            await session.execute(
+                delete(IngestionWorker).where(IngestionWorker.heartbeat_at < now - self.ttl * 10)
+            )
+            result = await session.execute(
+                select(IngestionWorker.worker_id).where(IngestionWorker.heartbeat_at >= now - self.ttl)
+            )
+            live = set(result.scalars().all()) | {self.worker_id}
+            await session.commit()
+
+        if live == self.ring.workers:
+            return False
+
+        joined = sorted(live - self.ring.workers)
+        left = sorted(self.ring.workers - live)
+        self.ring.set_workers(live)
+        self.rebalances += 1
+        logger.info("shard_rebalanced", worker=self.worker_id, workers=len(live), joined=joined, left=left)
+        if rebalance:
+            await self.scheduler.rebuild()
+        return True
+
+    async def leave(self) -> None:
+        """Remove this worker so the others take over its shard at their next heartbeat"""
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(IngestionWorker).where(IngestionWorker.worker_id == self.worker_id)
+            )
+            await session.commit()
+        logger.info("shard_worker_left", worker=self.worker_id)
+
+
+async def run_worker(worker_id: str, stop: Optional[asyncio.Event] = None) -> None:
+    """
+    Run one ingestion worker until stopped or sent SIGTERM/SIGINT
+
+    The worker has its own event loop, HTTP client and heap scheduler, and
+    writes through the shared database. It does not use the seen-article
+    filter: the filter is process-local, so it would not know what the other
+    workers stored, and every dedup check goes to the database instead.
+    """
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await init_db()
+    await rss_service.start()
+    async with AsyncSessionLocal() as session:
+        await rss_service.near_duplicates.rebuild(session)
+
+    coordinator = ShardCoordinator(worker_id, feed_scheduler)
+    feed_scheduler.owns = coordinator.owns
+    await coordinator.heartbeat(rebalance=False)
+    await feed_scheduler.start()
+    logger.info("ingestion_worker_started", worker=worker_id, feeds=len(feed_scheduler._due))
+
+    last_resync = loop.time()
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), settings.SHARD_HEARTBEAT_INTERVAL)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                if await coordinator.heartbeat():
+                    last_resync = loop.time()
+                elif loop.time() - last_resync >= settings.FEED_SCHEDULE_RESYNC_INTERVAL:
+                    # Pick up feeds changed outside this worker, and rebuild
+                    # the headline index to drop anything a refresh missed
+                    await feed_scheduler.rebuild()
+                    async with AsyncSessionLocal() as session:
+                        await rss_service.near_duplicates.rebuild(session)
+                    last_resync = loop.time()
+                    continue
+
+                # Headlines the other workers stored since the last look
+                async with AsyncSessionLocal() as session:
+                    await rss_service.near_duplicates.refresh(session)
+            except Exception as e:
+                logger.error("shard_heartbeat_error", worker=worker_id, error=str(e))
+    finally:
+        await feed_scheduler.stop()
+        await coordinator.leave()
+        await rss_service.close()
+        logger.info("ingestion_worker_stopped", worker=worker_id, **feed_scheduler.stats())
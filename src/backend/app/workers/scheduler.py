@@ -9,6 +9,7 @@ from app.database import AsyncSessionLocal
 from app.services.rss_ingestion import rss_service
 from app.services.clustering import clustering_service
 from app.services.idea_generation import idea_service
+from app.workers.feed_scheduler import feed_scheduler
 
 logger = structlog.get_logger()
 
@@ -28,6 +29,34 @@ async def fetch_rss_feeds_job():
             logger.error("rss_fetch_job_error", error=str(e))
 
 
+async def resync_feed_schedule_job():
+    """Periodic job to pick up feeds added or changed outside the API"""
+    try:
+        await feed_scheduler.rebuild()
+    except Exception as e:
+        logger.error("feed_schedule_resync_error", error=str(e))
+
+
+async def sync_websub_job():
+    """Periodic job to subscribe to discovered WebSub hubs and renew leases"""
+    async with AsyncSessionLocal() as session:
+        try:
+            accepted = await rss_service.sync_websub(session)
+            logger.info("websub_sync_completed", accepted=accepted)
+        except Exception as e:
+            logger.error("websub_sync_error", error=str(e))
+
+
+async def rebuild_seen_filter_job():
+    """Periodic job to rebuild the seen-article filter after retention deletes"""
+    async with AsyncSessionLocal() as session:
+        try:
+            await rss_service.seen_filter.rebuild(session)
+            logger.info("seen_filter_job_completed", **rss_service.seen_filter.stats())
+        except Exception as e:
+            logger.error("seen_filter_job_error", error=str(e))
+
+
 async def cluster_articles_job():
     """Periodic job to cluster articles into events"""
     logger.info("clustering_job_started")
@@ -56,14 +85,50 @@ async def generate_ideas_job():
 
 
 # Schedule jobs
-scheduler.add_job(
-    fetch_rss_feeds_job,
-    trigger=IntervalTrigger(seconds=settings.FEED_POLL_INTERVAL),
-    id="fetch_rss_feeds",
-    name="Fetch RSS Feeds",
-    replace_existing=True,
-    max_instances=1,
-)
+if settings.INGESTION_SHARDED:
+    # Feeds are fetched by the ingestion workers, see app/workers/ingestion_worker.py
+    feed_job = None
+elif settings.FEED_HEAP_SCHEDULER:
+    # Fetches are dispatched by feed_scheduler; only resync it here
+    feed_job = "resync_feed_schedule"
+    scheduler.add_job(
+        resync_feed_schedule_job,
+        trigger=IntervalTrigger(seconds=settings.FEED_SCHEDULE_RESYNC_INTERVAL),
+        id=feed_job,
+        name="Resync Feed Schedule",
+        replace_existing=True,
+        max_instances=1,
+    )
+else:
+    feed_job = "fetch_rss_feeds"
+    scheduler.add_job(
+        fetch_rss_feeds_job,
+        trigger=IntervalTrigger(seconds=settings.FEED_POLL_INTERVAL),
+        id=feed_job,
+        name="Fetch RSS Feeds",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+if rss_service.websub.enabled:
+    scheduler.add_job(
+        sync_websub_job,
+        trigger=IntervalTrigger(seconds=settings.WEBSUB_SYNC_INTERVAL),
+        id="sync_websub",
+        name="Sync WebSub Subscriptions",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+if not settings.INGESTION_SHARDED:
+    scheduler.add_job(
+        rebuild_seen_filter_job,
+        trigger=IntervalTrigger(seconds=settings.SEEN_FILTER_REBUILD_INTERVAL),
+        id="rebuild_seen_filter",
+        name="Rebuild Seen-Article Filter",
+        replace_existing=True,
+        max_instances=1,
+    )
 
 scheduler.add_job(
     cluster_articles_job,
@@ -86,7 +151,9 @@ scheduler.add_job(
 logger.info(
     "scheduler_configured",
     jobs=[
-        "fetch_rss_feeds",
+        *([feed_job] if feed_job else []),
+        *(["sync_websub"] if rss_service.websub.enabled else []),
+        *(["rebuild_seen_filter"] if not settings.INGESTION_SHARDED else []),
         "cluster_articles",
         "generate_ideas",
     ],
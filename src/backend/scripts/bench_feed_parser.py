@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Benchmark the fast-path feed parser against feedparser on saved feed fixtures
+
+Usage:
+    python -m scripts.bench_feed_parser --repeat 50
+    python -m scripts.bench_feed_parser --fixtures path/to/feeds
+"""
+
+import argparse
+import time
+from pathlib import Path
+from xml.etree.ElementTree import ParseError
+from app.services.feed_parser import UnsupportedFeed, fast_parse_entries, feedparser_entries
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "feeds"
+
+
+def time_parser(parse, documents, repeat):
+    """Return (entries parsed, seconds) over all documents, repeat times"""
+    entries = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in documents:
+            entries += len(parse(content))
+    return entries, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    fast_docs, fallback = [], []
+    for path in sorted(args.fixtures.glob("*.xml")):
+        content = path.read_bytes()
+        try:
+            fast_parse_entries(content)
+            fast_docs.append(content)
+        except (ParseError, UnsupportedFeed) as e:
+            fallback.append(f"{path.name} ({e})")
+
+    print(f"{len(fast_docs)} fast-path fixtures, {len(fallback)} fallback")
+    for name in fallback:
+        print(f"  fallback: {name}")
+
+    results = {
+        "feedparser": time_parser(lambda c: feedparser_entries(c)[0], fast_docs, args.repeat),
+        "fast path": time_parser(fast_parse_entries, fast_docs, args.repeat),
+    }
+    for name, (entries, seconds) in results.items():
+        print(f"  {name:10s} {entries / seconds:10.0f} entries/s ({seconds:.3f}s)")
+
+    speedup = results["feedparser"][1] / results["fast path"][1]
+    print(f"  fast path speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
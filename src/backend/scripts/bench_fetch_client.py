@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Benchmark feed fetch-cycle wall time: per-call client vs shared pooled client
+
+By default runs against a local keep-alive HTTP server that adds a fixed delay
+to every new connection to stand in for TCP+TLS handshake cost. Pass --live to
+fetch the priority feeds from seed_feeds.py instead.
+
+Usage:
+    python -m scripts.bench_fetch_client --feeds 40 --cycles 5 --handshake-ms 50
+    python -m scripts.bench_fetch_client --live --cycles 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+from app.services.rss_ingestion import RSSIngestionService
+from scripts.seed_feeds import PRIORITY_FEEDS
+
+FEED_BODY = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>
+<item><title>Headline</title><link>https://example.com/a</link></item>
+</channel></rss>"""
+
+
+def start_local_server(handshake_ms: int) -> ThreadingHTTPServer:
+    """Serve FEED_BODY over HTTP/1.1 keep-alive, delaying each new connection"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            time.sleep(handshake_ms / 1000)
+            super().setup()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(FEED_BODY)))
+            self.end_headers()
+            self.wfile.write(FEED_BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def fetch_per_call(urls, timeout):
+    """Baseline: a fresh AsyncClient (and connection) per feed"""
+
+    async def fetch(url):
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            (await client.get(url)).raise_for_status()
+
+    await run_batched(urls, fetch)
+
+
+async def fetch_shared(urls, client):
+    """Shared pooled client owned by RSSIngestionService"""
+
+    async def fetch(url):
+        (await client.get(url)).raise_for_status()
+
+    await run_batched(urls, fetch)
+
+
+async def run_batched(urls, fetch):
+    """Fetch in groups of five, matching fetch_all_feeds"""
+    for i in range(0, len(urls), 5):
+        await asyncio.gather(*[fetch(url) for url in urls[i : i + 5]], return_exceptions=True)
+
+
+async def bench(urls, cycles):
+    service = RSSIngestionService()
+    await service.start()
+    client = await service._get_client()
+
+    results = {"per_call": [], "shared": []}
+    try:
+        for _ in range(cycles):
+            start = time.perf_counter()
+            await fetch_per_call(urls, service.timeout)
+            results["per_call"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await fetch_shared(urls, client)
+            results["shared"].append(time.perf_counter() - start)
+    finally:
+        await service.close()
+
+    print(f"{len(urls)} feeds x {cycles} cycles")
+    for name, timings in results.items():
+        print(
+            f"  {name:9s} median={statistics.median(timings):.3f}s "
+            f"min={min(timings):.3f}s max={max(timings):.3f}s"
+        )
+    speedup = statistics.median(results["per_call"]) / statistics.median(results["shared"])
+    print(f"  shared client speedup: {speedup:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=40, help="feeds per cycle (local mode)")
+    parser.add_argument("--hosts", type=int, default=4, help="distinct hosts (local mode)")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--handshake-ms", type=int, default=50)
+    parser.add_argument("--live", action="store_true", help="fetch the seed feeds instead")
+    args = parser.parse_args()
+
+    if args.live:
+        urls = [feed["feed_url"] for feed in PRIORITY_FEEDS]
+        asyncio.run(bench(urls, args.cycles))
+        return
+
+    server = start_local_server(args.handshake_ms)
+    port = server.server_address[1]
+    # Distinct loopback aliases behave as separate hosts for pooling
+    hosts = [f"127.0.0.{i + 1}" for i in range(args.hosts)]
+    urls = [f"http://{hosts[i % len(hosts)]}:{port}/feed/{i}" for i in range(args.feeds)]
+    try:
+        asyncio.run(bench(urls, args.cycles))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Measure event-loop lag while parsing feeds inline vs in the parse worker pool
+
+Usage:
+    python -m scripts.bench_loop_lag --feeds 50 --items 100 --workers 2
+"""
+
+import argparse
+import asyncio
+import time
+from app.core.loop_lag import LoopLagMonitor
+from app.services.rss_ingestion import RSSIngestionService
+
+
+def synthetic_feed(items: int) -> bytes:
+    """RSS 2.0 document with HTML summaries, roughly the size of a busy news feed"""
+    body = "".join(
+        f"<item><title>Headline {i} moves markets</title>"
+        f"<link>https://example.com/story/{i}</link>"
+        f"<pubDate>Wed, 22 Oct 2025 14:{i % 60:02d}:00 GMT</pubDate>"
+        f"<description>&lt;p&gt;Paragraph {i} with &lt;a href='https://example.com'&gt;"
+        f"a link&lt;/a&gt; and some more words about earnings.&lt;/p&gt;</description></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+async def run(service: RSSIngestionService, content: bytes, feeds: int, concurrency: int):
+    monitor = LoopLagMonitor()
+    monitor.start()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def parse():
+        async with semaphore:
+            await service._parse(content)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[parse() for _ in range(feeds)])
+    elapsed = time.perf_counter() - start
+    return elapsed, await monitor.stop()
+
+
+async def bench(feeds: int, items: int, workers: int, concurrency: int):
+    content = synthetic_feed(items)
+
+    inline = RSSIngestionService()
+    inline.parse_workers = 0
+    await inline.start()
+
+    pooled = RSSIngestionService()
+    pooled.parse_workers = workers
+    await pooled.start()
+
+    try:
+        # Warm up worker processes so startup cost is not counted
+        await pooled._parse(content)
+        for name, service in (("inline", inline), (f"pool x{workers}", pooled)):
+            elapsed, lag = await run(service, content, feeds, concurrency)
+            print(
+                f"{name:10s} wall={elapsed:.3f}s lag p50={lag['p50_ms']}ms "
+                f"p99={lag['p99_ms']}ms max={lag['max_ms']}ms"
+            )
+    finally:
+        await inline.close()
+        await pooled.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=50)
+    parser.add_argument("--items", type=int, default=100, help="entries per feed")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{args.feeds} feeds x {args.items} entries")
+    asyncio.run(bench(args.feeds, args.items, args.workers, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""Benchmark replayed ingestion throughput against the number of sharded worker processes
+
+Feeds are split across workers with the same HashRing the ingestion workers
+use; every worker replays its shard through its own RSSIngestionService and
+event loop into one shared SQLite database. Without --recording, a synthetic
+recording of --feeds feeds is generated first.
+
+Usage:
+    python -m scripts.bench_sharded_ingest --workers 1 2 4 8 --feeds 1000
+    python -m scripts.bench_sharded_ingest --recording recordings/2025-10-22
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.database import Base
+from app.services.feed_replay import FeedReplayer, load_recording, write_payload
+from app.services.feed_sharding import HashRing
+
+WORDS = (
+    "fed rates inflation oil supply earnings guidance chip export tariff bank bond yield "
+    "merger deal ruling court election vote strike shares jobs retail housing crude gold "
+    "quarter forecast outlook probe lawsuit recall launch deficit budget senate market"
+).split()
+
+
+def synthesize(directory: Path, feeds: int, items: int) -> None:
+    rng = random.Random(7)
+    start = datetime(2025, 10, 22, 9, 0)
+    for feed in range(feeds):
+        entries = []
+        for item in range(items):
+            title = " ".join(rng.sample(WORDS, 8)).capitalize()
+            summary = " ".join(rng.choice(WORDS) for _ in range(60))
+            entries.append(
+                f"<item><title>{title}</title>"
+                f"<link>https://news{feed % 50}.example.com/{feed}/{item}</link>"
+                f"<pubDate>{(start - timedelta(minutes=item)).strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate>"
+                f"<description>&lt;p&gt;{summary}&lt;/p&gt;</description></item>"
+            )
+        body = (
+            f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {feed}</title>'
+            f'{"".join(entries)}</channel></rss>'
+        ).encode()
+        write_payload(directory, f"https://news{feed % 50}.example.com/feed/{feed}.xml", start, body)
+
+
+async def prepare(database_url: str, recording: Path) -> Dict[str, int]:
+    """Create the schema and feed rows; returns feed_url -> feed_id"""
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        return await FeedReplayer(load_recording(recording), session_factory)._ensure_feeds()
+    finally:
+        await engine.dispose()
+
+
+async def replay_shard(database_url: str, recording: Path, feed_ids: Dict[str, int], worker: str, workers: int, start):
+    ring = HashRing([f"worker-{n}" for n in range(workers)])
+    payloads = [p for p in load_recording(recording) if ring.owner(feed_ids[p.feed_url]) == worker]
+
+    engine = create_async_engine(database_url, connect_args={"timeout": 60})
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    replayer = FeedReplayer(payloads, session_factory)
+    replayer.service.parse_workers = 0  # parse on this worker's own loop
+    start.wait()
+    try:
+        return await replayer.run()
+    finally:
+        await engine.dispose()
+
+
+def quiet_logs() -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+
+def worker_main(database_url, recording, feed_ids, worker, workers, start, results):
+    quiet_logs()
+    stats = asyncio.run(replay_shard(database_url, recording, feed_ids, worker, workers, start))
+    results.put(stats["new_articles"])
+
+
+def run(recording: Path, workers: int) -> Dict[str, float]:
+    database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    feed_ids = asyncio.run(prepare(database_url, recording))
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker_main,
+            args=(database_url, recording, feed_ids, f"worker-{n}", workers, start, results),
+        )
+        for n in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(1.0)  # let every worker load its shard before the clock starts
+
+    began = time.monotonic()
+    start.set()
+    articles = sum(results.get() for _ in processes)
+    elapsed = time.monotonic() - began
+    for process in processes:
+        process.join()
+    return {"articles": articles, "elapsed": elapsed, "rate": articles / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--recording", type=Path, help="replay this recording instead of synthetic feeds")
+    parser.add_argument("--feeds", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=25, help="entries per synthetic feed")
+    args = parser.parse_args()
+    quiet_logs()
+
+    recording = args.recording
+    if recording is None:
+        recording = Path(tempfile.mkdtemp()) / "recording"
+        synthesize(recording, args.feeds, args.items)
+
+    print(f"recording: {recording}, CPUs: {os.cpu_count()}")
+    print(f"{'workers':>8} {'articles':>9} {'seconds':>8} {'articles/s':>11} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        result = run(recording, workers)
+        baseline = baseline or result["rate"]
+        print(
+            f"{workers:>8} {result['articles']:>9} {result['elapsed']:>8.2f} "
+            f"{result['rate']:>11.0f} {result['rate'] / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
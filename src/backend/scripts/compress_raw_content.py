@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Compress existing Article.raw_content rows in batches and report the space saved
+
+Rows already compressed are skipped, so the migration can be stopped and
+re-run. Reports database size and /articles list query latency before and
+after; SQLite databases are vacuumed afterwards to return freed pages.
+
+Usage:
+    python -m scripts.compress_raw_content --batch-size 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import bindparam, desc, select, text, update
+from app.database import AsyncSessionLocal, engine
+from app.models import Article
+from app.models.types import is_compressed
+
+articles = Article.__table__
+
+
+async def database_bytes() -> int:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            page_count = await conn.scalar(text("PRAGMA page_count"))
+            page_size = await conn.scalar(text("PRAGMA page_size"))
+            return page_count * page_size
+        return await conn.scalar(text("SELECT pg_total_relation_size('articles')"))
+
+
+async def list_latency(runs: int = 20) -> float:
+    """Median seconds for the /articles list query, first page of 50"""
+    timings = []
+    query = select(Article).order_by(desc(Article.publish_datetime)).limit(50)
+    async with AsyncSessionLocal() as session:
+        for _ in range(runs):
+            start = time.perf_counter()
+            (await session.execute(query)).scalars().all()
+            timings.append(time.perf_counter() - start)
+            session.expunge_all()
+    return statistics.median(timings)
+
+
+async def to_bytea() -> None:
+    """PostgreSQL only: move the TEXT column to bytea, keeping values as UTF-8"""
+    async with engine.begin() as conn:
+        data_type = await conn.scalar(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'articles' AND column_name = 'raw_content'"
+        ))
+        if data_type == "text":
+            await conn.execute(text(
+                "ALTER TABLE articles ALTER COLUMN raw_content TYPE bytea "
+                "USING convert_to(raw_content, 'UTF8')"
+            ))
+
+
+async def compress_rows(batch_size: int) -> int:
+    """
+    Rewrite uncompressed raw_content through CompressedText
+
+    Returns:
+        Number of rows rewritten
+    """
+    rewritten = 0
+    last_id = 0
+    stmt = (
+        update(articles)
+        .where(articles.c.article_id == bindparam("id"))
+        .values(raw_content=bindparam("content"))
+    )
+    while True:
+        async with engine.begin() as conn:
+            # Raw column values, without CompressedText decoding them
+            result = await conn.execute(
+                text(
+                    "SELECT article_id, raw_content FROM articles "
+                    "WHERE article_id > :last_id AND raw_content IS NOT NULL "
+                    "ORDER BY article_id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            )
+            rows = result.all()
+            if not rows:
+                return rewritten
+            last_id = rows[-1][0]
+
+            batch = [
+                {"id": article_id, "content": value if isinstance(value, str) else bytes(value).decode("utf-8")}
+                for article_id, value in rows
+                if not is_compressed(value)
+            ]
+            if batch:
+                await conn.execute(stmt, batch)
+            rewritten += len(batch)
+        print(f"  up to article {last_id}: {rewritten} rows compressed")
+
+
+async def run(batch_size: int):
+    size_before = await database_bytes()
+    latency_before = await list_latency()
+
+    if engine.dialect.name == "postgresql":
+        await to_bytea()
+    rewritten = await compress_rows(batch_size)
+
+    if engine.dialect.name == "sqlite":
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM"))
+
+    size_after = await database_bytes()
+    latency_after = await list_latency()
+    await engine.dispose()
+
+    print(f"  {'rows_compressed':24s} {rewritten}")
+    print(f"  {'database_mb':24s} {size_before / 1e6:.2f} -> {size_after / 1e6:.2f}")
+    print(f"  {'list_latency_ms':24s} {latency_before * 1000:.2f} -> {latency_after * 1000:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
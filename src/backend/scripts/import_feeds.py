@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Import feeds from an OPML or CSV file, updating feeds that already exist
+
+CSV files need a header row with at least feed_url (or url); source_name,
+category, update_interval and is_active are optional. Re-running an import
+updates the same feeds rather than adding duplicates. Unlike the /import
+endpoint, validation here runs to completion unless --validate-timeout is set.
+
+Usage:
+    python -m scripts.import_feeds feeds.opml
+    python -m scripts.import_feeds feeds.csv --no-validate
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Optional
+from app.database import AsyncSessionLocal, init_db
+from app.services.feed_import import feed_importer
+from app.services.rss_ingestion import rss_service
+
+
+async def run(path: Path, validate: bool, validate_timeout: Optional[float]):
+    await init_db()
+    feed_importer.validate_timeout = validate_timeout
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await feed_importer.import_feeds(session, path.read_bytes(), validate)
+    finally:
+        await rss_service.close()
+
+    print(f"{result['received']} feeds in {path}: {result['created']} created, {result['updated']} updated")
+    if result["unvalidated"]:
+        print(f"  {result['unvalidated']} imported without validation (timed out)")
+    for rejected in result["rejected"]:
+        print(f"  rejected {rejected['feed_url']}: {rejected['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="OPML or CSV feed list")
+    parser.add_argument("--no-validate", action="store_true", help="skip fetching each feed to check it")
+    parser.add_argument("--validate-timeout", type=float, help="seconds before unchecked feeds are imported as is")
+    args = parser.parse_args()
+    asyncio.run(run(args.path, not args.no_validate, args.validate_timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""Report polls per day and ingest lag under adaptive vs static feed intervals
+
+Usage:
+    python -m scripts.polling_report --window-hours 24
+"""
+
+import argparse
+import asyncio
+from app.database import AsyncSessionLocal
+from app.services.adaptive_polling import polling_report
+
+
+async def run(window_hours: int):
+    async with AsyncSessionLocal() as session:
+        report = await polling_report(session, window_hours)
+
+    for key, value in report.items():
+        print(f"  {key:36s} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--window-hours", type=int, default=24)
+    args = parser.parse_args()
+    asyncio.run(run(args.window_hours))
+
+
+if __name__ == "__main__":
+    main()
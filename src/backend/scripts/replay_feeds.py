@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Replay recorded feed payloads through the ingestion pipeline, or record new ones
+
+Replays into a scratch SQLite database unless --database-url is given, and
+reports articles/s, DB write throughput and end-to-end ingest latency.
+
+Usage:
+    python -m scripts.replay_feeds recordings/2025-10-22
+    python -m scripts.replay_feeds recordings.tar.gz --speed 60
+    python -m scripts.replay_feeds --record recordings/today --rounds 12 --interval 300
+"""
+
+import argparse
+import asyncio
+import tempfile
+from datetime import datetime
+from pathlib import Path
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.database import Base
+from app.services.feed_replay import FeedReplayer, load_recording, write_payload
+from scripts.seed_feeds import PRIORITY_FEEDS
+
+
+async def replay(path: Path, speed, database_url: str):
+    payloads = load_recording(path)
+    print(f"{len(payloads)} payloads from {path}")
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        stats = await FeedReplayer(payloads, session_factory, speed).run()
+    finally:
+        await engine.dispose()
+
+    for key, value in stats.items():
+        print(f"  {key:22s} {value}")
+
+
+async def record(directory: Path, rounds: int, interval: float):
+    async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+        for round_number in range(rounds):
+            for feed in PRIORITY_FEEDS:
+                try:
+                    response = await client.get(feed["feed_url"])
+                except httpx.HTTPError as e:
+                    print(f"  {feed['source_name']}: {e}")
+                    continue
+                headers = {
+                    name: response.headers[name]
+                    for name in ("Content-Type", "ETag", "Last-Modified")
+                    if name in response.headers
+                }
+                write_payload(
+                    directory, feed["feed_url"], datetime.utcnow(),
+                    response.content, response.status_code, headers,
+                )
+            print(f"round {round_number + 1}/{rounds} recorded")
+            if round_number + 1 < rounds:
+                await asyncio.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", type=Path, nargs="?", help="directory or archive to replay")
+    parser.add_argument("--speed", type=float, help="replay at recorded timing / speed")
+    parser.add_argument("--database-url", help="default: a scratch SQLite database")
+    parser.add_argument("--record", type=Path, help="record the seed feeds into this directory")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--interval", type=float, default=300, help="seconds between rounds")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.rounds, args.interval))
+        return
+    if not args.recording:
+        parser.error("a recording to replay, or --record, is required")
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/replay.db"
+    asyncio.run(replay(args.recording, args.speed, database_url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Run sharded feed ingestion workers, one process and event loop each
+
+Each worker fetches the feeds the consistent-hash ring assigns it (see
+app/workers/ingestion_worker.py). Set INGESTION_SHARDED=true for the API
+process so it leaves fetching to the workers. Workers on several hosts can
+share one database; worker ids must be unique across them.
+
+Usage:
+    python -m scripts.run_ingestion_workers --workers 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import signal
+import socket
+from app.config import settings
+from app.workers.ingestion_worker import run_worker
+
+
+def worker_main(worker_id: str) -> None:
+    asyncio.run(run_worker(worker_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=settings.INGESTION_WORKERS)
+    parser.add_argument("--id-prefix", default=socket.gethostname(), help="worker ids are <prefix>-<n>")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=worker_main, args=(f"{args.id_prefix}-{n}",), name=f"ingest-{n}")
+        for n in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()  # SIGTERM: the worker leaves the ring cleanly
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Ctrl-C reaches the workers too; wait for them to leave the ring
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
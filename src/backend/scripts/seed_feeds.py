@@ -2,8 +2,8 @@
 """Seed database with priority RSS feeds from MVP list"""
 
 import asyncio
-from app.database import AsyncSessionLocal
-from app.models import RSSFeed
+from app.database import AsyncSessionLocal, init_db
+from app.services.feed_import import feed_importer
 
 # Priority feeds from PRIORITY-FEEDS-FOR-MVP.md
 PRIORITY_FEEDS = [
@@ -62,16 +62,15 @@ PRIORITY_FEEDS = [
 
 
 async def seed_feeds():
-    """Seed database with priority feeds"""
+    """Seed database with priority feeds; re-running updates them in place"""
+    await init_db()
+    feeds, errors = feed_importer.normalise(PRIORITY_FEEDS)
     async with AsyncSessionLocal() as session:
-        for feed_data in PRIORITY_FEEDS:
-            # Check if feed exists
-            feed = RSSFeed(**feed_data, is_active=True)
-            session.add(feed)
-            print(f"Added: {feed_data['source_name']}")
+        counts = await feed_importer.upsert(session, feeds)
 
-        await session.commit()
-        print(f"\nSeeded {len(PRIORITY_FEEDS)} RSS feeds")
+    for url, error in errors.items():
+        print(f"Skipped {url}: {error}")
+    print(f"Seeded {len(feeds)} RSS feeds: {counts['created']} added, {counts['updated']} updated")
 
 
 if __name__ == "__main__":
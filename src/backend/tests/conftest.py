@@ -1,6 +1,7 @@
 """Pytest configuration and fixtures"""
 
 import asyncio
+from datetime import datetime
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
@@ -73,7 +74,7 @@ async def sample_article(db_session, sample_feed):
         headline="Test Article Headline",
         url="https://example.com/article/123",
         source="Example News",
-        publish_datetime="2025-10-22T14:30:00",
+        publish_datetime=datetime(2025, 10, 22, 14, 30),
         processed_status="pending",
         content_hash="abc123",
     )
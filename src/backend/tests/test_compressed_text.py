@@ -0,0 +1,66 @@
+"""Tests for compressed Article.raw_content storage"""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import undefer
+from app.models import Article
+from app.models.types import compress_text, decompress_text, is_compressed
+
+LONG_CONTENT = (
+    '<p>The Federal Reserve left interest rates unchanged on Wednesday, '
+    'according to a statement. <a href="https://www.example.com/fed">Read more</a></p>'
+) * 5
+
+
+def test_compress_round_trip():
+    for value in (LONG_CONTENT, "", "\x00looks compressed", "naïve café — 日本語"):
+        assert decompress_text(compress_text(value)) == value
+    assert len(compress_text(LONG_CONTENT)) < len(LONG_CONTENT) // 3
+    assert decompress_text("legacy text row") == "legacy text row"
+    assert decompress_text(b"plain utf-8 bytes") == "plain utf-8 bytes"
+
+
+@pytest.mark.asyncio
+async def test_raw_content_stored_compressed_and_deferred(db_session, sample_feed):
+    for url, content in [
+        ("https://example.com/long", LONG_CONTENT),
+        ("https://example.com/short", "Short summary"),
+        ("https://example.com/none", None),
+    ]:
+        db_session.add(Article(
+            feed_id=sample_feed.feed_id, headline=url, url=url, source="Test",
+            publish_datetime=datetime(2025, 10, 22), raw_content=content,
+        ))
+    await db_session.commit()
+    # A row written before compression, still TEXT in SQLite
+    await db_session.execute(text(
+        "INSERT INTO articles (feed_id, headline, url, source, publish_datetime, "
+        "processed_status, raw_content) VALUES (:feed_id, 'legacy', 'https://example.com/legacy', "
+        "'Test', '2025-10-22 00:00:00', 'pending', 'Legacy content')"
+    ), {"feed_id": sample_feed.feed_id})
+    await db_session.commit()
+
+    stored = dict((await db_session.execute(text("SELECT url, raw_content FROM articles"))).all())
+    assert is_compressed(stored["https://example.com/long"])
+    assert stored["https://example.com/short"] == b"Short summary"
+    assert stored["https://example.com/none"] is None
+
+    db_session.expunge_all()
+    article = await db_session.scalar(select(Article).where(Article.url == "https://example.com/long"))
+    assert "raw_content" not in article.__dict__
+
+    result = await db_session.execute(
+        select(Article.url, Article.raw_content).order_by(Article.article_id)
+    )
+    assert dict(result.all()) == {
+        "https://example.com/long": LONG_CONTENT,
+        "https://example.com/short": "Short summary",
+        "https://example.com/none": None,
+        "https://example.com/legacy": "Legacy content",
+    }
+
+    article = await db_session.scalar(
+        select(Article).options(undefer(Article.raw_content)).where(Article.url == "https://example.com/long")
+    )
+    assert article.raw_content == LONG_CONTENT
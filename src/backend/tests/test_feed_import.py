@@ -0,0 +1,134 @@
+"""Tests for bulk OPML/CSV feed import"""
+
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from sqlalchemy import select
+from app.models import RSSFeed
+from app.services.feed_import import FeedImporter, parse_feed_list
+from tests.test_rss_ingestion import mock_service, rss_with_items
+
+OPML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>Subscriptions</title></head>
+  <body>
+    <outline text="Finance">
+      <outline type="rss" text="CNBC Markets" xmlUrl="https://www.cnbc.com/markets.rss"/>
+      <outline type="rss" text="Yahoo Finance" xmlUrl="https://finance.yahoo.com/news/rssindex"/>
+    </outline>
+    <outline type="rss" title="TechCrunch" category="/Tech" xmlUrl="https://techcrunch.com/feed"/>
+  </body>
+</opml>
+"""
+
+CSV = b"""url,name,category,interval,active
+https://example.com/rss,Example News,finance,600,true
+https://example.com/html,Not A Feed,general,300,yes
+https://example.com/gone,Gone,general,300,1
+ftp://example.com/feed,Bad Scheme,general,300,1
+https://example.com/bad-interval,Bad Interval,general,soon,1
+"""
+
+
+def test_parse_opml_and_csv():
+    assert parse_feed_list(OPML) == [
+        {"feed_url": "https://www.cnbc.com/markets.rss", "source_name": "CNBC Markets", "category": "finance"},
+        {"feed_url": "https://finance.yahoo.com/news/rssindex", "source_name": "Yahoo Finance", "category": "finance"},
+        {"feed_url": "https://techcrunch.com/feed", "source_name": "TechCrunch", "category": "tech"},
+    ]
+    assert parse_feed_list(CSV)[0] == {
+        "feed_url": "https://example.com/rss",
+        "source_name": "Example News",
+        "category": "finance",
+        "update_interval": "600",
+        "is_active": "true",
+    }
+    with pytest.raises(ValueError):
+        parse_feed_list(b"<opml><body>")
+
+
+@pytest.mark.asyncio
+async def test_import_validates_upserts_and_staggers(db_session, sample_feed):
+    def handler(request):
+        if request.url.path == "/html":
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, content=b"<!doctype html><p>hi</p>")
+        if request.url.path == "/gone":
+            return httpx.Response(404)
+        return httpx.Response(200, content=rss_with_items([("Story", "https://example.com/1")]))
+
+    service, requests = mock_service(handler)
+    importer = FeedImporter(service)
+    importer.stagger_window = 600
+    scheduled_before = sample_feed.next_fetch_scheduled
+
+    result = await importer.import_feeds(db_session, CSV)
+    assert (result["received"], result["created"], result["updated"]) == (5, 0, 1)
+    errors = {rejected["feed_url"]: rejected["error"] for rejected in result["rejected"]}
+    assert errors["ftp://example.com/feed"] == "not an http(s) URL"
+    assert errors["https://example.com/bad-interval"].startswith("update_interval:")
+    assert errors["https://example.com/html"].startswith("not a feed")
+    assert errors["https://example.com/gone"] == "HTTP 404"
+    assert len(errors) == 4
+    # Malformed entries are rejected before any request is made
+    assert len(requests) == 3
+
+    # sample_feed shares the URL: updated in place, its schedule kept
+    await db_session.refresh(sample_feed)
+    assert sample_feed.source_name == "Example News"
+    assert sample_feed.update_interval == 600
+    assert sample_feed.next_fetch_scheduled == scheduled_before
+
+    result = await importer.import_feeds(db_session, OPML, validate=False)
+    assert (result["created"], result["updated"]) == (3, 0)
+    result = await importer.import_feeds(db_session, OPML, validate=False)
+    assert (result["created"], result["updated"]) == (0, 3)
+
+    feeds = (await db_session.execute(select(RSSFeed).where(RSSFeed.feed_id != sample_feed.feed_id))).scalars().all()
+    assert len(feeds) == 3
+    due = sorted(feed.next_fetch_scheduled for feed in feeds)
+    assert due[-1] - due[0] == timedelta(seconds=400)
+    assert due[0] <= datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_validation_is_capped_and_keyed_like_fetches(db_session):
+    """Slow validation stops at the timeout and imports the rest unchecked"""
+    async def handler(request):
+        if request.url.path == "/slow":
+            await asyncio.sleep(5)
+        return httpx.Response(200, content=rss_with_items([("Story", "https://example.com/1")]))
+
+    service, _ = mock_service(handler)
+    importer = FeedImporter(service)
+    importer.validate_timeout = 0.2
+    content = b"feed_url\nhttps://example.com:8443/fast\nhttps://example.com/slow\n"
+
+    result = await importer.import_feeds(db_session, content)
+    assert (result["created"], result["unvalidated"], result["rejected"]) == (2, 1, [])
+    # The limiter bucket matches the one the fetch path uses, port included
+    assert "example.com:8443" in service.host_limiter.stats()
+
+
+@pytest.mark.asyncio
+async def test_reimport_keeps_columns_the_list_omits(db_session, sample_feed):
+    """A URL-only entry updates nothing; a new feed gets the defaults"""
+    sample_feed.update_interval = 3600
+    sample_feed.is_active = False
+    await db_session.commit()
+
+    importer = FeedImporter(mock_service(lambda request: httpx.Response(404))[0])
+    content = b"feed_url,category\nhttps://example.com/rss,\nhttps://techcrunch.com/feed,tech\n"
+    result = await importer.import_feeds(db_session, content, validate=False)
+    assert (result["created"], result["updated"]) == (1, 1)
+
+    await db_session.refresh(sample_feed)
+    assert (sample_feed.source_name, sample_feed.category) == ("Example News", "finance")
+    assert (sample_feed.update_interval, sample_feed.is_active) == (3600, False)
+
+    result = await importer.import_feeds(db_session, b"url,category\nhttps://example.com/rss,markets\n", validate=False)
+    await db_session.refresh(sample_feed)
+    assert (sample_feed.category, sample_feed.is_active) == ("markets", False)
+
+    feed = (await db_session.execute(select(RSSFeed).where(RSSFeed.feed_url == "https://techcrunch.com/feed"))).scalar_one()
+    assert (feed.source_name, feed.category, feed.update_interval, feed.is_active) == ("techcrunch.com", "tech", 300, True)
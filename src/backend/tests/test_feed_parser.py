@@ -0,0 +1,51 @@
+"""Tests for the fast-path feed parser"""
+
+from pathlib import Path
+from xml.etree.ElementTree import ParseError
+import pytest
+from app.services.feed_parser import (
+    UnsupportedFeed,
+    fast_parse_entries,
+    feedparser_entries,
+    parse_feed_entries,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "feeds"
+FAST_PATH_FEEDS = [
+    "cbsnews_guid_links.xml",
+    "cnbc_markets.xml",
+    "nbcnews_atom.xml",
+    "techcrunch.xml",
+    "washingtonpost_politics.xml",
+    "yahoo_finance.xml",
+]
+FALLBACK_FEEDS = [
+    "federalreserve_rdf.xml",
+    "malformed_entities.xml",
+    "markets_podcast_itunes.xml",
+]
+
+
+@pytest.mark.parametrize("name", FAST_PATH_FEEDS)
+def test_fast_path_matches_feedparser(name):
+    """Link, title and publish time agree with feedparser entry for entry"""
+    content = (FIXTURES / name).read_bytes()
+    fast = fast_parse_entries(content)
+    slow, warning = feedparser_entries(content)
+
+    assert warning is None
+    assert len(fast) == len(slow) > 0
+    assert [entry[:3] for entry in fast] == [entry[:3] for entry in slow]
+    assert [entry[3] is None for entry in fast] == [entry[3] is None for entry in slow]
+
+
+@pytest.mark.parametrize("name", FALLBACK_FEEDS)
+def test_unusual_feeds_fall_back_to_feedparser(name):
+    """RDF, exotic namespaces and malformed XML are left to feedparser"""
+    content = (FIXTURES / name).read_bytes()
+    with pytest.raises((UnsupportedFeed, ParseError)):
+        fast_parse_entries(content)
+
+    entries, _ = parse_feed_entries(content)
+    assert entries == feedparser_entries(content)[0]
+    assert entries
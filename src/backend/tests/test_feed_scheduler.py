@@ -0,0 +1,147 @@
+"""Tests for the timer-heap feed scheduler"""
+
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models import RSSFeed
+from app.workers.feed_scheduler import FeedScheduler
+
+
+class RecordingService:
+    """Stands in for the ingestion service, recording each dispatched batch"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def fetch_feeds(self, feeds, session):
+        self.batches.append(sorted(feed.feed_id for feed in feeds))
+        for feed in feeds:
+            feed.next_fetch_scheduled = datetime.utcnow() + timedelta(hours=1)
+        await session.commit()
+        return 0
+
+
+async def make_scheduler(db_engine, db_session, due_offsets):
+    feeds = [
+        RSSFeed(
+            feed_url=f"https://example.com/{i}.xml",
+            source_name=f"Feed {i}",
+            next_fetch_scheduled=datetime.utcnow() + timedelta(seconds=offset),
+        )
+        for i, offset in enumerate(due_offsets)
+    ]
+    db_session.add_all(feeds)
+    await db_session.commit()
+
+    service = RecordingService()
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    scheduler = FeedScheduler(session_factory=session_factory, service=service)
+    scheduler.jitter = 0
+    return scheduler, service, [feed.feed_id for feed in feeds]
+
+
+@pytest.mark.asyncio
+async def test_feeds_dispatch_when_due_not_on_a_scan(db_engine, db_session):
+    """Each feed is fetched at its own due time and then rescheduled"""
+    scheduler, service, (overdue, soon, later) = await make_scheduler(
+        db_engine, db_session, [-60, 0.2, 3600]
+    )
+    await scheduler.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert service.batches == [[overdue]]
+
+        await asyncio.sleep(0.3)
+        assert service.batches == [[overdue], [soon]]
+    finally:
+        await scheduler.stop()
+
+    # Both fetched feeds are back in the heap at their new due time
+    assert set(scheduler._due) == {overdue, soon, later}
+    assert scheduler._due[overdue] > datetime.utcnow() + timedelta(minutes=59)
+    assert scheduler.stats()["dispatched"] == 2
+
+
+@pytest.mark.asyncio
+async def test_schedule_changes_take_effect_immediately(db_engine, db_session):
+    """New feeds wake the dispatcher and removed feeds are never fetched"""
+    scheduler, service, (first, second) = await make_scheduler(
+        db_engine, db_session, [3600, 0.1]
+    )
+    await scheduler.start()
+    try:
+        scheduler.unschedule(second)
+        scheduler.schedule(first)
+        await asyncio.sleep(0.2)
+    finally:
+        await scheduler.stop()
+
+    assert service.batches == [[first]]
+
+
+class SlowService(RecordingService):
+    """Holds the first batch open until released, like a feed that never answers"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def fetch_feeds(self, feeds, session):
+        first = not self.batches
+        await super().fetch_feeds(feeds, session)
+        if first:
+            await self.release.wait()
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_slow_batch_does_not_hold_up_later_feeds(db_engine, db_session):
+    """Feeds due behind a slow batch go out in their own batch, up to the in-flight cap"""
+    scheduler, _, (slow, soon, later) = await make_scheduler(
+        db_engine, db_session, [-60, 0.1, 0.2]
+    )
+    service = scheduler.service = SlowService()
+    scheduler.max_batches = 2
+    await scheduler.start()
+    try:
+        await asyncio.sleep(0.15)
+        assert service.batches == [[slow], [soon]]
+
+        # The quick batch has finished; only the stuck one is still in flight
+        await asyncio.sleep(0.15)
+        assert service.batches == [[slow], [soon], [later]]
+        assert scheduler.stats()["batches_in_flight"] == 1
+
+        service.release.set()
+        await asyncio.sleep(0.05)
+        assert scheduler.stats()["batches_in_flight"] == 0
+    finally:
+        await scheduler.stop()
+
+
+class RollbackService(RecordingService):
+    """Loses every write, as when the ingestion commit is rolled back"""
+
+    async def fetch_feeds(self, feeds, session):
+        self.batches.append(sorted(feed.feed_id for feed in feeds))
+        await session.rollback()
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_back_off_instead_of_redispatching(db_engine, db_session):
+    """A feed left at its past due time is retried later, with a growing delay"""
+    scheduler, _, (overdue,) = await make_scheduler(db_engine, db_session, [-60])
+    scheduler.service = service = RollbackService()
+    scheduler.retry_delay = 0.2
+    await scheduler.start()
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        await scheduler.stop()
+
+    # Dispatched at once and after one retry delay, not in a tight loop
+    assert service.batches == [[overdue], [overdue]]
+    assert scheduler._retries[overdue] == 2
+    assert scheduler._due[overdue] > datetime.utcnow() + timedelta(seconds=0.2)
@@ -0,0 +1,96 @@
+"""Tests for consistent-hash feed sharding across ingestion workers"""
+
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models import IngestionWorker, RSSFeed
+from app.services.feed_sharding import HashRing
+from app.workers.feed_scheduler import FeedScheduler
+from app.workers.ingestion_worker import ShardCoordinator
+from tests.test_feed_scheduler import RecordingService
+
+
+def test_ring_balances_and_moves_only_the_changed_share():
+    feed_ids = range(1, 5001)
+    ring = HashRing(["a", "b", "c", "d"])
+    shards = ring.shards(feed_ids)
+    assert sum(len(shard) for shard in shards.values()) == 5000
+    assert all(900 < len(shard) < 1600 for shard in shards.values())
+
+    before = {feed_id: ring.owner(feed_id) for feed_id in feed_ids}
+    ring.add("e")
+    moved = [feed_id for feed_id in feed_ids if ring.owner(feed_id) != before[feed_id]]
+    # Only feeds taken over by the new worker move, about a fifth of them
+    assert all(ring.owner(feed_id) == "e" for feed_id in moved)
+    assert 600 < len(moved) < 1500
+
+    ring.remove("e")
+    assert {feed_id: ring.owner(feed_id) for feed_id in feed_ids} == before
+
+
+@pytest.mark.asyncio
+async def test_workers_rebalance_on_join_and_leave(db_engine, db_session):
+    feeds = [
+        RSSFeed(
+            feed_url=f"https://example.com/{i}.xml",
+            source_name=f"Feed {i}",
+            next_fetch_scheduled=datetime.utcnow() + timedelta(hours=1),
+        )
+        for i in range(40)
+    ]
+    db_session.add_all(feeds)
+    await db_session.commit()
+    all_ids = {feed.feed_id for feed in feeds}
+
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    workers = {}
+    for worker_id in ("a", "b"):
+        scheduler = FeedScheduler(session_factory=session_factory, service=RecordingService())
+        coordinator = ShardCoordinator(worker_id, scheduler, session_factory)
+        scheduler.owns = coordinator.owns
+        workers[worker_id] = (scheduler, coordinator)
+
+    scheduler_a, coordinator_a = workers["a"]
+    scheduler_b, coordinator_b = workers["b"]
+
+    # Same order as run_worker: join the ring, then load the shard
+    assert await coordinator_a.heartbeat(rebalance=False)
+    await scheduler_a.start()
+    assert set(scheduler_a._due) == all_ids
+
+    # b joins; a notices at its next heartbeat and gives up b's shard
+    assert await coordinator_b.heartbeat(rebalance=False)
+    await scheduler_b.start()
+    assert await coordinator_a.heartbeat()
+    assert not await coordinator_a.heartbeat()
+    assert set(scheduler_a._due) | set(scheduler_b._due) == all_ids
+    assert not set(scheduler_a._due) & set(scheduler_b._due)
+    assert scheduler_a._due and scheduler_b._due
+
+    # A feed moved away is not put back when its batch reschedules it
+    moved = next(iter(scheduler_b._due))
+    scheduler_a.schedule(moved)
+    assert moved not in scheduler_a._due
+
+    await coordinator_b.leave()
+    assert await coordinator_a.heartbeat()
+    assert set(scheduler_a._due) == all_ids
+
+    # A worker that stops heartbeating drops out after the TTL
+    db_session.add(IngestionWorker(worker_id="c", heartbeat_at=datetime.utcnow() - timedelta(hours=1)))
+    await db_session.commit()
+    assert not await coordinator_a.heartbeat()
+
+    await scheduler_a.stop()
+    await scheduler_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_schedule_is_ignored_until_started(db_engine):
+    """An API process that does not dispatch fetches never grows a schedule"""
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    scheduler = FeedScheduler(session_factory=session_factory, service=RecordingService())
+
+    scheduler.schedule(1)
+    await scheduler.rebuild()
+    assert not scheduler._due and not scheduler._heap
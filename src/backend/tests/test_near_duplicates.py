@@ -0,0 +1,118 @@
+"""Tests for near-duplicate headline detection"""
+
+from datetime import datetime
+import httpx
+import pytest
+from sqlalchemy import select
+from app.models import Article
+from app.services.near_duplicates import NearDuplicateIndex, headline_tokens
+from tests.test_rss_ingestion import mock_service, rss_with_items
+
+
+def test_reworded_headlines_match_and_distinct_ones_do_not():
+    index = NearDuplicateIndex()
+    now = datetime.utcnow()
+    index.add(1, headline_tokens("Fed holds interest rates steady as inflation cools - Reuters"), now)
+    index.add(2, headline_tokens("Oil prices jump after OPEC+ announces surprise output cut"), now)
+
+    assert index.find(headline_tokens("Fed holds interest rates steady as inflation cools | CNBC")) == 1
+    assert index.find(headline_tokens("UPDATE: Fed holds interest rates steady as inflation cools")) == 1
+    assert index.find(headline_tokens("Fed raises interest rates as inflation heats up")) is None
+    assert index.find(headline_tokens("Markets")) is None
+
+
+def test_old_headlines_are_pruned():
+    index = NearDuplicateIndex()
+    index.add(1, headline_tokens("Fed holds interest rates steady"), datetime(2025, 1, 1))
+    index.prune()
+    assert index.find(headline_tokens("Fed holds interest rates steady")) is None
+    assert index.stats() == {"headlines": 0, "buckets": 0}
+
+
+@pytest.mark.asyncio
+async def test_ingest_links_near_duplicates_to_canonical_article(db_session, sample_feed):
+    """Syndicated rewordings are stored as duplicates pointing at the first version"""
+    body = rss_with_items(
+        [
+            ("Apple beats quarterly earnings estimates on iPhone demand", "https://a.example.com/1"),
+            ("Apple beats quarterly earnings estimates on iPhone demand - Yahoo", "https://b.example.com/2"),
+            ("Tesla recalls vehicles over steering fault", "https://a.example.com/3"),
+        ]
+    )
+    service, _ = mock_service(lambda request: httpx.Response(200, content=body))
+    assert await service.fetch_feed(sample_feed, db_session) == 3
+
+    body = rss_with_items(
+        [("Exclusive: Apple beats quarterly earnings estimates on iPhone demand", "https://c.example.com/4")]
+    )
+    later, _ = mock_service(lambda request: httpx.Response(200, content=body))
+    later.near_duplicates = service.near_duplicates
+    assert await later.fetch_feed(sample_feed, db_session) == 1
+
+    rows = (
+        await db_session.execute(
+            select(Article.url, Article.processed_status, Article.duplicate_of, Article.article_id)
+        )
+    ).all()
+    by_url = {url: (status, duplicate_of, article_id) for url, status, duplicate_of, article_id in rows}
+    canonical_id = by_url["https://a.example.com/1"][2]
+
+    assert by_url["https://a.example.com/1"][:2] == ("pending", None)
+    assert by_url["https://b.example.com/2"][:2] == ("duplicate", canonical_id)
+    assert by_url["https://c.example.com/4"][:2] == ("duplicate", canonical_id)
+    assert by_url["https://a.example.com/3"][:2] == ("pending", None)
+    assert service.near_duplicate_count == 1
+    assert later.near_duplicate_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_leaves_dedup_state_untouched(db_session, sample_feed, monkeypatch):
+    """Index and seen-filter only learn about rows once their transaction commits"""
+    body = rss_with_items(
+        [("Apple beats quarterly earnings estimates on iPhone demand", "https://a.example.com/1")]
+    )
+    service, _ = mock_service(lambda request: httpx.Response(200, content=body))
+    await service.seen_filter.rebuild(db_session)
+    commit = db_session.commit
+
+    async def failing_commit():
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(db_session, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        await service.fetch_feed(sample_feed, db_session)
+    assert service.near_duplicates.stats()["headlines"] == 0
+    assert not service.seen_filter.maybe_seen_url("https://a.example.com/1")
+
+    monkeypatch.setattr(db_session, "commit", commit)
+    await db_session.refresh(sample_feed)
+    assert await service.fetch_feed(sample_feed, db_session) == 1
+    article_id = (await db_session.execute(select(Article.article_id))).scalar_one()
+    tokens = headline_tokens("Apple beats quarterly earnings estimates on iPhone demand")
+    assert service.near_duplicates.find(tokens) == article_id
+    assert service.seen_filter.maybe_seen_url("https://a.example.com/1")
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_headlines_stored_elsewhere(db_session, sample_feed):
+    """A refresh indexes only articles added since the last read"""
+    index = NearDuplicateIndex()
+    await index.rebuild(db_session)
+    headline = "Apple beats quarterly earnings estimates on iPhone demand"
+
+    # Stored by another worker, with its own index
+    article = Article(
+        feed_id=sample_feed.feed_id,
+        headline=headline,
+        url="https://a.example.com/1",
+        source="Example News",
+        publish_datetime=datetime.utcnow(),
+        processed_status="pending",
+    )
+    db_session.add(article)
+    await db_session.commit()
+    assert index.find(headline_tokens(headline)) is None
+
+    assert await index.refresh(db_session) == 1
+    assert index.find(headline_tokens(headline)) == article.article_id
+    assert await index.refresh(db_session) == 0
@@ -0,0 +1,528 @@
+"""Tests for RSS ingestion service"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from sqlalchemy import event, select, func
+from sqlalchemy.orm import undefer
+from app.models import Article, RSSFeed
+from app.services.adaptive_polling import AdaptivePoller
+from app.services.host_limiter import HostRateLimiter
+from app.services.rss_ingestion import FeedFetchResult, FeedRejected, RSSIngestionService
+
+RSS_BODY = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Example News</title>
+    <item>
+      <title>Fed holds rates steady</title>
+      <link>https://example.com/fed-holds</link>
+      <pubDate>Wed, 22 Oct 2025 14:30:00 GMT</pubDate>
+      <description>The Federal Reserve left rates unchanged.</description>
+    </item>
+    <item>
+      <title>Oil jumps on supply cut</title>
+      <link>https://example.com/oil-jumps</link>
+      <pubDate>Wed, 22 Oct 2025 13:00:00 GMT</pubDate>
+      <description>Crude rallied after OPEC+ announced cuts.</description>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def mock_service(handler):
+    """Build a service whose shared client is routed through a mock transport"""
+    requests = []
+
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    service = RSSIngestionService(client=client)
+    # Host politeness limits have their own tests; keep them out of the way here
+    service.host_limiter.rate = service.host_limiter.burst = 1000
+    service.host_limiter.default_pause = 0
+    return service, requests
+
+
+async def count_articles(db_session) -> int:
+    result = await db_session.execute(select(func.count()).select_from(Article))
+    return result.scalar()
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_short_circuits_on_304(db_session, sample_feed):
+    """A 304 response skips parsing and counts as a cache hit"""
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content=RSS_BODY,
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 22 Oct 2025 14:30:00 GMT"},
+        )
+
+    service, requests = mock_service(handler)
+
+    assert await service.fetch_feed(sample_feed, db_session) == 2
+    assert sample_feed.etag == '"v1"'
+
+    assert await service.fetch_feed(sample_feed, db_session) == 0
+    assert requests[1].headers["If-Modified-Since"] == "Wed, 22 Oct 2025 14:30:00 GMT"
+    assert sample_feed.fetch_count == 2
+    assert sample_feed.not_modified_count == 1
+    assert sample_feed.cache_hit_ratio == 0.5
+    assert await count_articles(db_session) == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_body_hash_short_circuits(db_session, sample_feed):
+    """Servers that ignore validators are caught by the body digest"""
+    service, _ = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+
+    assert await service.fetch_feed(sample_feed, db_session) == 2
+    assert await service.fetch_feed(sample_feed, db_session) == 0
+    assert sample_feed.not_modified_count == 1
+    assert sample_feed.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reused_across_fetches(db_session, sample_feed):
+    """The pooled client stays open between fetches until close()"""
+    service, requests = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+    client = await service._get_client()
+
+    await service.fetch_feed(sample_feed, db_session)
+    await service.fetch_feed(sample_feed, db_session)
+
+    assert await service._get_client() is client
+    assert len(requests) == 2
+
+    await service.close()
+    assert client.is_closed
+
+
+def rss_with_items(items) -> bytes:
+    """Build an RSS 2.0 body from (title, link) pairs"""
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link></item>" for title, link in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+@pytest.mark.asyncio
+async def test_batched_dedup_skips_stored_and_repeated_entries(
+    db_session, sample_feed, sample_article
+):
+    """Entries already stored, or repeated within one feed, are inserted once"""
+    body = rss_with_items(
+        [
+            ("Existing story", sample_article.url),
+            ("New story", "https://example.com/new"),
+            ("New story", "https://example.com/new"),
+        ]
+    )
+    service, _ = mock_service(lambda request: httpx.Response(200, content=body))
+
+    assert await service.fetch_feed(sample_feed, db_session) == 1
+    assert await count_articles(db_session) == 2
+
+
+@pytest.mark.asyncio
+async def test_dedup_query_count_is_constant_per_feed(db_engine, db_session, sample_feed):
+    """Dedup lookups do not grow with the number of entries"""
+    statements = []
+
+    def count_selects(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", count_selects)
+    try:
+        for size in (5, 50):
+            statements.clear()
+            body = rss_with_items(
+                [(f"Story {size}-{i}", f"https://example.com/{size}/{i}") for i in range(size)]
+            )
+            service, _ = mock_service(lambda request, body=body: httpx.Response(200, content=body))
+            assert await service.fetch_feed(sample_feed, db_session) == size
+            assert len(statements) == 2
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", count_selects)
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_ignores_url_conflicts(db_session, sample_feed, sample_article):
+    """Bulk insert reports only rows actually written"""
+    service = RSSIngestionService()
+    rows = [
+        {
+            "feed_id": sample_feed.feed_id,
+            "headline": headline,
+            "url": url,
+            "source": sample_feed.source_name,
+            "publish_datetime": datetime(2025, 10, 22, 15, 0),
+            "processed_status": "pending",
+            "content_hash": f"hash-{i}",
+            "raw_content": None,
+        }
+        for i, (headline, url) in enumerate(
+            [("Repeat", sample_article.url), ("Fresh", "https://example.com/fresh")]
+        )
+    ]
+
+    assert await service._insert_articles(rows, db_session) == 1
+    assert await count_articles(db_session) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_feeds_refills_slots_as_feeds_finish(db_session):
+    """A slow feed holds one slot while the others keep draining"""
+    for i in range(4):
+        db_session.add(RSSFeed(feed_url=f"https://feeds.example.com/{i}", source_name=f"Feed {i}"))
+    await db_session.commit()
+
+    async def handler(request):
+        if request.url.path in ("/0", "/3"):
+            await asyncio.sleep(0.3)
+        return httpx.Response(200, content=rss_with_items([(request.url.path, str(request.url))]))
+
+    service, _ = mock_service(handler)
+    service.fetch_concurrency = 2
+
+    assert await service.fetch_all_feeds(db_session) == 4
+
+    stats = service.last_cycle_stats
+    assert stats["feed_count"] == 4
+    assert stats["errors"] == 0
+    # Fixed batches of two would take two slow rounds (~0.6s)
+    assert stats["makespan"] < 0.5
+    assert stats["fetch_latency_p95"] >= stats["fetch_latency_p50"]
+
+
+@pytest.mark.asyncio
+async def test_single_writer_groups_commits_and_isolates_failures(db_session):
+    """Fetched feeds are committed in groups; a failing feed only records its error"""
+    feeds = [
+        RSSFeed(feed_url=f"https://feeds.example.com/{i}", source_name=f"Feed {i}")
+        for i in range(5)
+    ]
+    db_session.add_all(feeds)
+    await db_session.commit()
+
+    def handler(request):
+        if request.url.path == "/2":
+            return httpx.Response(500)
+        return httpx.Response(200, content=rss_with_items([(request.url.path, str(request.url))]))
+
+    service, _ = mock_service(handler)
+    service.commit_batch_size = 5
+
+    assert await service.fetch_all_feeds(db_session) == 4
+    assert service.last_cycle_stats["errors"] == 1
+    assert service.last_cycle_stats["commits"] < len(feeds)
+    assert feeds[2].error_count == 1
+    assert "500" in feeds[2].last_error
+    assert all(feed.last_fetched for i, feed in enumerate(feeds) if i != 2)
+
+
+@pytest.mark.asyncio
+async def test_parsing_in_worker_process(db_session, sample_feed):
+    """Feeds parsed in the process pool yield the same rows as inline parsing"""
+    service, _ = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+    service.parse_workers = 1
+    await service.start()
+    try:
+        assert service._parse_pool is not None
+        assert await service.fetch_feed(sample_feed, db_session) == 2
+    finally:
+        await service.close()
+
+    result = await db_session.execute(select(Article).options(undefer(Article.raw_content)).order_by(Article.publish_datetime))
+    articles = result.scalars().all()
+    assert [a.headline for a in articles] == ["Oil jumps on supply cut", "Fed holds rates steady"]
+    assert articles[1].publish_datetime == datetime(2025, 10, 22, 14, 30)
+    assert articles[1].raw_content == "The Federal Reserve left rates unchanged."
+
+
+def dated_rss(items) -> bytes:
+    """Build an RSS 2.0 body from (title, link, pubDate) triples"""
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>{date}</pubDate></item>"
+        for title, link, date in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode()
+
+
+@pytest.mark.asyncio
+async def test_high_water_mark_stops_at_known_entries(db_session, sample_feed):
+    """Once the previous newest entry is reached, older entries are not dedup-checked"""
+    older = [
+        ("Story B", "https://example.com/b", "Wed, 22 Oct 2025 13:00:00 GMT"),
+        ("Story A", "https://example.com/a", "Wed, 22 Oct 2025 12:00:00 GMT"),
+    ]
+    newer = [("Story C", "https://example.com/c", "Wed, 22 Oct 2025 14:00:00 GMT")]
+    bodies = [dated_rss(older), dated_rss(newer + older)]
+    service, _ = mock_service(lambda request: httpx.Response(200, content=bodies.pop(0)))
+
+    assert await service.fetch_feed(sample_feed, db_session) == 2
+    assert sample_feed.last_seen_url == "https://example.com/b"
+    assert sample_feed.is_chronological
+
+    job = await service._fetch(FeedFetchResult(sample_feed))
+    assert [row["url"] for row in job.rows] == ["https://example.com/c"]
+    assert job.skipped == 2
+
+
+@pytest.mark.asyncio
+async def test_non_chronological_feed_gets_full_scan(db_session, sample_feed):
+    """Out-of-order feeds are scanned in full so late-listed new items are not missed"""
+    sample_feed.last_seen_url = "https://example.com/b"
+    sample_feed.last_seen_published = datetime(2025, 10, 22, 13, 0)
+    body = dated_rss(
+        [
+            ("Story B", "https://example.com/b", "Wed, 22 Oct 2025 13:00:00 GMT"),
+            ("Story D", "https://example.com/d", "Wed, 22 Oct 2025 15:00:00 GMT"),
+        ]
+    )
+    service, _ = mock_service(lambda request: httpx.Response(200, content=body))
+
+    job = await service._fetch(FeedFetchResult(sample_feed))
+    assert job.is_chronological is False
+    assert len(job.rows) == 2
+    assert job.high_water_url == "https://example.com/d"
+
+
+@pytest.mark.asyncio
+async def test_seen_filter_skips_dedup_queries_for_unseen_keys(
+    db_engine, db_session, sample_feed, sample_article
+):
+    """A warmed filter answers for never-seen entries without touching the database"""
+    service, _ = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+    await service.seen_filter.rebuild(db_session)
+    assert service.seen_filter.maybe_seen_url(sample_article.url)
+
+    statements = []
+
+    def count_selects(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", count_selects)
+    try:
+        assert await service.fetch_feed(sample_feed, db_session) == 2
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", count_selects)
+
+    assert statements == []
+    assert service.seen_filter.stats()["queries_avoided"] >= 4
+    assert service.seen_filter.maybe_seen_url("https://example.com/fed-holds")
+
+
+def test_adaptive_interval_tracks_publish_cadence():
+    """Busy feeds are polled more often than quiet ones, within the configured bounds"""
+    poller = AdaptivePoller()
+    now = datetime(2025, 10, 22, 12, 0)
+    busy = RSSFeed(feed_url="https://example.com/busy", source_name="Busy", update_interval=300)
+    quiet = RSSFeed(feed_url="https://example.com/quiet", source_name="Quiet", update_interval=300)
+
+    poller.observe(busy, [now - timedelta(minutes=5 * i) for i in range(12)])
+    poller.observe(quiet, [now - timedelta(hours=6 * i) for i in range(4)])
+
+    busy_interval = poller.next_interval(busy, now)
+    quiet_interval = poller.next_interval(quiet, now)
+    assert poller.min_interval <= busy_interval < quiet_interval <= poller.max_interval
+
+    # A feed without an estimate keeps its static interval
+    fresh = RSSFeed(feed_url="https://example.com/new", source_name="New", update_interval=900)
+    assert poller.next_interval(fresh, now) == 900
+
+
+@pytest.mark.asyncio
+async def test_fetch_schedules_next_poll_from_adaptive_interval(db_session, sample_feed):
+    """A successful fetch stores the learned interval and schedules with it"""
+    service, _ = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+    await service.fetch_feed(sample_feed, db_session)
+
+    assert sample_feed.arrival_interval_ewma == 5400
+    assert sample_feed.last_article_at == datetime(2025, 10, 22, 14, 30)
+    assert sample_feed.next_fetch_scheduled == sample_feed.last_fetched + timedelta(
+        seconds=sample_feed.current_poll_interval
+    )
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_and_trip_circuit(db_session, sample_feed):
+    """Consecutive errors push the next fetch out exponentially, then open the breaker"""
+    service, _ = mock_service(lambda request: httpx.Response(503))
+    service.circuit_threshold = 3
+
+    delays = []
+    for _ in range(3):
+        failed_at = datetime.utcnow()
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.fetch_feed(sample_feed, db_session)
+        delays.append((sample_feed.next_fetch_scheduled - failed_at).total_seconds())
+
+    assert service.backoff_base * 0.5 <= delays[0] <= service.backoff_base + 1
+    assert delays[1] <= service.backoff_base * 2 + 1
+    assert sample_feed.circuit_state == "open"
+    assert delays[2] >= service.circuit_cooldown
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_circuit(db_session, sample_feed):
+    """A successful probe of an open feed closes the breaker and clears the errors"""
+    sample_feed.circuit_state = "open"
+    sample_feed.error_count = 5
+    service, _ = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+
+    await service.fetch_feed(sample_feed, db_session)
+
+    assert sample_feed.circuit_state == "closed"
+    assert sample_feed.circuit_opened_at is None
+    assert sample_feed.error_count == 0
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_spaces_requests_to_one_host():
+    """Requests beyond the burst wait for tokens; other hosts are unaffected"""
+    limiter = HostRateLimiter()
+    limiter.rate, limiter.burst = 20.0, 1
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire("feeds.example.com")
+    assert time.monotonic() - start >= 0.09
+
+    assert await limiter.acquire("other.example.com") < 0.01
+    stats = limiter.stats()["feeds.example.com"]
+    assert stats["requests"] == 3
+    assert stats["wait_total"] >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_host(db_session, sample_feed):
+    """A 429 pauses every feed on the host for the Retry-After period"""
+    service, _ = mock_service(
+        lambda request: httpx.Response(429, headers={"Retry-After": "120"})
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.fetch_feed(sample_feed, db_session)
+
+    stats = service.host_limiter.stats()["example.com"]
+    assert stats["throttled"] == 1
+    assert 110 <= stats["paused_for"] <= 120
+
+
+@pytest.mark.asyncio
+async def test_paused_host_is_deferred_without_holding_a_slot(db_session):
+    """Feeds on a paused host are rescheduled past the pause and never requested"""
+    feeds = [
+        RSSFeed(source_name=f"Feed {i}", feed_url=f"https://{host}/feed{i}.xml", is_active=True)
+        for i, host in enumerate(["paused.example.com"] * 3 + ["example.com"])
+    ]
+    db_session.add_all(feeds)
+    await db_session.commit()
+
+    service, requests = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+    service.fetch_concurrency = 1
+    service.host_limiter.default_pause = 600
+    service.host_limiter.throttle("paused.example.com")
+
+    start = time.monotonic()
+    await service.fetch_feeds(feeds, db_session)
+
+    assert time.monotonic() - start < 5
+    assert [request.url.host for request in requests] == ["example.com"]
+    for feed in feeds[:3]:
+        assert feed.fetch_count in (None, 0)
+        delay = (feed.next_fetch_scheduled - datetime.utcnow()).total_seconds()
+        assert 590 <= delay <= 600
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_host_waits_outside_the_fetch_pool(db_session):
+    """Feeds waiting on their host's rate limit do not block other hosts' fetches"""
+    feeds = [
+        RSSFeed(source_name=f"Feed {i}", feed_url=f"https://{host}/feed{i}.xml", is_active=True)
+        for i, host in enumerate(["slow.example.com"] * 3 + ["example.com"])
+    ]
+    db_session.add_all(feeds)
+    await db_session.commit()
+
+    service, requests = mock_service(lambda request: httpx.Response(200, content=RSS_BODY))
+    service.fetch_concurrency = 1
+    service.host_limiter.burst = 1
+    service.host_limiter.overrides = {"slow.example.com": 5}
+
+    await service.fetch_feeds(feeds, db_session)
+
+    hosts = [request.url.host for request in requests]
+    assert hosts == ["slow.example.com", "example.com", "slow.example.com", "slow.example.com"]
+
+def test_non_positive_host_rates_are_rejected():
+    """A zero rate would divide by zero in the token bucket, so settings refuse it"""
+    from pydantic import ValidationError
+    from app.config import Settings
+
+    with pytest.raises(ValidationError):
+        Settings(OPENAI_API_KEY="x", HOST_RATE_LIMIT=0)
+    with pytest.raises(ValidationError):
+        Settings(OPENAI_API_KEY="x", HOST_RATE_OVERRIDES={"www.cnbc.com": -1})
+
+
+@pytest.mark.asyncio
+async def test_oversized_and_html_responses_are_rejected(db_session, sample_feed):
+    """Downloads stop at the byte cap and HTML pages never reach the parser"""
+    big = rss_with_items([(f"Story {i}", f"https://example.com/{i}") for i in range(200)])
+    # Streamed bodies, so bytes are counted as they come off the transport
+    service, _ = mock_service(lambda request: httpx.Response(200, stream=httpx.ByteStream(big)))
+    service.max_bytes = 4096
+
+    with pytest.raises(FeedRejected, match="exceeds"):
+        await service.fetch_feed(sample_feed, db_session)
+    assert await count_articles(db_session) == 0
+
+    html = b"<!DOCTYPE html><html><body>Service unavailable</body></html>"
+    service, _ = mock_service(
+        lambda request: httpx.Response(
+            200, stream=httpx.ByteStream(html), headers={"Content-Type": "text/html"}
+        )
+    )
+    with pytest.raises(FeedRejected, match="text/html"):
+        await service.fetch_feed(sample_feed, db_session)
+
+    assert sample_feed.error_count == 2
+    assert sample_feed.bytes_downloaded >= 4096 + len(html)
+    assert sample_feed.last_response_bytes == len(html)
+
+
+@pytest.mark.asyncio
+async def test_tracking_variants_dedupe_on_canonical_url(db_session, sample_feed):
+    """Tracking and AMP variants of stored or batched stories are dropped and counted"""
+    body = rss_with_items(
+        [
+            ("Fed holds rates steady", "https://example.com/fed-holds?utm_source=rss"),
+            ("Fed holds rates steady (AMP)", "https://www.example.com/fed-holds/amp"),
+            ("Oil jumps", "https://example.com/oil-jumps"),
+        ]
+    )
+    service, _ = mock_service(lambda request: httpx.Response(200, content=body))
+    assert await service.fetch_feed(sample_feed, db_session) == 2
+    assert service.canonical_duplicates == 1
+
+    stored = (await db_session.execute(select(Article.canonical_url))).scalars().all()
+    assert "https://example.com/fed-holds" in stored
+
+    body = rss_with_items([("Oil jumps on supply cut", "http://example.com/oil-jumps?mod=rss")])
+    service2, _ = mock_service(lambda request: httpx.Response(200, content=body))
+    assert await service2.fetch_feed(sample_feed, db_session) == 0
+    assert service2.canonical_duplicates == 1
+    assert service2.canonical_tokens_saved > 0
@@ -0,0 +1,44 @@
+"""Tests for canonical article URLs"""
+
+import pytest
+from app.services.url_canonical import canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (
+            "http://www.CNBC.com/2025/10/22/fed-holds.html?utm_source=rss&utm_medium=feed",
+            "https://cnbc.com/2025/10/22/fed-holds.html",
+        ),
+        (
+            "https://www.washingtonpost.com/politics/2025/10/22/budget/?mod=rss#comments",
+            "https://washingtonpost.com/politics/2025/10/22/budget",
+        ),
+        ("https://example.com:443/story?b=2&a=1&fbclid=xyz", "https://example.com/story?a=1&b=2"),
+        ("http://example.com:80/story", "https://example.com/story"),
+        ("https://example.com:8443/story", "https://example.com:8443/story"),
+        ("http://www.example.com:8080/story/", "https://example.com:8080/story"),
+        ("https://example.com/news/story/amp/", "https://example.com/news/story"),
+        ("https://amp.example.com/amp/news/story", "https://example.com/news/story"),
+        ("https://example.com/news/story.amp.html", "https://example.com/news/story.html"),
+        ("https://example.com/news/story?outputType=amp", "https://example.com/news/story"),
+        (
+            "https://www.google.com/amp/s/www.example.com/news/story/amp",
+            "https://example.com/news/story",
+        ),
+        (
+            "https://www-example-com.cdn.ampproject.org/c/s/www.example.com/news/story",
+            "https://example.com/news/story",
+        ),
+        ("https://example.com/", "https://example.com/"),
+        ("https://example.com/article?id=42", "https://example.com/article?id=42"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_non_http_urls_are_left_alone():
+    assert canonicalize_url("urn:uuid:1234") == "urn:uuid:1234"
+    assert canonicalize_url("/relative/path") == "/relative/path"
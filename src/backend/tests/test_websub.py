@@ -0,0 +1,188 @@
+"""Tests for WebSub hub discovery, subscription and push ingestion"""
+
+import hashlib
+import hmac
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs
+import httpx
+import pytest
+from sqlalchemy import func, select
+from starlette.requests import Request
+from app.api.v1.feeds import _read_capped
+from app.models import Article
+from app.services.websub import discover_hub
+from tests.test_rss_ingestion import mock_service, rss_with_items
+
+FIXTURES = Path(__file__).parent / "fixtures" / "feeds"
+
+HUB_RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>Example News</title>
+    <atom:link rel="hub" href="https://hub.example.net/"/>
+    <atom:link rel="self" href="https://example.com/rss"/>
+    <item><title>Fed holds rates steady</title><link>https://example.com/fed-holds</link></item>
+  </channel>
+</rss>
+"""
+
+
+def test_discover_hub_from_document_and_link_header():
+    content = (FIXTURES / "nbcnews_atom.xml").read_bytes()
+    assert discover_hub(content) == (
+        "https://pubsubhubbub.appspot.com/",
+        "https://feeds.nbcnews.com/nbcnews/public/business",
+    )
+
+    header_links = {"hub": {"url": "https://hub.example.net/", "rel": "hub"}}
+    assert discover_hub(content, header_links)[0] == "https://hub.example.net/"
+    assert discover_hub(rss_with_items([("Story", "https://example.com/1")])) == (None, None)
+
+
+def websub_service(handler):
+    service, requests = mock_service(handler)
+    service.websub.enabled = True
+    service.websub.callback_base = "https://news.example.org"
+    return service, requests
+
+
+@pytest.mark.asyncio
+async def test_subscribe_verify_and_ingest_push(db_session, sample_feed):
+    """Hub found on poll -> subscription -> verified lease -> signed push ingested"""
+    hub_requests = []
+
+    def handler(request):
+        if request.url.host == "hub.example.net":
+            # Stand-in hub: accept the subscription for asynchronous verification
+            hub_requests.append({k: v[0] for k, v in parse_qs(request.content.decode()).items()})
+            return httpx.Response(202)
+        return httpx.Response(200, content=HUB_RSS)
+
+    service, _ = websub_service(handler)
+    await service.fetch_feed(sample_feed, db_session)
+    assert sample_feed.websub_hub == "https://hub.example.net/"
+    assert sample_feed.websub_topic == "https://example.com/rss"
+
+    assert await service.sync_websub(db_session) == 1
+    subscription = hub_requests[0]
+    assert subscription["hub.mode"] == "subscribe"
+    assert subscription["hub.callback"].endswith(f"/api/v1/feeds/{sample_feed.feed_id}/websub")
+    assert sample_feed.websub_state == "pending"
+
+    # The hub verifies intent through the callback
+    wrong_topic = {"hub.mode": "subscribe", "hub.topic": "https://example.com/other"}
+    assert service.websub.verify(sample_feed, wrong_topic) is None
+    challenge = service.websub.verify(
+        sample_feed,
+        {
+            "hub.mode": "subscribe",
+            "hub.topic": subscription["hub.topic"],
+            "hub.challenge": "c-123",
+            "hub.lease_seconds": "600",
+        },
+    )
+    assert challenge == "c-123"
+    assert sample_feed.websub_state == "active"
+
+    # Content delivery signed with the subscription secret
+    body = rss_with_items([("Oil jumps on supply cut", "https://example.com/oil-jumps")])
+    signature = "sha256=" + hmac.new(
+        subscription["hub.secret"].encode(), body, hashlib.sha256
+    ).hexdigest()
+    assert service.websub.valid_signature(sample_feed, body, signature)
+    assert not service.websub.valid_signature(sample_feed, body, "sha256=deadbeef")
+
+    polled = (sample_feed.fetch_count, sample_feed.next_fetch_scheduled, sample_feed.etag)
+    assert await service.ingest_push(sample_feed, body, db_session) == 1
+    total = await db_session.execute(select(func.count()).select_from(Article))
+    assert total.scalar() == 2
+
+    # A push is not a poll: counters and the poll schedule are untouched
+    assert (sample_feed.fetch_count, sample_feed.next_fetch_scheduled, sample_feed.etag) == polled
+
+    # Subscribed feeds fall back to a slow verification poll
+    await service.fetch_feed(sample_feed, db_session)
+    assert sample_feed.current_poll_interval >= service.websub.poll_interval
+
+
+@pytest.mark.asyncio
+async def test_failed_subscription_is_recorded(db_session, sample_feed):
+    service, _ = websub_service(lambda request: httpx.Response(500))
+    sample_feed.websub_hub = "https://hub.example.net/"
+    sample_feed.websub_topic = sample_feed.feed_url
+
+    assert await service.sync_websub(db_session) == 0
+    assert sample_feed.websub_state == "failed"
+    first_retry = sample_feed.websub_lease_expires
+    assert first_retry > datetime.utcnow()
+
+    # Not retried until the backoff has passed, then with a doubled delay
+    assert await service.sync_websub(db_session) == 0
+    assert sample_feed.websub_failures == 1
+    sample_feed.websub_lease_expires = datetime.utcnow() - timedelta(seconds=1)
+    await service.sync_websub(db_session)
+    assert sample_feed.websub_failures == 2
+    assert sample_feed.websub_lease_expires - datetime.utcnow() > timedelta(
+        seconds=service.websub.retry_base * 1.5
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_subscription_recovers(db_session, sample_feed):
+    """A failed feed is picked up again by sync and goes pending once the hub accepts"""
+    service, _ = websub_service(lambda request: httpx.Response(202))
+    sample_feed.websub_hub = "https://hub.example.net/"
+    sample_feed.websub_topic = sample_feed.feed_url
+    sample_feed.websub_state = "failed"
+    sample_feed.websub_failures = 3
+
+    assert await service.sync_websub(db_session) == 1
+    assert sample_feed.websub_state == "pending"
+    assert sample_feed.websub_failures == 0
+
+
+@pytest.mark.parametrize("lease", ["", "abc", "-5", "0"])
+def test_verify_rejects_bad_lease(sample_feed, lease):
+    service, _ = websub_service(lambda request: httpx.Response(202))
+    sample_feed.websub_hub = "https://hub.example.net/"
+    sample_feed.websub_topic = sample_feed.feed_url
+    sample_feed.websub_state = "pending"
+    params = {"hub.mode": "subscribe", "hub.topic": sample_feed.feed_url, "hub.lease_seconds": lease}
+
+    if lease:
+        with pytest.raises(ValueError):
+            service.websub.verify(sample_feed, params)
+    else:
+        # A missing lease falls back to the one we asked for
+        service.websub.verify(sample_feed, params)
+        assert sample_feed.websub_state == "active"
+
+
+def push_request(chunks, headers=()):
+    """A delivery request whose body arrives in the given chunks"""
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    received = []
+
+    async def receive():
+        received.append(messages[len(received)])
+        return received[-1]
+
+    scope = {"type": "http", "method": "POST", "headers": [(k.encode(), v.encode()) for k, v in headers]}
+    return Request(scope, receive), received
+
+
+@pytest.mark.asyncio
+async def test_oversized_delivery_is_not_read_in_full():
+    """Pushes over the cap are refused on Content-Length or part-way through the stream"""
+    request, received = push_request([b"abcd"] * 5)
+    assert await _read_capped(request, 10) is None
+    assert len(received) == 3
+
+    request, received = push_request([b"abcd"] * 5, headers=[("content-length", "20")])
+    assert await _read_capped(request, 10) is None
+    assert received == []
+
+    request, _ = push_request([b"abcd"] * 2)
+    assert await _read_capped(request, 10) == b"abcdabcd"
@@ -0,0 +1,138 @@
+"""Tests for the legacy RSS service."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+# The legacy backend imports its modules top-level (from config import settings)
+BACKEND = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND))
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/test_rss_service.db"
+
+from config import settings  # noqa: E402
+from database import Base, NewsArticle, RSSSource, SessionLocal, engine  # noqa: E402
+from scripts.bench_text_extract import DEFAULT_CORPUS, load_contents  # noqa: E402
+from services.rss_service import RSSService  # noqa: E402
+from utils.text_extract import EXTRACTORS  # noqa: E402
+
+
+@pytest.fixture
+def db_session():
+    """Fresh legacy schema for each test."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def article(url, title="Story"):
+    return {"url": url, "title": title, "content": "", "source": "test", "published_at": None}
+
+
+def add_sources(db, count):
+    sources = [RSSSource(name=f"source{i}", url=f"https://feed{i}.example.com/rss") for i in range(count)]
+    db.add_all(sources)
+    db.commit()
+    return sources
+
+
+def test_fetch_all_sources_downloads_in_parallel(db_session, monkeypatch):
+    """Downloads overlap in the fetch pool while only the calling thread stores."""
+    sources = add_sources(db_session, 4)
+    threads = set()
+
+    def download_feed(client, feed_url):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        return [article(f"{feed_url}/story")]
+
+    monkeypatch.setattr(settings, "fetch_workers", 4)
+    monkeypatch.setattr(RSSService, "download_feed", staticmethod(download_feed))
+
+    start = time.monotonic()
+    results = RSSService.fetch_all_sources(db_session)
+
+    assert time.monotonic() - start < 0.6
+    assert len(threads) == 4 and all(name.startswith("rss-fetch") for name in threads)
+    assert sorted(result["source"] for result in results) == [source.name for source in sources]
+    assert all(result["success"] and result["new_articles"] == 1 for result in results)
+    assert db_session.query(NewsArticle).count() == 4
+    assert all(source.last_fetch is not None for source in sources)
+
+
+def test_store_articles_batches_duplicate_checks(db_session, monkeypatch):
+    """Duplicates are resolved with chunked IN queries and new rows go in as one insert."""
+    source = add_sources(db_session, 1)[0]
+    db_session.add(NewsArticle(
+        url="https://example.com/stored",
+        url_hash=NewsArticle.generate_url_hash("https://example.com/stored"),
+        title="Stored",
+        source="test",
+    ))
+    db_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    monkeypatch.setattr(settings, "dedup_chunk_size", 2)
+    try:
+        result = RSSService.store_articles(db_session, source, [
+            article("https://example.com/stored?utm_source=rss"),
+            article("https://example.com/a"),
+            article("https://www.example.com/a/"),
+            article("https://example.com/b"),
+            article("https://example.com/c"),
+        ])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    db_session.commit()
+
+    assert result["new_articles"] == 3
+    assert result["duplicates"] == 2
+    lookups = [sql for sql in statements if "url_hash IN" in sql]
+    inserts = [sql for sql in statements if sql.lstrip().upper().startswith("INSERT")]
+    assert len(lookups) == 2  # four distinct hashes in chunks of two
+    assert len(inserts) == 1
+    assert db_session.query(NewsArticle).count() == 4
+
+
+def test_htmlparser_matches_bs4_on_fixture_corpus():
+    """The streaming stripper gives BeautifulSoup's output for every fixture entry."""
+    contents = load_contents(DEFAULT_CORPUS)
+    assert contents
+
+    mismatches = [
+        content for content in contents
+        if EXTRACTORS["htmlparser"](content) != EXTRACTORS["bs4"](content)
+    ]
+    assert mismatches == []
+
+
+def test_fetch_all_sources_isolates_a_failed_store(db_session, monkeypatch):
+    """A source whose insert fails is rolled back alone; the others are committed."""
+    add_sources(db_session, 3)
+
+    def download_feed(client, feed_url):
+        # A NULL title violates the schema and fails that source's insert
+        return [article(f"{feed_url}/story", title=None if "feed1" in feed_url else "Story")]
+
+    monkeypatch.setattr(RSSService, "download_feed", staticmethod(download_feed))
+
+    results = {result["source"]: result for result in RSSService.fetch_all_sources(db_session)}
+
+    assert not results["source1"]["success"]
+    assert results["source0"]["success"] and results["source2"]["success"]
+    stored = {url for (url,) in db_session.query(NewsArticle.url)}
+    assert stored == {"https://feed0.example.com/rss/story", "https://feed2.example.com/rss/story"}